@@ -0,0 +1,310 @@
+from dataclasses import asdict
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import PlainTextResponse
+
+from app.dependencies import (
+    get_catalogue_sync,
+    get_digest_notifier,
+    get_external_job_breaker,
+    get_external_job_cache,
+    get_listing_cache,
+    get_profile_store,
+)
+from app.listing_cache import ListingCache
+from app.profiling import ProfileStore, ProfileTrace
+from app.services.cached_job_finder_service import CachedJobFinderService
+from app.services.catalogue_sync import CatalogueSync
+from app.services.circuit_breaker import CircuitBreakerJobFinderService
+from app.services.digest_notifier import DigestNotifier
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/external-cache")
+async def external_cache_stats(
+    cache: Annotated[CachedJobFinderService, Depends(get_external_job_cache)],
+):
+    """Endpoint to retrieve the counters of the external source cache.
+
+    Args:
+        cache (CachedJobFinderService): The CachedJobFinderService instance wrapping the external source.
+
+    Returns:
+        dict: The counters of the cache and its configuration.
+
+    Example:
+        Request:
+        GET /admin/external-cache
+
+        Response:
+        {
+            "hits": 120,
+            "stale_hits": 3,
+            "misses": 4,
+            "coalesced": 1,
+            "refreshes": 3,
+            "errors": 0,
+            "evictions": 0,
+            "size": 2,
+            "max_size": 256,
+            "ttl": 60.0,
+            "stale_ttl": 300.0
+        }
+
+    """
+    return {**asdict(cache.stats), "max_size": cache.max_size, "ttl": cache.ttl, "stale_ttl": cache.stale_ttl}
+
+
+@router.get("/listing-cache")
+async def listing_cache_stats(
+    cache: Annotated[ListingCache, Depends(get_listing_cache)],
+):
+    """Endpoint to retrieve the counters of the cache of encoded job listings.
+
+    Args:
+        cache (ListingCache): The ListingCache instance holding the encoded listings of GET /jobs.
+
+    Returns:
+        dict: The counters of the cache and its configuration.
+
+    Example:
+        Request:
+        GET /admin/listing-cache
+
+        Response:
+        {
+            "hits": 950,
+            "misses": 50,
+            "invalidations": 12,
+            "evictions": 0,
+            "size": 3,
+            "max_size": 32
+        }
+
+    """
+    return {**asdict(cache.stats), "max_size": cache.max_size}
+
+
+@router.get("/circuit-breaker")
+async def circuit_breaker_state(
+    breaker: Annotated[CircuitBreakerJobFinderService, Depends(get_external_job_breaker)],
+):
+    """Endpoint to retrieve the state of the circuit breaker of the external source.
+
+    Args:
+        breaker (CircuitBreakerJobFinderService): The CircuitBreakerJobFinderService instance wrapping the external source.
+
+    Returns:
+        dict: The state of the circuit, its counters and its configuration.
+
+    Example:
+        Request:
+        GET /admin/circuit-breaker
+
+        Response:
+        {
+            "state": "open",
+            "failure_rate": 0.8,
+            "calls_in_window": 10,
+            "retry_after": 12.5,
+            "hedge_delay": null,
+            "fallback_entries": 2,
+            "opened": 1,
+            "calls": 10,
+            "failures": 8,
+            "rejected": 5,
+            "fallbacks": 3,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "failure_rate_threshold": 0.5,
+            "window": 30.0,
+            "minimum_calls": 10,
+            "open_timeout": 30.0,
+            "hedge_percentile": null
+        }
+
+    """
+    return {
+        **breaker.snapshot(),
+        "failure_rate_threshold": breaker.breaker.failure_rate_threshold,
+        "window": breaker.breaker.window,
+        "minimum_calls": breaker.breaker.minimum_calls,
+        "open_timeout": breaker.breaker.open_timeout,
+        "hedge_percentile": breaker.hedge_percentile,
+    }
+
+
+@router.get("/catalogue-sync")
+async def catalogue_sync_stats(
+    sync: Annotated[Optional[CatalogueSync], Depends(get_catalogue_sync)],
+):
+    """Endpoint to retrieve the counters of the synchronization of the catalogue of the external source.
+
+    Args:
+        sync (Optional[CatalogueSync]): The CatalogueSync instance mirroring the external source, None if disabled.
+
+    Returns:
+        dict: The counters of the synchronizations, the number of mirrored jobs and the configuration.
+
+    Raises:
+        HTTPException: 404 if the synchronization is disabled, extra_source_sync_interval being 0.
+
+    Example:
+        Request:
+        GET /admin/catalogue-sync
+
+        Response:
+        {
+            "syncs": 12,
+            "failures": 1,
+            "added": 1040,
+            "removed": 40,
+            "failed_notifications": 0,
+            "last_sync": 1760781600.0,
+            "last_elapsed": 0.35,
+            "jobs": 1000,
+            "interval": 60.0
+        }
+
+    """
+    if sync is None:
+        raise HTTPException(status_code=404, detail="The synchronization of the catalogue is disabled")
+
+    return {**asdict(sync.stats), "jobs": sync.mirror.count(), "interval": sync.interval}
+
+
+@router.get("/notification-digest")
+async def notification_digest_stats(
+    digest: Annotated[Optional[DigestNotifier], Depends(get_digest_notifier)],
+):
+    """Endpoint to retrieve the counters of the notification digests.
+
+    Args:
+        digest (Optional[DigestNotifier]): The DigestNotifier instance coalescing the notifications, None if disabled.
+
+    Returns:
+        dict: The counters of the digests, the number of pending notifications and the configuration.
+
+    Raises:
+        HTTPException: 404 if the digests are disabled, notification_digest_delay being 0.
+
+    Example:
+        Request:
+        GET /admin/notification-digest
+
+        Response:
+        {
+            "received": 1200,
+            "duplicates": 150,
+            "digests": 40,
+            "delivered": 1000,
+            "failed": 0,
+            "pending": 50,
+            "max_batch_size": 50,
+            "max_delay": 60.0
+        }
+
+    """
+    if digest is None:
+        raise HTTPException(status_code=404, detail="The notification digests are disabled")
+
+    return {**asdict(digest.stats), "pending": digest.pending, "max_batch_size": digest.max_batch_size, "max_delay": digest.max_delay}
+
+
+def find_profile(store: ProfileStore, profile_id: int) -> ProfileTrace:
+    trace = store.get(profile_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id}, it was never recorded or was dropped")
+
+    return trace
+
+
+@router.get("/profiles")
+async def list_profiles(
+    store: Annotated[ProfileStore, Depends(get_profile_store)],
+):
+    """Endpoint to list the traces of the profiled requests kept, the most recent first.
+
+    Args:
+        store (ProfileStore): The ProfileStore instance holding the traces.
+
+    Returns:
+        dict: The number of traces recorded, the size of the buffer and the description of each trace kept.
+
+    Example:
+        Request:
+        GET /admin/profiles
+
+        Response:
+        {
+            "recorded": 3,
+            "max_size": 50,
+            "profiles": [
+                {
+                    "id": 3,
+                    "method": "GET",
+                    "path": "/aggregated-jobs",
+                    "status": 200,
+                    "mode": "cprofile",
+                    "started_at": 1760781600.5,
+                    "duration": 1.204,
+                    "size": 48211
+                }
+            ]
+        }
+
+    """
+    return {"recorded": store.recorded, "max_size": store.max_size, "profiles": [trace.describe() for trace in store.list()]}
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(
+    profile_id: int,
+    store: Annotated[ProfileStore, Depends(get_profile_store)],
+):
+    """Endpoint to read the summary of a trace: the most expensive functions, or the most sampled stacks.
+
+    Args:
+        profile_id (int): The identifier of the trace.
+        store (ProfileStore): The ProfileStore instance holding the traces.
+
+    Returns:
+        PlainTextResponse: The summary of the trace.
+
+    Raises:
+        HTTPException: 404 if the trace is not kept.
+
+    """
+    return PlainTextResponse(find_profile(store, profile_id).summary)
+
+
+@router.get("/profiles/{profile_id}/download")
+async def download_profile(
+    profile_id: int,
+    store: Annotated[ProfileStore, Depends(get_profile_store)],
+):
+    """Endpoint to download a trace, as a pstats file for cProfile or as collapsed stacks for sampling.
+
+    The pstats file opens with pstats.Stats or snakeviz, the collapsed stacks with flamegraph.pl or speedscope.
+
+    Args:
+        profile_id (int): The identifier of the trace.
+        store (ProfileStore): The ProfileStore instance holding the traces.
+
+    Returns:
+        Response: The raw trace, as an attachment.
+
+    Raises:
+        HTTPException: 404 if the trace is not kept.
+
+    """
+    trace = find_profile(store, profile_id)
+    extension = "prof" if trace.mode == "cprofile" else "folded"
+
+    return Response(
+        trace.data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="profile-{trace.id}.{extension}"'},
+    )
@@ -0,0 +1,141 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class PoolTimeout(Exception):
+    """An exception raised when no connection of the pool becomes available in time.
+
+    Inherits from:
+        Exception: The base class for all built-in exceptions.
+
+    """
+
+    pass
+
+
+class SQLiteConnectionPool:
+    """A bounded pool of SQLite connections shared by the threads of the application.
+
+    FastAPI runs the blocking endpoints in a threadpool, so each request borrows a connection for
+    the duration of a query and gives it back, instead of opening a connection per request or sharing
+    a single one. Connections are opened lazily, up to size, in autocommit mode: the writes are grouped
+    in explicit transactions with the transaction context manager.
+
+    File databases are opened in WAL mode, so readers do not block the writer nor each other.
+    An in-memory database only lives as long as its connection, so the pool is then limited to one.
+
+    Attributes:
+        path (str): The path of the database file, or ":memory:".
+        size (int): The maximum number of open connections.
+        timeout (float): The maximum time in seconds to wait for a connection, or for a lock of the database.
+
+    """
+
+    def __init__(self, path: str, size: int = 8, timeout: float = 5.0):
+        """Initialize the SQLiteConnectionPool.
+
+        Args:
+            path (str): The path of the database file, or ":memory:". Its directory is created if it does not exist.
+            size (int): The maximum number of open connections.
+            timeout (float): The maximum time in seconds to wait for a connection, or for a lock of the database.
+
+        """
+        self.path = path
+        self.size = 1 if path == ":memory:" else size
+        self.timeout = timeout
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        if self.path != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+
+        return connection
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed pool.")
+            if len(self._opened) < self.size:
+                connection = self._open()
+                self._opened.append(connection)
+                return connection
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeout(f"No connection available after {self.timeout} seconds")
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection of the pool.
+
+        Yields:
+            sqlite3.Connection: A connection in autocommit mode, given back to the pool on exit.
+
+        Raises:
+            PoolTimeout: If every connection is still borrowed after timeout seconds.
+
+        """
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            if self._closed:
+                connection.close()
+            else:
+                self._idle.put(connection)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection of the pool within a write transaction.
+
+        The transaction takes the write lock of the database when it begins, so concurrent writers
+        are serialized, and is committed on exit or rolled back if an exception is raised.
+
+        Yields:
+            sqlite3.Connection: A connection within an open transaction.
+
+        Raises:
+            PoolTimeout: If every connection is still borrowed after timeout seconds.
+
+        """
+        with self.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self):
+        """Close the connections of the pool.
+
+        The idle connections are closed at once, the borrowed ones when they are given back.
+
+        """
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
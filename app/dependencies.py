@@ -1,53 +1,261 @@
+import os
+from typing import Annotated, Optional
+
+from fastapi import Depends
+
+from app.database import SQLiteConnectionPool
+from app.listing_cache import ListingCache
+from app.metrics import NOTIFICATION_QUEUE_DEPTH, REPOSITORY_JOBS, MetricsRegistry, registry
+from app.profiling import ProfileStore
 from app.repository.alert_repository import (
     InMemoryJobAlertRepository,
     JobAlertRepository,
+    SQLiteJobAlertRepository,
 )
-from app.repository.repository import InMemoryJobRepository, JobRepository
+from app.repository.async_repository import AsyncJobRepository, AsyncJobRepositoryAdapter
+from app.repository.mirror_repository import MirrorJobRepository
+from app.repository.repository import (
+    InMemoryJobRepository,
+    JobRepository,
+    SQLiteJobRepository,
+)
+from app.services.cached_job_finder_service import CachedJobFinderService
+from app.services.catalogue_sync import CatalogueSync
+from app.services.circuit_breaker import CircuitBreaker, CircuitBreakerJobFinderService
+from app.services.digest_notifier import DigestNotifier
 from app.services.external_job_finder_service import (
     ExternalJobFinderService,
     JobberwockyExtraSource,
 )
-from app.services.job_alert import JobAlertService, JobberwockyJobAlert
+from app.services.job_alert import (
+    AsyncJobAlertAdapter,
+    AsyncJobAlertService,
+    JobAlertService,
+    JobberwockyJobAlert,
+)
 from app.services.job_finder_aggregator import JobFinderAggregator
-from app.services.notify_service import PrintEmailNotifier
+from app.services.job_merge import JobMerger
+from app.services.notification_dispatcher import NotificationDispatcher
+from app.services.notify_service import (
+    AsyncNotifier,
+    AsyncNotifierAdapter,
+    Notifier,
+    PrintEmailNotifier,
+)
 from app.settings import settings
-from app.storage import InMemoryStorage, Storage
+from app.storage import (
+    AppendOnlyLogStorage,
+    ColumnarJobStorage,
+    InMemoryStorage,
+    SQLiteFeedStorage,
+    Storage,
+)
 
 # Initialize external_job_finder_service using JobberwockyExtraSource
-external_job_finder_service: ExternalJobFinderService = JobberwockyExtraSource(
-    service_url=settings.endpoint_extra_source_service
+extra_source = JobberwockyExtraSource(
+    service_url=settings.endpoint_extra_source_service,
+    max_connections=settings.extra_source_max_connections,
+    max_keepalive_connections=settings.extra_source_max_keepalive_connections,
+    keepalive_expiry=settings.extra_source_keepalive_expiry,
+    timeout=settings.extra_source_timeout,
 )
 
-# Initialize memory_storage using InMemoryStorage
-memory_storage: Storage = InMemoryStorage()
-alert_memory_storage: Storage = InMemoryStorage()
+# Initialize external_job_breaker failing fast while extra_source keeps failing
+external_job_breaker = CircuitBreakerJobFinderService(
+    extra_source,
+    CircuitBreaker(
+        failure_rate_threshold=settings.extra_source_breaker_failure_rate,
+        window=settings.extra_source_breaker_window,
+        minimum_calls=settings.extra_source_breaker_minimum_calls,
+        open_timeout=settings.extra_source_breaker_open_timeout,
+        half_open_max_calls=settings.extra_source_breaker_half_open_calls,
+    ),
+    hedge_percentile=settings.extra_source_hedge_percentile,
+    hedge_min_samples=settings.extra_source_hedge_min_samples,
+)
+
+# Initialize external_job_cache caching the results of external_job_breaker
+external_job_cache = CachedJobFinderService(
+    external_job_breaker,
+    ttl=settings.extra_source_cache_ttl,
+    stale_ttl=settings.extra_source_cache_stale_ttl,
+    max_size=settings.extra_source_cache_size,
+)
+external_job_finder_service: ExternalJobFinderService = external_job_cache
+
+# Initialize extra_source_mirror holding a copy of the catalogue of the external source, when it is synchronized
+# in the background, the aggregated jobs being read from it rather than fetched on every request
+extra_source_mirror: Optional[MirrorJobRepository] = None
+if settings.extra_source_sync_interval > 0:
+    extra_source_mirror = MirrorJobRepository(source_name=external_job_cache.source_name)
+
+
+def build_storage(name: str) -> Storage:
+    """Build the storage selected by the storage_backend setting.
+
+    Args:
+        name (str): The name of the storage, used as the directory of persistent storages.
+
+    Returns:
+        Storage: An AppendOnlyLogStorage under storage_path for the "log" backend, an InMemoryStorage otherwise.
+            The "columnar" backend only changes the storage of the jobs, see build_job_storage.
+
+    """
+    if settings.storage_backend == "log":
+        return AppendOnlyLogStorage(
+            os.path.join(settings.storage_path, name),
+            fsync_every=settings.storage_fsync_every,
+            fsync_interval=settings.storage_fsync_interval,
+            compact_every=settings.storage_compact_every,
+        )
+
+    return InMemoryStorage()
+
+
+def build_job_storage() -> Storage:
+    """Build the storage of the jobs selected by the storage_backend setting.
+
+    Returns:
+        Storage: A ColumnarJobStorage for the "columnar" backend, the storage built by build_storage otherwise.
+
+    """
+    if settings.storage_backend == "columnar":
+        return ColumnarJobStorage()
+
+    return build_storage("jobs")
 
-# Initialize job_repository using InMemoryJobRepository
-job_repository: JobRepository = InMemoryJobRepository(memory_storage)
+
+# Initialize the storages and job_repository using the configured storage backend,
+# a SQLite database shared by the repositories, a SQLite change feed replicated in memory
+# by every worker process, or one Storage per repository
+database: Optional[SQLiteConnectionPool] = None
+storages: list[Storage] = []
+if settings.storage_backend == "sqlite":
+    database = SQLiteConnectionPool(
+        os.path.join(settings.storage_path, "jobberwocky.sqlite3"),
+        size=settings.sqlite_pool_size,
+        timeout=settings.sqlite_timeout,
+    )
+    job_repository: JobRepository = SQLiteJobRepository(database)
+elif settings.storage_backend == "shared":
+    database = SQLiteConnectionPool(
+        os.path.join(settings.storage_path, "jobberwocky-feed.sqlite3"),
+        size=settings.sqlite_pool_size,
+        timeout=settings.sqlite_timeout,
+    )
+    memory_storage: Storage = SQLiteFeedStorage(database, "jobs", ColumnarJobStorage(), settings.storage_poll_interval)
+    alert_memory_storage: Storage = SQLiteFeedStorage(database, "alerts", InMemoryStorage(), settings.storage_poll_interval)
+    storages = [memory_storage, alert_memory_storage]
+    job_repository: JobRepository = InMemoryJobRepository(memory_storage)
+else:
+    memory_storage: Storage = build_job_storage()
+    alert_memory_storage: Storage = build_storage("alerts")
+    storages = [memory_storage, alert_memory_storage]
+    job_repository: JobRepository = InMemoryJobRepository(memory_storage)
+
+# Run the repository operations in worker threads for the backends doing I/O, on the event loop otherwise,
+# except the listings without limit, which always run in worker threads
+offload_storage = settings.storage_offload if settings.storage_offload is not None else settings.storage_backend in ("log", "sqlite", "shared")
+
+# Initialize listing_cache holding the encoded listings of job_repository
+listing_cache = ListingCache(max_size=settings.listing_cache_size)
 
 # Initialize job_finder_agregator using JobFinderAggregator
 job_finder_aggregator: JobFinderAggregator = JobFinderAggregator(
-    [external_job_finder_service, job_repository]
+    [extra_source_mirror if extra_source_mirror is not None else external_job_finder_service, job_repository],
+    timeout=settings.aggregator_timeout,
+    timeouts=settings.aggregator_source_timeouts,
+    merger=JobMerger(
+        conflict=settings.aggregator_conflict,
+        priority=settings.aggregator_source_priority,
+    )
+    if settings.aggregator_dedup
+    else None,
 )
 
-# Initialize job_alert_repository using InMemoryJobalertRepository
-job_alert_repository: JobAlertRepository = InMemoryJobAlertRepository(
-    alert_memory_storage
-)
+# Initialize job_alert_repository using the same storage backend as job_repository
+if settings.storage_backend == "sqlite":
+    job_alert_repository: JobAlertRepository = SQLiteJobAlertRepository(database)
+else:
+    job_alert_repository: JobAlertRepository = InMemoryJobAlertRepository(
+        alert_memory_storage
+    )
 
 # Initialize job_alert_service using JobberwockyJobalert
-job_alert_service: JobAlertService = JobberwockyJobAlert(job_alert_repository)
+# reading the alerts added by the other worker processes at most once every storage_poll_interval
+job_alert_service: JobAlertService = JobberwockyJobAlert(job_alert_repository, refresh_interval=settings.storage_poll_interval)
 
 
-# Initialize notifier Service
-notifier = PrintEmailNotifier()
+# Initialize digest_notifier coalescing the notifications of each email into digests, when a digest delay is set
+digest_notifier: Optional[DigestNotifier] = None
+if settings.notification_digest_delay > 0:
+    digest_notifier = DigestNotifier(
+        PrintEmailNotifier(),
+        max_batch_size=settings.notification_digest_size,
+        max_delay=settings.notification_digest_delay,
+    )
+
+# Initialize notifier Service, delivering through a NotificationDispatcher
+notifier = NotificationDispatcher(
+    digest_notifier if digest_notifier is not None else PrintEmailNotifier(),
+    max_queue_size=settings.notification_queue_size,
+    workers=settings.notification_workers,
+    batch_size=settings.notification_batch_size,
+    max_retries=settings.notification_max_retries,
+)
+
+# Initialize catalogue_sync synchronizing extra_source_mirror through external_job_breaker, notifying the new jobs
+catalogue_sync: Optional[CatalogueSync] = None
+if extra_source_mirror is not None:
+    catalogue_sync = CatalogueSync(
+        external_job_breaker,
+        extra_source_mirror,
+        job_alert_service,
+        notifier,
+        interval=settings.extra_source_sync_interval,
+    )
 
+# Report the size of job_repository and the depth of the notification queue when the metrics are collected
+REPOSITORY_JOBS.set_function(job_repository.count)
+NOTIFICATION_QUEUE_DEPTH.set_function(lambda: notifier.pending)
 
-def get_notifier_service() -> PrintEmailNotifier:
+# Initialize profile_store keeping the traces of the profiled requests
+profile_store = ProfileStore(max_size=settings.profiling_buffer_size)
+
+
+def close_storage():
+    """Close the storages, or the database, of the repositories."""
+    for storage in storages:
+        storage.close()
+    if database is not None:
+        database.close()
+
+
+async def get_notifier_service() -> Notifier:
     return notifier
 
 
-def get_alert_repository() -> JobAlertRepository:
+async def get_digest_notifier() -> Optional[DigestNotifier]:
+    """Retrieve the instance of the DigestNotifier.
+
+    Returns:
+        Optional[DigestNotifier]: The DigestNotifier coalescing the notifications into digests, None if disabled.
+
+    """
+    return digest_notifier
+
+
+async def get_catalogue_sync() -> Optional[CatalogueSync]:
+    """Retrieve the instance of the CatalogueSync.
+
+    Returns:
+        Optional[CatalogueSync]: The CatalogueSync mirroring the external source, None if disabled.
+
+    """
+    return catalogue_sync
+
+
+async def get_alert_repository() -> JobAlertRepository:
     """Retrieve the instance of the JobAlertRepository.
 
     Returns:
@@ -57,7 +265,7 @@ def get_alert_repository() -> JobAlertRepository:
     return job_alert_repository
 
 
-def get_job_alert_service() -> JobAlertService:
+async def get_job_alert_service() -> JobAlertService:
     """Retrieve the instance of the JobAlertService.
 
     Returns:
@@ -67,7 +275,7 @@ def get_job_alert_service() -> JobAlertService:
     return job_alert_service
 
 
-def get_job_finder_aggregator() -> JobFinderAggregator:
+async def get_job_finder_aggregator() -> JobFinderAggregator:
     """Retrieve the instance of the JobFinderAggregator.
 
     Returns:
@@ -77,7 +285,7 @@ def get_job_finder_aggregator() -> JobFinderAggregator:
     return job_finder_aggregator
 
 
-def get_external_job_finder_service() -> ExternalJobFinderService:
+async def get_external_job_finder_service() -> ExternalJobFinderService:
     """Retrieve the instance of the ExternalJobFinderService.
 
     Returns:
@@ -87,7 +295,57 @@ def get_external_job_finder_service() -> ExternalJobFinderService:
     return external_job_finder_service
 
 
-def get_job_repository() -> JobRepository:
+async def get_external_job_cache() -> CachedJobFinderService:
+    """Retrieve the instance of the CachedJobFinderService.
+
+    Returns:
+        CachedJobFinderService: The instance of the CachedJobFinderService.
+
+    """
+    return external_job_cache
+
+
+async def get_external_job_breaker() -> CircuitBreakerJobFinderService:
+    """Retrieve the instance of the CircuitBreakerJobFinderService.
+
+    Returns:
+        CircuitBreakerJobFinderService: The instance of the CircuitBreakerJobFinderService.
+
+    """
+    return external_job_breaker
+
+
+async def get_listing_cache() -> ListingCache:
+    """Retrieve the instance of the ListingCache.
+
+    Returns:
+        ListingCache: The instance of the ListingCache.
+
+    """
+    return listing_cache
+
+
+async def get_metrics_registry() -> MetricsRegistry:
+    """Retrieve the instance of the MetricsRegistry.
+
+    Returns:
+        MetricsRegistry: The instance of the MetricsRegistry holding the metrics of the application.
+
+    """
+    return registry
+
+
+async def get_profile_store() -> ProfileStore:
+    """Retrieve the instance of the ProfileStore.
+
+    Returns:
+        ProfileStore: The instance of the ProfileStore holding the traces of the profiled requests.
+
+    """
+    return profile_store
+
+
+async def get_job_repository() -> JobRepository:
     """Retrieve the instance of the JobRepository.
 
     Returns:
@@ -95,3 +353,42 @@ def get_job_repository() -> JobRepository:
 
     """
     return job_repository
+
+
+async def get_async_job_repository(repository: Annotated[JobRepository, Depends(get_job_repository)]) -> AsyncJobRepository:
+    """Retrieve the JobRepository wrapped for the async route handlers.
+
+    Args:
+        repository (JobRepository): The JobRepository to wrap.
+
+    Returns:
+        AsyncJobRepository: An AsyncJobRepositoryAdapter running the operations of the JobRepository.
+
+    """
+    return AsyncJobRepositoryAdapter(repository, offload=offload_storage)
+
+
+async def get_async_job_alert_service(service: Annotated[JobAlertService, Depends(get_job_alert_service)]) -> AsyncJobAlertService:
+    """Retrieve the JobAlertService wrapped for the async route handlers.
+
+    Args:
+        service (JobAlertService): The JobAlertService to wrap.
+
+    Returns:
+        AsyncJobAlertService: An AsyncJobAlertAdapter running the methods of the JobAlertService.
+
+    """
+    return AsyncJobAlertAdapter(service, offload=offload_storage)
+
+
+async def get_async_notifier_service(notifier_service: Annotated[Notifier, Depends(get_notifier_service)]) -> AsyncNotifier:
+    """Retrieve the Notifier wrapped for the async route handlers.
+
+    Args:
+        notifier_service (Notifier): The Notifier to wrap.
+
+    Returns:
+        AsyncNotifier: An AsyncNotifierAdapter calling the Notifier without blocking the event loop.
+
+    """
+    return AsyncNotifierAdapter(notifier_service)
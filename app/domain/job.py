@@ -2,13 +2,18 @@ from dataclasses import asdict, dataclass
 
 
 class Dictable:
+    __slots__ = ()
+
     def to_dict(self):
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Job(Dictable):
     name: str
     country: str
     salary: int
     skills: list[str]
+
+    def to_dict(self):
+        return {"name": self.name, "country": self.country, "salary": self.salary, "skills": list(self.skills)}
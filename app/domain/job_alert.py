@@ -1,4 +1,5 @@
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
+from typing import Optional
 
 
 class Dictable:
@@ -9,4 +10,9 @@ class Dictable:
 @dataclass
 class JobAlert(Dictable):
     email: str
-    regex_name: str
+    regex_name: str = ""
+    skills: list[str] = field(default_factory=list)
+    countries: list[str] = field(default_factory=list)
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+
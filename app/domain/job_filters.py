@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from app.domain.job import Job
+
+
+@dataclass
+class JobFilters:
+    name: Optional[str] = None
+    salary_max: Optional[int] = None
+    salary_min: Optional[int] = None
+    country: Optional[str] = None
+    skills: Optional[list[str]] = None
+
+    def matches(self, job: Job) -> bool:
+        """Check whether a job satisfies every filter.
+
+        The name filter matches case-insensitive substrings of the job name, the skills filter
+        requires the job to have all the given skills.
+
+        Args:
+            job (Job): The job to check.
+
+        Returns:
+            bool: True if the job satisfies every filter that is set.
+
+        """
+        if self.name is not None and self.name.casefold() not in job.name.casefold():
+            return False
+        if self.country is not None and job.country != self.country:
+            return False
+        if self.salary_min is not None and job.salary < self.salary_min:
+            return False
+        if self.salary_max is not None and job.salary > self.salary_max:
+            return False
+        if self.skills and not set(self.skills).issubset(job.skills):
+            return False
+
+        return True
@@ -0,0 +1,176 @@
+import asyncio
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+WHITESPACE_CHARS = " \t\n\r"
+# The rest of a buffer that may be the beginning of a number or of a literal split across chunks
+NUMBER_PREFIX = re.compile(r"[-+.eE0-9]*")
+LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+# The states of the parser: before the opening bracket, before the first item or the closing bracket,
+# before an item, after an item, and after the closing bracket
+START, FIRST, ITEM, SEPARATOR, END = range(5)
+
+
+def incomplete(buffer: str, position: int) -> bool:
+    """Check whether a decoding error may be resolved by the next chunks, the error being at the end of the data.
+
+    Args:
+        buffer (str): The data being parsed.
+        position (int): The position of the decoding error.
+
+    Returns:
+        bool: True if the rest of the buffer from position may be the beginning of a number or a literal, which
+            includes an empty rest, False if the data is malformed whatever follows.
+
+    """
+    rest = buffer[position:]
+
+    return NUMBER_PREFIX.fullmatch(rest) is not None or any(literal.startswith(rest) for literal in LITERALS)
+
+
+class JSONArrayParser:
+    """An incremental parser of a JSON document whose top-level value is an array.
+
+    The document is fed in chunks of bytes, as they are read from the network, and each item of the array is decoded
+    by the scanner of json.JSONDecoder as soon as it is complete, so the whole document is never buffered: only the
+    chunk being parsed and the beginning of an item split across chunks are kept. An item is only waited for while
+    the decoding error is at the end of the data received, so a malformed item is reported as soon as it is followed
+    by more data.
+
+    """
+
+    def __init__(self):
+        """Initialize the JSONArrayParser."""
+        self._scan = json.JSONDecoder().scan_once
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = START
+
+    def feed(self, data: bytes, final: bool = False) -> list[Any]:
+        """Parse a chunk of the document.
+
+        Args:
+            data (bytes): The next chunk of the document, UTF-8 encoded.
+            final (bool): Whether the chunk is the last one.
+
+        Returns:
+            list[Any]: The items of the array completed by the chunk, in order.
+
+        Raises:
+            ValueError: If the document is not a JSON array, or if it is truncated and final is True.
+
+        """
+        buffer = self._buffer + self._text.decode(data, final)
+        length = len(buffer)
+        scan = self._scan
+        state = self._state
+        position = 0
+        items = []
+        while True:
+            if position < length and buffer[position] in WHITESPACE_CHARS:
+                position = WHITESPACE.match(buffer, position).end()
+            if position == length:
+                break
+
+            char = buffer[position]
+            if state == ITEM or (state == FIRST and char != "]"):
+                try:
+                    item, end = scan(buffer, position)
+                except StopIteration as error:
+                    if final or not incomplete(buffer, error.value):
+                        raise json.JSONDecodeError("Expecting value", buffer, error.value)
+                    break
+                except json.JSONDecodeError as error:
+                    if final or not (error.msg.startswith("Unterminated string") or incomplete(buffer, error.pos)):
+                        raise
+                    break
+                # A number ending the chunk may go on in the next one
+                if end == length and not final:
+                    break
+                items.append(item)
+                state = SEPARATOR
+                position = end
+            elif state == SEPARATOR:
+                if char == ",":
+                    state = ITEM
+                elif char == "]":
+                    state = END
+                else:
+                    raise ValueError(f"Expected ',' or ']' after an item of the JSON array, found {char!r}")
+                position += 1
+            elif state == FIRST:
+                state = END
+                position += 1
+            elif state == START:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, found {char!r}")
+                state = FIRST
+                position += 1
+            else:
+                raise ValueError("Extra data after the JSON array")
+
+        self._buffer = buffer[position:]
+        self._state = state
+        if final and state != END:
+            raise ValueError("Truncated JSON array")
+
+        return items
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes], offload: bool = False) -> AsyncIterator[list[Any]]:
+    """Parse a JSON array from a stream of chunks, yielding its items as they are completed.
+
+    The items are yielded in batches, the items completed by each chunk at once, so the overhead of the asynchronous
+    iteration is paid per chunk rather than per item.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The chunks of the document, UTF-8 encoded.
+        offload (bool): Whether each chunk is parsed in a worker thread rather than on the event loop.
+
+    Yields:
+        list[Any]: The decoded items completed by each chunk, in order, never empty.
+
+    Raises:
+        ValueError: If the document is not a JSON array or is truncated.
+
+    """
+    parser = JSONArrayParser()
+    async for chunk in chunks:
+        items = await asyncio.to_thread(parser.feed, chunk) if offload else parser.feed(chunk)
+        if items:
+            yield items
+    items = parser.feed(b"", final=True)
+    if items:
+        yield items
+
+
+async def iter_ndjson_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[list[bytes]]:
+    """Split newline delimited JSON from a stream of chunks, yielding its lines as they are completed.
+
+    The lines are not decoded, and are yielded in batches, the lines completed by each chunk at once. Blank lines
+    are skipped.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The chunks of the document.
+
+    Yields:
+        list[bytes]: The non blank lines completed by each chunk, without their newline, in order, never empty.
+
+    """
+    parts: list[bytes] = []
+    async for chunk in chunks:
+        parts.append(chunk)
+        if b"\n" not in chunk:
+            continue
+        lines = b"".join(parts).split(b"\n")
+        parts = [lines.pop()]
+        lines = [line for line in lines if line.strip()]
+        if lines:
+            yield lines
+    rest = b"".join(parts)
+    if rest.strip():
+        yield [rest]
@@ -0,0 +1,167 @@
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+from typing import Iterable, Optional
+
+from app.domain.job_filters import JobFilters
+from app.pagination import job_to_dict
+
+
+@dataclass
+class ListingCacheStats:
+    """Counters of the ListingCache.
+
+    Attributes:
+        hits (int): The number of listings served from the cache.
+        misses (int): The number of listings encoded because they were not in the cache.
+        invalidations (int): The number of entries dropped because their repository changed.
+        evictions (int): The number of entries evicted because the cache was full.
+        size (int): The number of entries in the cache.
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+@dataclass
+class CachedListing:
+    """An encoded listing.
+
+    Attributes:
+        body (bytes): The JSON array of the jobs of the listing.
+        next_position (Optional[int]): The position to resume after for the next page, None if it is the last one.
+
+    """
+
+    body: bytes
+    next_position: Optional[int] = None
+
+
+def encode_jobs(jobs: Iterable) -> bytes:
+    """Encode jobs as a JSON array, the way FastAPI encodes a list of JobOut.
+
+    Args:
+        jobs (Iterable): The jobs to encode, dataclasses or dictionaries with the fields of a JobOut.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON array.
+
+    """
+    return json.dumps(
+        [job_to_dict(job) for job in jobs], ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def listing_key(job_filters: Optional[JobFilters], after: int = -1, limit: Optional[int] = None) -> tuple:
+    """Build the key of a listing from its filters and pagination.
+
+    Args:
+        job_filters (Optional[JobFilters]): The filters of the listing.
+        after (int): The position of the last job of the previous page, -1 for the first page.
+        limit (Optional[int]): The maximum number of jobs of the page, None for every job.
+
+    Returns:
+        tuple: A hashable key.
+
+    """
+    filters = () if job_filters is None else tuple(
+        tuple(sorted(value)) if isinstance(value, list) else value for value in astuple(job_filters)
+    )
+
+    return filters, after, limit
+
+
+class ListingCache:
+    """A cache of the encoded job listings of repositories, invalidated by repository version.
+
+    Each entry holds the encoded JSON of a listing, keyed by the repository it was read from and the
+    filters and pagination of the listing. Every write to a repository gives it a new version: once a
+    listing of a newer version is requested, every entry of the older versions is dropped. The cache
+    holds at most max_size entries, evicting the least recently used one.
+
+    Attributes:
+        max_size (int): The maximum number of entries.
+        stats (ListingCacheStats): The counters of the cache.
+
+    """
+
+    def __init__(self, max_size: int = 32):
+        """Initialize the ListingCache.
+
+        Args:
+            max_size (int): The maximum number of entries.
+
+        """
+        self.max_size = max_size
+        self.stats = ListingCacheStats()
+        self._entries: OrderedDict[tuple, CachedListing] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _check_version(self, repository_id: int, version: int):
+        """Drop the entries of a repository if they were cached at another version."""
+        if self._versions.get(repository_id, version) != version:
+            stale = [key for key in self._entries if key[0] == repository_id]
+            for key in stale:
+                del self._entries[key]
+            self.stats.invalidations += len(stale)
+            self.stats.size = len(self._entries)
+        self._versions[repository_id] = version
+
+    def get(self, repository: object, version: int, key: tuple) -> Optional[CachedListing]:
+        """Retrieve a listing from the cache.
+
+        Args:
+            repository (object): The repository the listing is read from.
+            version (int): The current version of the repository.
+            key (tuple): The key of the listing, built by listing_key.
+
+        Returns:
+            Optional[CachedListing]: The listing, or None if it is not in the cache at this version.
+
+        """
+        with self._lock:
+            self._check_version(id(repository), version)
+            listing = self._entries.get((id(repository), key))
+            if listing is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end((id(repository), key))
+            self.stats.hits += 1
+
+        return listing
+
+    def put(self, repository: object, version: int, key: tuple, listing: CachedListing):
+        """Store a listing in the cache.
+
+        The listing is not stored if the repository was written to since the version it was read at.
+
+        Args:
+            repository (object): The repository the listing was read from.
+            version (int): The version of the repository the listing was read at.
+            key (tuple): The key of the listing, built by listing_key.
+            listing (CachedListing): The listing.
+
+        """
+        with self._lock:
+            if self._versions.get(id(repository), version) > version:
+                return
+            self._check_version(id(repository), version)
+            self._entries[(id(repository), key)] = listing
+            self._entries.move_to_end((id(repository), key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+            self.stats.size = len(self._entries)
+
+    def clear(self):
+        """Drop every entry of the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.stats.size = 0
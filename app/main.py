@@ -1,49 +1,171 @@
-from typing import Annotated
-
-from fastapi import Depends, FastAPI
-
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from itertools import islice
+from typing import Annotated, Literal, Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import NonNegativeInt
+
+from app.admin import router as admin_router
 from app.dependencies import (
-    get_alert_repository,
-    get_job_alert_service,
+    get_async_job_alert_service,
+    get_async_job_repository,
+    get_async_notifier_service,
     get_job_finder_aggregator,
-    get_job_repository,
-    get_notifier_service,
+    get_listing_cache,
+    get_metrics_registry,
+    catalogue_sync,
+    close_storage,
+    digest_notifier,
+    extra_source,
+    notifier,
+    profile_store,
 )
 from app.domain.job import Job
 from app.domain.job_alert import JobAlert
-from app.repository.alert_repository import JobAlertRepository
-from app.repository.repository import JobRepository
-from app.services.external_job_finder_service import JobFinderServiceError
-from app.services.job_alert import JobAlertService
+from app.domain.job_filters import JobFilters
+from app.json_stream import iter_json_array, iter_ndjson_lines
+from app.listing_cache import CachedListing, ListingCache, encode_jobs, listing_key
+from app.metrics import CONTENT_TYPE, NOTIFICATIONS_DROPPED, MetricsRegistry
+from app.middleware import MetricsMiddleware, ProfilingMiddleware
+from app.pagination import (
+    NDJSON_MEDIA_TYPE,
+    InvalidCursorError,
+    PageRequest,
+    decode_cursor_anchor,
+    encode_cursor,
+    ndjson_lines,
+    ndjson_lines_async,
+    take_page,
+)
+from app.repository.async_repository import AsyncJobRepository
+from app.services.job_alert import AsyncJobAlertService
 from app.services.job_finder_aggregator import JobFinderAggregator
-from app.services.notify_service import PrintEmailNotifier
+from app.services.job_ingestion import ingest_jobs
+from app.services.job_merge import fingerprint_digest
+from app.services.notification_dispatcher import NotificationQueueFull
+from app.services.notify_service import AsyncNotifier
+from app.settings import settings
+
+from .schemas import AddedJobOut, BulkJobsOut, JobAlertIn, JobAlertOut, JobIn, JobOut, SearchResultOut
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage the resources of the application.
+
+    The connection pool of the external source is opened on startup and closed on shutdown, the catalogue of the
+    external source is synchronized in the background in between if enabled, the pending notifications, and then
+    the pending digests, are delivered and the storages are closed before the process exits.
+
+    """
+    await extra_source.start()
+    if catalogue_sync is not None:
+        await catalogue_sync.start()
+    yield
+    if catalogue_sync is not None:
+        await catalogue_sync.aclose()
+    await extra_source.aclose()
+    await asyncio.to_thread(notifier.close)
+    if digest_notifier is not None:
+        await asyncio.to_thread(digest_notifier.close)
+    close_storage()
+
+
+app = FastAPI(lifespan=lifespan)
+app.include_router(admin_router)
+app.add_middleware(MetricsMiddleware)
+if settings.profiling_sample_rate > 0 or settings.profiling_header:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        sample_rate=settings.profiling_sample_rate,
+        header=settings.profiling_header,
+        threshold=settings.profiling_threshold,
+        mode=settings.profiling_mode,
+        interval=settings.profiling_interval,
+    )
+
+
+async def get_job_filters(
+    name: Optional[str] = None,
+    country: Optional[str] = None,
+    salary_min: Optional[NonNegativeInt] = None,
+    salary_max: Optional[NonNegativeInt] = None,
+    skills: Optional[list[str]] = Query(None),
+) -> JobFilters:
+    """Build the JobFilters of a request from its query parameters.
+
+    Args:
+        name (Optional[str]): A case-insensitive substring of the job name.
+        country (Optional[str]): The country of the job.
+        salary_min (Optional[NonNegativeInt]): The minimum salary of the job.
+        salary_max (Optional[NonNegativeInt]): The maximum salary of the job.
+        skills (Optional[list[str]]): The skills the job must all have, repeated as skills=Python&skills=OOP.
+
+    Returns:
+        JobFilters: The filters of the request.
+
+    """
+    return JobFilters(name=name, country=country, salary_min=salary_min, salary_max=salary_max, skills=skills)
+
+
+async def get_page_request(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    response_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+) -> PageRequest:
+    """Build the PageRequest of a request from its query parameters.
+
+    Args:
+        limit (Optional[int]): The maximum number of jobs of the page, every job by default.
+        cursor (Optional[str]): The cursor of the page, returned in the X-Next-Cursor header of the previous page.
+        response_format (str): "json" for a JSON array, "ndjson" for newline delimited JSON streamed job by job.
+
+    Returns:
+        PageRequest: The pagination parameters of the request.
+
+    Raises:
+        HTTPException: If the cursor is invalid (400).
 
-from .schemas import JobAlertIn, JobAlertOut, JobIn, JobOut
+    """
+    try:
+        after, anchor = decode_cursor_anchor(cursor) if cursor else (-1, None)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-app = FastAPI()
+    return PageRequest(limit=limit, after=after, format=response_format, anchor=anchor)
 
 
-@app.post("/add-job", status_code=201, response_model=JobOut)
-def add_new_job(
+@app.post("/add-job", status_code=201, response_model=AddedJobOut)
+async def add_new_job(
     new_job: JobIn,
-    job_repository: Annotated[JobRepository, Depends(get_job_repository)],
-    job_alert_service: Annotated[JobAlertService, Depends(get_job_alert_service)],
-    notifier_service: Annotated[PrintEmailNotifier, Depends(get_notifier_service)],
+    job_repository: Annotated[AsyncJobRepository, Depends(get_async_job_repository)],
+    job_alert_service: Annotated[AsyncJobAlertService, Depends(get_async_job_alert_service)],
+    notifier_service: Annotated[AsyncNotifier, Depends(get_async_notifier_service)],
 ):
     """Endpoint to add a new job to the repository.
 
     This endpoint allows clients to add a new job to the job repository. It expects a JobIn model representing
-    the details of the new job. The job is added to the repository using the provided JobRepository instance.
+    the details of the new job. The job is added to the repository using the provided AsyncJobRepository instance.
+    The subscribers of the matching job alerts are notified through the notifier service, which only enqueues
+    the notifications, so the response does not wait for them to be delivered. A subscriber with several matching
+    job alerts is notified once. The job is stored first, so the notifications that do not fit in a full notification
+    queue are dropped, logged, counted in the metrics and reported in the response, and the job is still created.
 
     Args:
         new_job (JobIn): The JobIn model representing the details of the new job to be added.
-        job_repository (JobRepository): The JobRepository instance used to store the jobs.
+        job_repository (AsyncJobRepository): The AsyncJobRepository instance used to store the jobs.
+        job_alert_service (AsyncJobAlertService): The AsyncJobAlertService instance used to find the job alerts to notify.
+        notifier_service (AsyncNotifier): The AsyncNotifier instance used to notify the subscribers.
 
     Returns:
-        JobOut: The JobOut model representing the added job.
-
-    Raises:
-        HTTPException: If there is an error while adding the job to the repository.
+        AddedJobOut: The AddedJobOut model representing the added job, with the number of dropped notifications.
 
     Example:
         Request:
@@ -60,7 +182,8 @@ def add_new_job(
             "name": "Software Engineer",
             "salary": 100000,
             "country": "USA",
-            "skills": ["Python", "JavaScript", "Django"]
+            "skills": ["Python", "JavaScript", "Django"],
+            "dropped_notifications": 0
         }
 
     """
@@ -70,34 +193,135 @@ def add_new_job(
         salary=new_job.salary,
         skills=new_job.skills,
     )
-    job_repository.add(job)
+    await job_repository.add(job)
+
+    to_notify = await job_alert_service.get_job_alerts_to_notify(job)
+    dropped = 0
+    for email in dict.fromkeys(job_alert.email for job_alert in to_notify):
+        try:
+            await notifier_service.notify(email, job)
+        except NotificationQueueFull:
+            dropped += 1
+    if dropped:
+        logger.warning("Dropped %d notifications of a stored job, the notification queue is full", dropped)
+        NOTIFICATIONS_DROPPED.inc(dropped)
+
+    return AddedJobOut(**new_job.model_dump(), dropped_notifications=dropped)
+
+
+@app.post("/add-jobs", response_model=BulkJobsOut)
+async def add_new_jobs(
+    request: Request,
+    job_repository: Annotated[AsyncJobRepository, Depends(get_async_job_repository)],
+    job_alert_service: Annotated[AsyncJobAlertService, Depends(get_async_job_alert_service)],
+    notifier_service: Annotated[AsyncNotifier, Depends(get_async_notifier_service)],
+):
+    """Endpoint to add a batch of new jobs to the repository.
+
+    The body is either a JSON array of jobs or, with the application/x-ndjson content type, newline delimited JSON
+    with one job per line. The body is read as a stream and parsed as it is received, the JSON array in a worker
+    thread, so it is never buffered whole. The jobs are validated and stored in chunks of bulk_chunk_size, and each
+    chunk is matched against the job alerts in one pass. The subscribers get a single notification for all of their
+    matching jobs. Invalid items are skipped and reported in the response with their errors, the valid ones are still
+    added, and a body found malformed after its first items is reported as a last invalid item.
+    The notifications that do not fit in a full notification queue are dropped and reported in the response.
+
+    Args:
+        request (Request): The request, whose body holds the jobs.
+        job_repository (AsyncJobRepository): The AsyncJobRepository instance used to store the jobs.
+        job_alert_service (AsyncJobAlertService): The AsyncJobAlertService instance used to find the subscribers to notify.
+        notifier_service (AsyncNotifier): The AsyncNotifier instance used to notify the subscribers.
+
+    Returns:
+        BulkJobsOut: The status of each item, by position in the batch, and the throughput of the ingestion.
+
+    Raises:
+        HTTPException: If the body is not a JSON array, or is malformed before its first item (400).
 
-    to_notify = job_alert_service.get_job_alerts_to_notify(job)
-    for notification in to_notify:
-        notifier_service.notify(notification.email, job)
+    Example:
+        Request:
+        POST /add-jobs
+        Content-Type: application/x-ndjson
 
-    return new_job
+        {"name": "Software Engineer", "salary": 100000, "country": "USA", "skills": ["Python"]}
+        {"name": "Data Scientist", "country": "Canada"}
+
+        Response:
+        {
+            "created": 1,
+            "rejected": 1,
+            "subscribers": 0,
+            "notifications": 0,
+            "dropped_notifications": 0,
+            "elapsed": 0.0004,
+            "jobs_per_second": 2500.0,
+            "items": [
+                {"index": 0, "status": "created", "errors": []},
+                {"index": 1, "status": "invalid", "errors": ["salary: Field required", "skills: Field required"]}
+            ]
+        }
+
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        batches = iter_ndjson_lines(request.stream())
+    else:
+        batches = iter_json_array(request.stream(), offload=True)
+
+    try:
+        report = await ingest_jobs(batches, job_repository, job_alert_service, notifier_service, settings.bulk_chunk_size)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=f"The body is not a JSON array: {error}")
+
+    return {
+        "created": report.created,
+        "rejected": report.rejected,
+        "subscribers": report.subscribers,
+        "notifications": report.notifications,
+        "dropped_notifications": report.dropped_notifications,
+        "elapsed": report.elapsed,
+        "jobs_per_second": report.jobs_per_second,
+        "items": [asdict(item) for item in report.items],
+    }
 
 
 @app.get("/jobs", response_model=list[JobOut])
-def get_jobs(repository: Annotated[JobRepository, Depends(get_job_repository)]):
-    """Endpoint to retrieve all jobs from the repository.
+async def get_jobs(
+    repository: Annotated[AsyncJobRepository, Depends(get_async_job_repository)],
+    job_filters: Annotated[JobFilters, Depends(get_job_filters)],
+    page: Annotated[PageRequest, Depends(get_page_request)],
+    listing_cache: Annotated[ListingCache, Depends(get_listing_cache)],
+    response: Response,
+):
+    """Endpoint to retrieve jobs from the repository.
+
+    This endpoint allows clients to fetch the jobs from the job repository. It uses the provided JobRepository instance
+    to retrieve the jobs satisfying the optional query parameters name, country, salary_min, salary_max and skills,
+    and returns them as a list of JobOut models.
 
-    This endpoint allows clients to fetch all the jobs from the job repository. It uses the provided JobRepository instance
-    to retrieve the jobs and returns them as a list of JobOut models.
+    With the limit query parameter the jobs are paginated: when there are more jobs, the X-Next-Cursor header holds the
+    cursor query parameter of the next page. With format=ndjson the jobs are streamed as newline delimited JSON,
+    serialized one by one as they are read from the repository.
+
+    The listings without limit are read and encoded in a worker thread, so a large catalogue does not block the
+    event loop. JSON listings are encoded once and kept in the listing cache until the repository version changes, so repeated
+    requests are answered with the cached bytes, without building and validating the jobs again.
 
     Args:
-        repository (JobRepository): The JobRepository instance used to fetch the jobs.
+        repository (AsyncJobRepository): The AsyncJobRepository instance used to fetch the jobs.
+        job_filters (JobFilters): The filters built from the query parameters of the request.
+        page (PageRequest): The pagination parameters built from the query parameters of the request.
+        listing_cache (ListingCache): The ListingCache instance holding the encoded listings.
+        response (Response): The response, used to set the X-Next-Cursor header.
 
     Returns:
-        list[JobOut]: A list of JobOut models representing all the jobs in the repository.
+        list[JobOut]: A list of JobOut models representing the jobs in the repository satisfying the filters.
 
     Raises:
         HTTPException: If there is an error while fetching the jobs from the repository.
 
     Example:
     Request:
-        GET /jobs
+        GET /jobs?salary_min=90000&skills=Python
 
         Response:
         [
@@ -117,32 +341,156 @@ def get_jobs(repository: Annotated[JobRepository, Depends(get_job_repository)]):
         ]
 
     """
-    jobs = repository.get_jobs()
+    version = await repository.get_version()
+    if page.format == "json" and version is not None:
+        key = listing_key(job_filters, page.after, page.limit)
+        listing = listing_cache.get(repository.repository, version, key)
+        if listing is None:
+            rows, next_position = await repository.get_page(job_filters, page.after, page.limit)
+            jobs = [job for _, job in rows]
+            body = encode_jobs(jobs) if page.limit is not None else await asyncio.to_thread(encode_jobs, jobs)
+            listing = CachedListing(body=body, next_position=next_position)
+            listing_cache.put(repository.repository, version, key, listing)
+
+        headers = {}
+        if listing.next_position is not None:
+            headers["X-Next-Cursor"] = encode_cursor(listing.next_position)
+        return Response(content=listing.body, media_type="application/json", headers=headers)
+
+    if page.is_default:
+        jobs = await repository.get_jobs(job_filters)
+        return Response(content=await asyncio.to_thread(encode_jobs, jobs), media_type="application/json")
+
+    headers = {}
+    if page.format == "ndjson" and page.limit is None:
+        rows = repository.repository.scan(job_filters, page.after)
+        return StreamingResponse(ndjson_lines(job for _, job in rows), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    rows, next_position = await repository.get_page(job_filters, page.after, page.limit)
+    if next_position is not None:
+        headers["X-Next-Cursor"] = encode_cursor(next_position)
+
+    jobs = [job for _, job in rows]
+    if page.format == "ndjson":
+        return StreamingResponse(ndjson_lines(jobs), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    if page.limit is None:
+        return Response(content=await asyncio.to_thread(encode_jobs, jobs), media_type="application/json", headers=headers)
+
+    response.headers.update(headers)
     return jobs
 
 
+@app.get("/search", response_model=list[SearchResultOut])
+async def search_jobs(
+    repository: Annotated[AsyncJobRepository, Depends(get_async_job_repository)],
+    q: str = Query(min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    prefix: bool = True,
+):
+    """Endpoint to search the jobs of the repository by free text.
+
+    The words of the query are looked up in the name and skills of the jobs, and the jobs are ranked with BM25:
+    jobs holding more of the query words, and rarer ones, come first. With prefix=true, the default, each query
+    word also matches the words starting with it, so "pyt dev" finds "Sr Python Developer".
+
+    Args:
+        repository (AsyncJobRepository): The AsyncJobRepository instance used to search the jobs.
+        q (str): The free text query.
+        limit (int): The maximum number of jobs to return, 10 by default.
+        prefix (bool): Whether each query word matches every word starting with it.
+
+    Returns:
+        list[SearchResultOut]: The best matching jobs with their score, by decreasing score.
+
+    Example:
+    Request:
+        GET /search?q=python%20dev&limit=2
+
+        Response:
+        [
+            {
+                "name": "Sr Python Developer",
+                "country": "Spain",
+                "salary": 50000,
+                "skills": ["Python", "OOP"],
+                "score": 2.31
+            },
+            {
+                "name": "Python Engineer",
+                "country": "USA",
+                "salary": 90000,
+                "skills": ["Python", "Django"],
+                "score": 1.12
+            }
+        ]
+
+    """
+    hits = await repository.search(q, limit, prefix)
+
+    return [{**job.to_dict(), "score": score} for job, score in hits]
+
+
+def resume_position(jobs: list, after: int, anchor: str) -> int:
+    """Find the position to resume a merged listing after, from the cursor of the previous page.
+
+    Args:
+        jobs (list): The jobs of the merged listing.
+        after (int): The position of the last job of the previous page when it was served.
+        anchor (str): The fingerprint_digest of that job.
+
+    Returns:
+        int: The current position of that job, looked up at its former position first, or its former position if
+            it is gone.
+
+    """
+    if 0 <= after < len(jobs) and fingerprint_digest(jobs[after]) == anchor:
+        return after
+
+    return next((position for position, job in enumerate(jobs) if fingerprint_digest(job) == anchor), after)
+
+
 @app.get("/aggregated-jobs", response_model=list[JobOut])
-def aggregated_jobs(
+async def aggregated_jobs(
     service: Annotated[JobFinderAggregator, Depends(get_job_finder_aggregator)],
+    job_filters: Annotated[JobFilters, Depends(get_job_filters)],
+    page: Annotated[PageRequest, Depends(get_page_request)],
+    response: Response,
 ):
     """Endpoint to retrieve aggregated jobs from multiple sources.
 
     This endpoint aggregates jobs from both the external job finder service and the job repository.
     It uses the provided ExternalJobFinderService instance to fetch jobs from the external service
-    and the provided JobRepository instance to fetch jobs from the repository.
+    and the provided JobRepository instance to fetch jobs from the repository. The sources are queried
+    concurrently, the jobs of a source failing or missing its deadline are left out of the response.
+    The optional query parameters name, country, salary_min, salary_max and skills are pushed down to every source:
+    they are sent upstream to the external service and looked up in the indexes of the job repository.
+    When the catalogue of the external service is synchronized in the background, its jobs are read from the local
+    mirror instead, so the response only reads local data.
+
+    With the limit query parameter the jobs are paginated: when there are more jobs, the X-Next-Cursor header holds the
+    cursor query parameter of the next page. The listing is merged again for every page, so the cursor holds the
+    fingerprint of the last job of the page along with its position: the next page resumes after that job wherever
+    it moved, so jobs added to or removed from the sources before it do not repeat or skip jobs. If that job is gone
+    from every source, the next page resumes at its former position, and pagination is only best-effort.
+    With format=ndjson and no limit, the jobs are streamed as newline delimited
+    JSON as each source answers, the jobs of the repository first; the X-Job-Sources and X-Job-Duplicates headers are not sent in that case.
+    The outcome of each source is reported in the X-Job-Sources header, e.g. "JobberwockyExtraSource=timeout, InMemoryJobRepository=ok".
+    A job posted by several sources is only returned once, the number of jobs of each source removed as duplicates
+    is reported in the X-Job-Duplicates header, e.g. "JobberwockyExtraSource=3, InMemoryJobRepository=0".
 
     Args:
         service (JobFinderAgreggator): The JobFinderAgreggator instance used to fetch jobs from the external services.
+        job_filters (JobFilters): The filters built from the query parameters of the request.
+        page (PageRequest): The pagination parameters built from the query parameters of the request.
+        response (Response): The response, used to set the X-Job-Sources, X-Job-Duplicates and X-Next-Cursor headers.
 
     Returns:
-        list[JobOut]: A list of JobOut models representing all the aggregated jobs from both sources.
-
-    Raises:
-        HTTPException: If there is an error while fetching the jobs from the external service.
+        list[JobOut]: A list of JobOut models representing all the aggregated jobs from the sources that answered in time.
 
     Example:
     Request:
-        GET /aggregated-jobs
+        GET /aggregated-jobs?salary_min=90000
 
         Response:
         [
@@ -162,21 +510,71 @@ def aggregated_jobs(
         ]
 
     """
-    try:
-        jobs = service.get_jobs()
-    except JobFinderServiceError:
-        jobs = []
-
+    if page.format == "ndjson" and page.limit is None and page.after < 0:
+        return StreamingResponse(ndjson_lines_async(service.stream_jobs(job_filters)), media_type=NDJSON_MEDIA_TYPE)
+
+    aggregated = await service.get_jobs(job_filters)
+    headers = {
+        "X-Job-Sources": ", ".join(f"{source.name}={source.status}" for source in aggregated.sources),
+        "X-Job-Duplicates": ", ".join(f"{source.name}={source.duplicates}" for source in aggregated.sources),
+    }
+    if page.is_default:
+        response.headers.update(headers)
+        return aggregated.jobs
+
+    after = page.after
+    if page.anchor is not None:
+        after = resume_position(aggregated.jobs, page.after, page.anchor)
+    rows = islice(enumerate(aggregated.jobs), after + 1, None)
+    if page.limit is not None:
+        rows, next_position = take_page(rows, page.limit)
+        if next_position is not None:
+            headers["X-Next-Cursor"] = encode_cursor(next_position, fingerprint_digest(aggregated.jobs[next_position]))
+
+    jobs = [job for _, job in rows]
+    if page.format == "ndjson":
+        return StreamingResponse(ndjson_lines(jobs), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    response.headers.update(headers)
     return jobs
 
 
 @app.post("/job-alert", status_code=201, response_model=JobAlertOut)
-def add_new_job_alert(
+async def add_new_job_alert(
     job_alert: JobAlertIn,
-    job_alert_repo: Annotated[JobAlertRepository, Depends(get_alert_repository)],
+    job_alert_service: Annotated[AsyncJobAlertService, Depends(get_async_job_alert_service)],
 ):
-    new_job_alert = JobAlert(email=job_alert.email, regex_name=job_alert.regex_name)
+    new_job_alert = JobAlert(**job_alert.model_dump())
 
-    job_alert_repo.add(new_job_alert)
+    await job_alert_service.add_job_alert(new_job_alert)
 
     return job_alert
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(
+    registry: Annotated[MetricsRegistry, Depends(get_metrics_registry)],
+):
+    """Endpoint to expose the metrics of the application in the Prometheus text format.
+
+    The metrics are rendered in a worker thread, as computing the size of the repository may query the database.
+
+    Args:
+        registry (MetricsRegistry): The MetricsRegistry instance holding the metrics of the application.
+
+    Returns:
+        Response: The latency of the requests by route, the matching of the job alerts, the requests to the extra
+            source, the repository operations, the size of the repository and the depth of the notification queue.
+
+    Example:
+        Request:
+        GET /metrics
+
+        Response:
+        # HELP jobberwocky_repository_jobs Jobs in the job repository.
+        # TYPE jobberwocky_repository_jobs gauge
+        jobberwocky_repository_jobs 1200
+        ...
+
+    """
+    return Response(await asyncio.to_thread(registry.render), media_type=CONTENT_TYPE)
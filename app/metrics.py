@@ -0,0 +1,424 @@
+import bisect
+import math
+import threading
+from typing import Callable, Optional
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the Prometheus text format.
+
+    Args:
+        value (str): The label value.
+
+    Returns:
+        str: The value with its backslashes, double quotes and newlines escaped.
+
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    """Format a sample value for the Prometheus text format.
+
+    Args:
+        value (float): The sample value.
+
+    Returns:
+        str: The value, without a fractional part for integers.
+
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+
+    return repr(float(value))
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    """Format the labels of a sample.
+
+    Args:
+        names (tuple[str, ...]): The label names.
+        values (tuple[str, ...]): The label values, in the order of the names.
+        extra (str): An already formatted label appended to the others, such as the le label of a bucket.
+
+    Returns:
+        str: The labels between braces, or an empty string if there are none.
+
+    """
+    labels = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Metric:
+    """The base class of the metric families, holding one child per combination of label values.
+
+    The children are created once, by labels, and then updated in place: the callers keep a reference to the
+    children they update on hot paths, so recording a sample does not allocate.
+
+    Attributes:
+        name (str): The name of the metric.
+        documentation (str): The help text of the metric.
+        labelnames (tuple[str, ...]): The names of the labels of the metric.
+
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        """Initialize the Metric.
+
+        Args:
+            name (str): The name of the metric.
+            documentation (str): The help text of the metric.
+            labelnames (tuple[str, ...]): The names of the labels of the metric.
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Retrieve the child of a combination of label values, creating it on first use.
+
+        Args:
+            *values (str): The label values, in the order of the label names.
+
+        Returns:
+            The child holding the samples of these label values.
+
+        Raises:
+            ValueError: If the number of values is not the number of labels.
+
+        """
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+
+        with self._lock:
+            return self._children.setdefault(values, self._new_child())
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        """List the samples of the metric.
+
+        Returns:
+            list[tuple[str, str, float]]: The name suffix, the formatted labels and the value of each sample.
+
+        """
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric in the Prometheus text format.
+
+        Returns:
+            str: The HELP and TYPE lines followed by a line per sample.
+
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(f"{self.name}{suffix}{labels} {format_value(value)}" for suffix, labels, value in self.samples())
+
+        return "\n".join(lines) + "\n"
+
+
+class CounterChild:
+    """The value of a counter for a combination of label values."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        """Increment the counter.
+
+        Args:
+            amount (float): The non-negative amount to add.
+
+        """
+        with self._lock:
+            self.value += amount
+
+
+class Counter(Metric):
+    """A monotonically increasing counter."""
+
+    type = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1):
+        """Increment the counter of a metric without labels.
+
+        Args:
+            amount (float): The non-negative amount to add.
+
+        """
+        self._default.inc(amount)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        return [
+            ("", format_labels(self.labelnames, values), child.value)
+            for values, child in sorted(self._children.items())
+        ]
+
+
+class GaugeChild:
+    """The value of a gauge for a combination of label values."""
+
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        """Set the gauge.
+
+        Args:
+            value (float): The new value.
+
+        """
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the gauge when the metrics are collected instead of setting it.
+
+        Args:
+            function (Callable[[], float]): The function returning the current value.
+
+        """
+        self.function = function
+
+    def get(self) -> float:
+        """float: The current value of the gauge."""
+        return self.function() if self.function is not None else self.value
+
+
+class Gauge(Metric):
+    """A value that can go up and down, set by the callers or computed when the metrics are collected."""
+
+    type = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float):
+        """Set the gauge of a metric without labels.
+
+        Args:
+            value (float): The new value.
+
+        """
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the gauge of a metric without labels when the metrics are collected.
+
+        Args:
+            function (Callable[[], float]): The function returning the current value.
+
+        """
+        self._default.set_function(function)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        return [("", format_labels(self.labelnames, values), child.get()) for values, child in sorted(self._children.items())]
+
+
+class HistogramChild:
+    """The buckets of a histogram for a combination of label values.
+
+    The counts are kept per bucket, not cumulated, in a list allocated once: an observation finds its bucket by
+    bisection and increments it.
+
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record an observation.
+
+        Args:
+            value (float): The observed value, such as a duration in seconds.
+
+        """
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(Metric):
+    """A distribution of observations counted in cumulative buckets.
+
+    Attributes:
+        buckets (tuple[float, ...]): The upper bounds of the buckets, in increasing order, without +Inf.
+
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        """Initialize the Histogram.
+
+        Args:
+            name (str): The name of the metric.
+            documentation (str): The help text of the metric.
+            labelnames (tuple[str, ...]): The names of the labels of the metric.
+            buckets (tuple[float, ...]): The upper bounds of the buckets, in increasing order.
+
+        """
+        self.buckets = tuple(sorted(bucket for bucket in buckets if not math.isinf(bucket)))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        """Record an observation of a metric without labels.
+
+        Args:
+            value (float): The observed value.
+
+        """
+        self._default.observe(value)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        samples = []
+        for values, child in sorted(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                samples.append(("_bucket", format_labels(self.labelnames, values, f'le="{format_value(bound)}"'), cumulative))
+            samples.append(("_sum", format_labels(self.labelnames, values), total))
+            samples.append(("_count", format_labels(self.labelnames, values), cumulative))
+
+        return samples
+
+
+class MetricsRegistry:
+    """The metrics of the application, rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        """Initialize the MetricsRegistry."""
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric to the registry.
+
+        Args:
+            metric (Metric): The metric.
+
+        Returns:
+            Metric: The metric.
+
+        Raises:
+            ValueError: If a metric with the same name is already registered.
+
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicated metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Create and register a Counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Create and register a Gauge."""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Create and register a Histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Retrieve a registered metric by name.
+
+        Args:
+            name (str): The name of the metric.
+
+        Returns:
+            Optional[Metric]: The metric, or None if there is none with this name.
+
+        """
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format.
+
+        Returns:
+            str: The metrics, in the order they were registered.
+
+        """
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+# The metrics of the application, recorded on the hot paths through the children below
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "jobberwocky_http_request_duration_seconds", "Duration of the HTTP requests by route.", ("method", "route")
+)
+HTTP_REQUESTS = registry.counter(
+    "jobberwocky_http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")
+)
+
+ALERT_MATCH_DURATION = registry.histogram(
+    "jobberwocky_alert_match_duration_seconds", "Duration of the matching of new jobs against the job alerts."
+)
+ALERT_MATCHED_JOBS = registry.counter("jobberwocky_alert_matched_jobs_total", "New jobs matched against the job alerts.")
+ALERT_MATCHES = registry.counter("jobberwocky_alert_matches_total", "Job alerts matching new jobs.")
+
+EXTRA_SOURCE_DURATION = registry.histogram(
+    "jobberwocky_extra_source_request_duration_seconds", "Duration of the requests to the extra source."
+)
+EXTRA_SOURCE_ERRORS = registry.counter("jobberwocky_extra_source_errors_total", "Failed requests to the extra source.")
+
+STORAGE_DURATION = registry.histogram(
+    "jobberwocky_storage_operation_duration_seconds", "Duration of the job repository operations.", ("operation",)
+)
+STORAGE_ADD = STORAGE_DURATION.labels("add")
+STORAGE_ADD_MANY = STORAGE_DURATION.labels("add_many")
+STORAGE_GET = STORAGE_DURATION.labels("get_jobs")
+STORAGE_SEARCH = STORAGE_DURATION.labels("search")
+
+REPOSITORY_JOBS = registry.gauge("jobberwocky_repository_jobs", "Jobs in the job repository.")
+NOTIFICATION_QUEUE_DEPTH = registry.gauge(
+    "jobberwocky_notification_queue_depth", "Notifications enqueued and not yet delivered."
+)
+NOTIFICATIONS_DROPPED = registry.counter(
+    "jobberwocky_notifications_dropped_total", "Job notifications dropped because the notification queue was full."
+)
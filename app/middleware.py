@@ -0,0 +1,174 @@
+import random
+import time
+from typing import Callable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+from app.profiling import ProfileStore, new_recorder
+
+
+class MetricsMiddleware:
+    """An ASGI middleware recording the duration and status code of the HTTP requests by route.
+
+    Requests are labelled with the path template of the route they were routed to, such as "/jobs", so that the
+    number of label values stays bounded, and with "unmatched" when no route matched. The duration runs until the
+    last chunk of the response body is sent, so streamed responses are measured whole.
+
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Initialize the MetricsMiddleware.
+
+        Args:
+            app (ASGIApp): The application to measure.
+
+        """
+        self.app = app
+        self._paths: Optional[dict[Callable, str]] = None
+
+    def route_path(self, scope: Scope) -> str:
+        """Find the path template of the route a request was routed to.
+
+        Args:
+            scope (Scope): The ASGI scope of the request, once it went through the router.
+
+        Returns:
+            str: The path of the route, or "unmatched" if the request was not routed to an endpoint.
+
+        """
+        if self._paths is None:
+            routes = getattr(scope.get("app"), "routes", [])
+            self._paths = {route.endpoint: route.path for route in routes if hasattr(route, "endpoint")}
+
+        return self._paths.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self.route_path(scope)
+            HTTP_REQUEST_DURATION.labels(scope["method"], route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(scope["method"], route, str(status)).inc()
+
+
+class ProfilingMiddleware:
+    """An ASGI middleware profiling the requests selected by a header or by sampling, and keeping the slow ones.
+
+    A request is profiled when it has the header, if a header is set, or else with the probability of the sample
+    rate. Its trace is kept in the store when the request was selected by the header, or when it took at least
+    the threshold. A single request is profiled at a time, the requests selected meanwhile are served as usual.
+    The requests not selected only cost a header lookup and a random draw; the middleware is not installed at
+    all unless profiling is enabled.
+
+    Attributes:
+        store (ProfileStore): The ring buffer the traces are kept in.
+        sample_rate (float): The probability that a request is profiled, between 0 and 1.
+        header (Optional[str]): The header selecting a request, whose value may name the mode, None to disable.
+        threshold (float): The duration in seconds above which the trace of a sampled request is kept.
+        mode (str): The default profiling mode, "cprofile" or "sample".
+        interval (float): The sampling interval in seconds of the "sample" mode.
+
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        sample_rate: float = 0.0,
+        header: Optional[str] = None,
+        threshold: float = 0.5,
+        mode: str = "cprofile",
+        interval: float = 0.005,
+        draw: Callable[[], float] = random.random,
+    ):
+        """Initialize the ProfilingMiddleware.
+
+        Args:
+            app (ASGIApp): The application to profile.
+            store (ProfileStore): The ring buffer the traces are kept in.
+            sample_rate (float): The probability that a request is profiled, between 0 and 1.
+            header (Optional[str]): The header selecting a request, None to disable.
+            threshold (float): The duration in seconds above which the trace of a sampled request is kept.
+            mode (str): The default profiling mode, "cprofile" or "sample".
+            interval (float): The sampling interval in seconds of the "sample" mode.
+            draw (Callable[[], float]): The random number generator of the sampling, in [0, 1).
+
+        """
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.header = header.lower().encode("latin-1") if header else None
+        self.threshold = threshold
+        self.mode = mode
+        self.interval = interval
+        self._draw = draw
+        self._active = False
+
+    def select(self, scope: Scope) -> tuple[Optional[str], bool]:
+        """Decide whether to profile a request.
+
+        Args:
+            scope (Scope): The ASGI scope of the request.
+
+        Returns:
+            tuple[Optional[str], bool]: The profiling mode, None not to profile the request, and whether the
+                request was selected by the header.
+
+        """
+        if self.header is not None:
+            for name, value in scope["headers"]:
+                if name == self.header:
+                    requested = value.decode("latin-1").strip().lower()
+                    return (requested if requested in ("cprofile", "sample") else self.mode), True
+
+        if self.sample_rate and self._draw() < self.sample_rate:
+            return self.mode, False
+
+        return None, False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+
+        mode, requested = self.select(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        recorder = new_recorder(mode, self.interval)
+        self._active = True
+        started_at = time.time()
+        start = time.perf_counter()
+        recorder.start()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            recorder.stop()
+            duration = time.perf_counter() - start
+            self._active = False
+            if requested or duration >= self.threshold:
+                summary, data = recorder.dump()
+                self.store.add(scope["method"], scope["path"], status, mode, started_at, duration, summary, data)
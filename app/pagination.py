@@ -0,0 +1,165 @@
+import base64
+import binascii
+import json
+from dataclasses import asdict, dataclass, is_dataclass
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, Union
+
+from app.domain.job import Dictable
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@dataclass
+class PageRequest:
+    """The pagination and format parameters of a listing request.
+
+    Attributes:
+        limit (Optional[int]): The maximum number of items of the page, None for every item.
+        after (int): The position of the last item of the previous page, -1 for the first page.
+        format (str): "json" for a JSON array, "ndjson" for newline delimited JSON streamed item by item.
+        anchor (Optional[str]): The identifier of the last item of the previous page, None if the cursor has none.
+
+    """
+
+    limit: Optional[int] = None
+    after: int = -1
+    format: str = "json"
+    anchor: Optional[str] = None
+
+    @property
+    def is_default(self) -> bool:
+        """bool: Whether the request asks for the whole listing as a JSON array."""
+        return self.limit is None and self.after < 0 and self.format == "json"
+
+
+class InvalidCursorError(ValueError):
+    """An exception raised when a pagination cursor can not be decoded.
+
+    Inherits from:
+        ValueError: The base class for invalid argument values.
+
+    """
+
+    pass
+
+
+def encode_cursor(position: int, anchor: Optional[str] = None) -> str:
+    """Encode a position in a listing as an opaque cursor.
+
+    Args:
+        position (int): The position of the last item of a page.
+        anchor (Optional[str]): An identifier of the last item of a page, to find it again if it moved.
+
+    Returns:
+        str: The cursor of the next page.
+
+    """
+    payload = {"p": position} if anchor is None else {"p": position, "a": anchor}
+
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor built by encode_cursor.
+
+    Args:
+        cursor (str): The cursor.
+
+    Returns:
+        int: The position of the last item of the previous page.
+
+    Raises:
+        InvalidCursorError: If the cursor was not built by encode_cursor.
+
+    """
+    return decode_cursor_anchor(cursor)[0]
+
+
+def decode_cursor_anchor(cursor: str) -> tuple[int, Optional[str]]:
+    """Decode a cursor built by encode_cursor, with its anchor.
+
+    Args:
+        cursor (str): The cursor.
+
+    Returns:
+        tuple[int, Optional[str]]: The position of the last item of the previous page, and its anchor, None if the
+            cursor has none.
+
+    Raises:
+        InvalidCursorError: If the cursor was not built by encode_cursor.
+
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        position = payload["p"]
+        anchor = payload.get("a")
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise InvalidCursorError(cursor)
+    if not isinstance(position, int) or not isinstance(anchor, (str, type(None))):
+        raise InvalidCursorError(cursor)
+
+    return position, anchor
+
+
+def take_page(rows: Iterator[tuple[int, object]], limit: int) -> tuple[list[tuple[int, object]], Optional[int]]:
+    """Take a page of items from an iterator of positioned items.
+
+    Args:
+        rows (Iterator[tuple[int, object]]): The items with their position, in increasing position order.
+        limit (int): The maximum number of items of the page.
+
+    Returns:
+        tuple[list[tuple[int, object]], Optional[int]]: The items of the page, and the position to resume after
+            if there are more items, None otherwise.
+
+    """
+    page = list(islice(rows, limit + 1))
+    if len(page) <= limit:
+        return page, None
+
+    return page[:limit], page[limit - 1][0]
+
+
+def job_to_dict(job) -> dict:
+    """Convert a job, either a dataclass or a dictionary, into a dictionary.
+
+    Args:
+        job: The job to convert.
+
+    Returns:
+        dict: The job as a dictionary.
+
+    """
+    if isinstance(job, Dictable):
+        return job.to_dict()
+
+    return asdict(job) if is_dataclass(job) else dict(job)
+
+
+def ndjson_lines(jobs: Iterable) -> Iterable[str]:
+    """Serialize jobs lazily as newline delimited JSON.
+
+    Args:
+        jobs (Iterable): The jobs to serialize.
+
+    Yields:
+        str: One line of JSON per job.
+
+    """
+    for job in jobs:
+        yield json.dumps(job_to_dict(job)) + "\n"
+
+
+async def ndjson_lines_async(jobs: Union[AsyncIterable, AsyncIterator]) -> AsyncIterator[str]:
+    """Serialize jobs produced by an asynchronous iterator lazily as newline delimited JSON.
+
+    Args:
+        jobs (AsyncIterable): The jobs to serialize.
+
+    Yields:
+        str: One line of JSON per job.
+
+    """
+    async for job in jobs:
+        yield json.dumps(job_to_dict(job)) + "\n"
@@ -0,0 +1,277 @@
+import cProfile
+import io
+import itertools
+import marshal
+import pstats
+import sys
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Literal, Optional, Protocol
+
+ProfileMode = Literal["cprofile", "sample"]
+
+
+@dataclass
+class ProfileTrace:
+    """The profile of a request.
+
+    Attributes:
+        id (int): The identifier of the trace.
+        method (str): The HTTP method of the request.
+        path (str): The path of the request.
+        status (int): The status code of the response.
+        mode (str): "cprofile" for a cProfile trace, "sample" for sampled stacks.
+        started_at (float): The time the request started, in seconds since the epoch.
+        duration (float): The duration of the request in seconds.
+        summary (str): A readable summary of the trace, the most expensive functions or stacks.
+        data (bytes): The raw trace: a pstats file for cProfile, collapsed stacks for sampling.
+
+    """
+
+    id: int
+    method: str
+    path: str
+    status: int
+    mode: str
+    started_at: float
+    duration: float
+    summary: str = field(repr=False)
+    data: bytes = field(repr=False)
+
+    def describe(self) -> dict:
+        """Describe the trace without its summary and data.
+
+        Returns:
+            dict: The identifier, request, status, mode, start, duration and size of the trace.
+
+        """
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "mode": self.mode,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "size": len(self.data),
+        }
+
+
+class Recorder(Protocol):
+    """A protocol defining the contract for a profiler recording a single request."""
+
+    def start(self):
+        """Start recording."""
+        ...
+
+    def stop(self):
+        """Stop recording."""
+        ...
+
+    def dump(self) -> tuple[str, bytes]:
+        """Format the trace recorded.
+
+        Returns:
+            tuple[str, bytes]: The readable summary and the raw data of the trace.
+
+        """
+        ...
+
+
+class CProfileRecorder:
+    """A Recorder tracing every function call of the thread it is started in with cProfile.
+
+    Only the calling thread is traced: the work a request hands over to worker threads is not. The other requests
+    running on the event loop while the request is profiled are traced with it.
+
+    Attributes:
+        top (int): The number of functions of the summary.
+
+    """
+
+    def __init__(self, top: int = 30):
+        """Initialize the CProfileRecorder.
+
+        Args:
+            top (int): The number of functions of the summary.
+
+        """
+        self.top = top
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        """Start recording."""
+        self._profile.enable()
+
+    def stop(self):
+        """Stop recording."""
+        self._profile.disable()
+
+    def dump(self) -> tuple[str, bytes]:
+        """Format the trace recorded.
+
+        Returns:
+            tuple[str, bytes]: The functions with the greatest cumulative time, and the trace in the pstats format.
+
+        """
+        self._profile.create_stats()
+        data = marshal.dumps(self._profile.stats)
+        summary = io.StringIO()
+        pstats.Stats(self._profile, stream=summary).sort_stats("cumulative").print_stats(self.top)
+
+        return summary.getvalue(), data
+
+
+class StackSampler:
+    """A Recorder sampling the stacks of every thread at a fixed interval, from a background thread.
+
+    Sampling sees the worker threads as well as the event loop, at a cost that does not depend on the number of
+    function calls. The stacks are collapsed as "outer;...;inner count" lines, the input of flame graph tools.
+
+    Attributes:
+        interval (float): The time in seconds between two samples.
+        top (int): The number of stacks of the summary.
+
+    """
+
+    def __init__(self, interval: float = 0.005, top: int = 30):
+        """Initialize the StackSampler.
+
+        Args:
+            interval (float): The time in seconds between two samples.
+            top (int): The number of stacks of the summary.
+
+        """
+        self.interval = interval
+        self.top = top
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(f"{frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self._stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        """Start sampling in a background thread."""
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling, waiting for the background thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def dump(self) -> tuple[str, bytes]:
+        """Format the stacks sampled.
+
+        Returns:
+            tuple[str, bytes]: The most sampled stacks, and every stack collapsed with its count.
+
+        """
+        collapsed = "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+        summary = f"{self.samples} samples every {self.interval * 1000:g}ms\n\n" + "".join(
+            f"{count:6d}  {stack.rsplit(';', 1)[-1]}\n      {stack}\n" for stack, count in self._stacks.most_common(self.top)
+        )
+
+        return summary, collapsed.encode()
+
+
+class ProfileStore:
+    """A bounded ring buffer of the last profile traces.
+
+    Attributes:
+        max_size (int): The maximum number of traces kept, the oldest being dropped first.
+        recorded (int): The number of traces recorded.
+
+    """
+
+    def __init__(self, max_size: int = 50):
+        """Initialize the ProfileStore.
+
+        Args:
+            max_size (int): The maximum number of traces kept.
+
+        """
+        self.max_size = max_size
+        self.recorded = 0
+        self._traces: deque[ProfileTrace] = deque(maxlen=max_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, method: str, path: str, status: int, mode: str, started_at: float, duration: float, summary: str, data: bytes) -> ProfileTrace:
+        """Store a trace, dropping the oldest one if the buffer is full.
+
+        Args:
+            method (str): The HTTP method of the request.
+            path (str): The path of the request.
+            status (int): The status code of the response.
+            mode (str): The mode of the trace, "cprofile" or "sample".
+            started_at (float): The time the request started, in seconds since the epoch.
+            duration (float): The duration of the request in seconds.
+            summary (str): A readable summary of the trace.
+            data (bytes): The raw trace.
+
+        Returns:
+            ProfileTrace: The stored trace.
+
+        """
+        with self._lock:
+            trace = ProfileTrace(next(self._ids), method, path, status, mode, started_at, duration, summary, data)
+            self._traces.append(trace)
+            self.recorded += 1
+
+        return trace
+
+    def list(self) -> list[ProfileTrace]:
+        """List the traces kept.
+
+        Returns:
+            list[ProfileTrace]: The traces, the most recent first.
+
+        """
+        with self._lock:
+            return list(reversed(self._traces))
+
+    def get(self, trace_id: int) -> Optional[ProfileTrace]:
+        """Retrieve a trace.
+
+        Args:
+            trace_id (int): The identifier of the trace.
+
+        Returns:
+            Optional[ProfileTrace]: The trace, or None if it is not kept.
+
+        """
+        with self._lock:
+            return next((trace for trace in self._traces if trace.id == trace_id), None)
+
+
+def new_recorder(mode: str, interval: float = 0.005) -> Recorder:
+    """Build the recorder of a profiling mode.
+
+    Args:
+        mode (str): "cprofile" or "sample".
+        interval (float): The sampling interval in seconds, for "sample".
+
+    Returns:
+        Recorder: A CProfileRecorder or a StackSampler.
+
+    """
+    if mode == "sample":
+        return StackSampler(interval)
+
+    return CProfileRecorder()
+
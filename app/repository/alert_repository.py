@@ -1,5 +1,7 @@
+import json
 from typing import Protocol
 
+from app.database import SQLiteConnectionPool
 from app.domain.job_alert import JobAlert
 from app.storage import Storage
 
@@ -31,6 +33,22 @@ class JobAlertRepository(Protocol):
         """
         ...
 
+    def get_job_alerts_after(self, position: int = 0) -> tuple[list[JobAlert], int]:
+        """Retrieve the job alerts added to the repository after a position.
+
+        This method should be implemented so that reading the new job alerts costs the number of new job alerts,
+        not the number of job alerts in the repository.
+
+        Args:
+            position (int): The position returned by the previous call, 0 to retrieve every job alert.
+
+        Returns:
+            tuple[list[JobAlert], int]: The job alerts added after the position, in insertion order, and the position
+                to pass to the next call.
+
+        """
+        ...
+
     def add(self, alert_job: JobAlert):
         """Add a job alert to the repository.
 
@@ -74,6 +92,21 @@ class InMemoryJobAlertRepository:
 
         return all_items
 
+    def get_job_alerts_after(self, position: int = 0) -> tuple[list[JobAlert], int]:
+        """Retrieve the job alerts added to the in-memory storage after a position.
+
+        Args:
+            position (int): The number of job alerts already retrieved, 0 to retrieve every job alert.
+
+        Returns:
+            tuple[list[JobAlert], int]: The job alerts added after the position, in insertion order, and the number
+                of job alerts retrieved so far.
+
+        """
+        new_items = [JobAlert(**job_alert) for job_alert in self.storage.get_all()[position:]]
+
+        return new_items, position + len(new_items)
+
     def add(self, alert_job: JobAlert):
         """Add a job alert to the in-memory storage.
 
@@ -84,3 +117,115 @@ class InMemoryJobAlertRepository:
 
         """
         self.storage.add(alert_job.to_dict())
+
+
+class SQLiteJobAlertRepository:
+    """An implementation of the JobAlertRepository protocol using a SQLite database.
+
+    The job alerts are stored in an alerts table indexed on email, their skills and countries as JSON arrays.
+
+    Attributes:
+        pool (SQLiteConnectionPool): The pool of connections to the database.
+
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS alerts ("
+        " id INTEGER PRIMARY KEY,"
+        " email TEXT NOT NULL,"
+        " regex_name TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS alerts_email ON alerts(email)",
+    )
+
+    # The columns added to the alerts table since it was created, added to the tables of older databases
+    COLUMNS = {
+        "skills": "TEXT NOT NULL DEFAULT '[]'",
+        "countries": "TEXT NOT NULL DEFAULT '[]'",
+        "salary_min": "INTEGER",
+        "salary_max": "INTEGER",
+    }
+
+    def __init__(self, pool: SQLiteConnectionPool):
+        """Initialize the SQLiteJobAlertRepository, creating its table if it does not exist.
+
+        Args:
+            pool (SQLiteConnectionPool): The pool of connections to the database.
+
+        """
+        self.pool = pool
+        with self.pool.transaction() as connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            existing = {row[1] for row in connection.execute("PRAGMA table_info(alerts)")}
+            for column, definition in self.COLUMNS.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE alerts ADD COLUMN {column} {definition}")
+
+    def get_job_alerts(self) -> list[JobAlert]:
+        """Retrieve job alerts from the database.
+
+        Returns:
+            List[JobAlert]: A list of JobAlert objects representing all the job alerts in the database, in insertion order.
+
+        """
+        all_items, _ = self.get_job_alerts_after()
+
+        return all_items
+
+    def get_job_alerts_after(self, position: int = 0) -> tuple[list[JobAlert], int]:
+        """Retrieve the job alerts added to the database after a position.
+
+        The position is the id of the last job alert retrieved, so only the new rows are read from the primary key.
+
+        Args:
+            position (int): The id of the last job alert already retrieved, 0 to retrieve every job alert.
+
+        Returns:
+            tuple[list[JobAlert], int]: The job alerts added after the position, in insertion order, and the id of
+                the last of them, or the position if there are none.
+
+        """
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT id, email, regex_name, skills, countries, salary_min, salary_max FROM alerts WHERE id > ? ORDER BY id",
+                (position,),
+            ).fetchall()
+
+        new_items = [
+            JobAlert(
+                email=email,
+                regex_name=regex_name,
+                skills=json.loads(skills),
+                countries=json.loads(countries),
+                salary_min=salary_min,
+                salary_max=salary_max,
+            )
+            for _, email, regex_name, skills, countries, salary_min, salary_max in rows
+        ]
+
+        return new_items, rows[-1][0] if rows else position
+
+    def add(self, alert_job: JobAlert):
+        """Add a job alert to the database.
+
+        Args:
+            alert_job (JobAlert): The JobAlert object to be added.
+
+        """
+        with self.pool.transaction() as connection:
+            connection.execute(
+                "INSERT INTO alerts (email, regex_name, skills, countries, salary_min, salary_max) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    alert_job.email,
+                    alert_job.regex_name,
+                    json.dumps(alert_job.skills),
+                    json.dumps(alert_job.countries),
+                    alert_job.salary_min,
+                    alert_job.salary_max,
+                ),
+            )
+
+    def clean(self):
+        """Delete every job alert of the database."""
+        with self.pool.transaction() as connection:
+            connection.execute("DELETE FROM alerts")
@@ -0,0 +1,265 @@
+import asyncio
+from typing import Callable, Optional, Protocol, TypeVar
+
+from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.pagination import take_page
+from app.repository.repository import JobRepository
+
+T = TypeVar("T")
+
+
+class AsyncJobRepository(Protocol):
+    """A protocol defining the contract for a job repository used from the event loop.
+
+    This protocol mirrors JobRepository with coroutines, so the async route handlers never block the event loop
+    on a repository doing I/O.
+
+    """
+
+    repository: JobRepository
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """Run a function reading or writing the repository, where the repository operations run.
+
+        Args:
+            function (Callable[..., T]): The function.
+            *args: The arguments of the function.
+
+        Returns:
+            T: The result of the function.
+
+        """
+        ...
+
+    async def get_version(self) -> Optional[int]:
+        """Retrieve the version of the repository.
+
+        Returns:
+            Optional[int]: The version of the repository, None if it has none.
+
+        """
+        ...
+
+    async def count(self) -> int:
+        """Count the jobs of the repository.
+
+        Returns:
+            int: The number of jobs in the repository.
+
+        """
+        ...
+
+    async def add(self, job: Job):
+        """Add a job to the repository.
+
+        Args:
+            job (Job): The Job object to be added.
+
+        """
+        ...
+
+    async def add_many(self, jobs: list[Job]):
+        """Add several jobs to the repository at once.
+
+        Args:
+            jobs (list[Job]): The Job objects to be added, in order.
+
+        """
+        ...
+
+    async def get_jobs(self, job_filters: Optional[JobFilters] = None) -> list[Job]:
+        """Retrieve jobs from the repository.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Returns:
+            list[Job]: A list of Job objects representing the jobs in the repository satisfying the filters.
+
+        """
+        ...
+
+    async def get_page(
+        self, job_filters: Optional[JobFilters] = None, after: int = -1, limit: Optional[int] = None
+    ) -> tuple[list[tuple[int, Job]], Optional[int]]:
+        """Retrieve a page of jobs from the repository, with their position.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+            after (int): Only the jobs at a position greater than this one are returned.
+            limit (Optional[int]): The maximum number of jobs of the page, None for every job.
+
+        Returns:
+            tuple[list[tuple[int, Job]], Optional[int]]: The jobs of the page with their position, and the position
+                to resume after if there are more jobs, None otherwise.
+
+        """
+        ...
+
+    async def search(self, query: str, limit: int = 10, prefix: bool = True) -> list[tuple[Job, float]]:
+        """Search the jobs by free text over their name and skills.
+
+        Args:
+            query (str): The free text query.
+            limit (int): The maximum number of jobs to return.
+            prefix (bool): Whether each query word matches every word starting with it.
+
+        Returns:
+            list[tuple[Job, float]]: The best matching jobs with their BM25 score, by decreasing score.
+
+        """
+        ...
+
+
+def is_bounded(job_filters: Optional[JobFilters], limit: Optional[int]) -> bool:
+    """Tell whether a page of a repository held in memory is read in a time bounded by its limit.
+
+    Args:
+        job_filters (Optional[JobFilters]): The filters of the page.
+        limit (Optional[int]): The maximum number of jobs of the page, None for every job.
+
+    Returns:
+        bool: False for a page without limit, or filtered on salary, whose candidates are sorted, and the salary
+            index re-sorted after out of order adds, over the whole catalogue.
+
+    """
+    if limit is None:
+        return False
+
+    return job_filters is None or (job_filters.salary_min is None and job_filters.salary_max is None)
+
+
+class AsyncJobRepositoryAdapter:
+    """An AsyncJobRepository running the operations of a JobRepository.
+
+    The point operations of a repository held in memory take microseconds, less than a hop to a worker thread, so
+    they run on the event loop. The operations of a repository doing I/O, writing to a log or querying a database, run
+    in a worker thread instead, with offload. The listings whose time grows with the catalogue, get_jobs and the pages
+    that are not bounded, run in a worker thread whatever the repository.
+
+    Attributes:
+        repository (JobRepository): The wrapped repository.
+        offload (bool): Whether the operations run in a worker thread rather than on the event loop.
+
+    """
+
+    __slots__ = ("repository", "offload")
+
+    def __init__(self, repository: JobRepository, offload: bool = False):
+        """Initialize the AsyncJobRepositoryAdapter.
+
+        Args:
+            repository (JobRepository): The repository to wrap.
+            offload (bool): Whether the operations run in a worker thread rather than on the event loop.
+
+        """
+        self.repository = repository
+        self.offload = offload
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """Run a function reading or writing the repository, in a worker thread with offload.
+
+        Args:
+            function (Callable[..., T]): The function.
+            *args: The arguments of the function.
+
+        Returns:
+            T: The result of the function.
+
+        """
+        if self.offload:
+            return await asyncio.to_thread(function, *args)
+
+        return function(*args)
+
+    async def get_version(self) -> Optional[int]:
+        """Retrieve the version of the repository.
+
+        Returns:
+            Optional[int]: The version of the repository, None if it has none.
+
+        """
+        version = await self.run(getattr, self.repository, "version", None)
+
+        return version if isinstance(version, int) else None
+
+    async def count(self) -> int:
+        """Count the jobs of the repository.
+
+        Returns:
+            int: The number of jobs in the repository.
+
+        """
+        return await self.run(self.repository.count)
+
+    async def add(self, job: Job):
+        """Add a job to the repository.
+
+        Args:
+            job (Job): The Job object to be added.
+
+        """
+        await self.run(self.repository.add, job)
+
+    async def add_many(self, jobs: list[Job]):
+        """Add several jobs to the repository at once.
+
+        Args:
+            jobs (list[Job]): The Job objects to be added, in order.
+
+        """
+        await self.run(self.repository.add_many, jobs)
+
+    async def get_jobs(self, job_filters: Optional[JobFilters] = None) -> list[Job]:
+        """Retrieve jobs from the repository.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Returns:
+            list[Job]: A list of Job objects representing the jobs in the repository satisfying the filters.
+
+        """
+        return await asyncio.to_thread(self.repository.get_jobs, job_filters)
+
+    def _page(self, job_filters: Optional[JobFilters], after: int, limit: Optional[int]) -> tuple[list[tuple[int, Job]], Optional[int]]:
+        rows = self.repository.scan(job_filters, after)
+        if limit is None:
+            return list(rows), None
+
+        return take_page(rows, limit)
+
+    async def get_page(
+        self, job_filters: Optional[JobFilters] = None, after: int = -1, limit: Optional[int] = None
+    ) -> tuple[list[tuple[int, Job]], Optional[int]]:
+        """Retrieve a page of jobs from the repository, with their position.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+            after (int): Only the jobs at a position greater than this one are returned.
+            limit (Optional[int]): The maximum number of jobs of the page, None for every job.
+
+        Returns:
+            tuple[list[tuple[int, Job]], Optional[int]]: The jobs of the page with their position, and the position
+                to resume after if there are more jobs, None otherwise.
+
+        """
+        if not is_bounded(job_filters, limit):
+            return await asyncio.to_thread(self._page, job_filters, after, limit)
+
+        return await self.run(self._page, job_filters, after, limit)
+
+    async def search(self, query: str, limit: int = 10, prefix: bool = True) -> list[tuple[Job, float]]:
+        """Search the jobs by free text over their name and skills.
+
+        Args:
+            query (str): The free text query.
+            limit (int): The maximum number of jobs to return.
+            prefix (bool): Whether each query word matches every word starting with it.
+
+        Returns:
+            list[tuple[Job, float]]: The best matching jobs with their BM25 score, by decreasing score.
+
+        """
+        return await self.run(self.repository.search, query, limit, prefix)
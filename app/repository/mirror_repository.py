@@ -0,0 +1,189 @@
+import bisect
+import hashlib
+import json
+import threading
+from itertools import count
+from typing import Iterable, Iterator, Optional
+
+from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+
+VERSIONS = count()
+
+
+def content_hash(job) -> str:
+    """Hash the content of a job, equal for jobs with the same fields.
+
+    Args:
+        job: The job, a dataclass with the fields of a Job.
+
+    Returns:
+        str: The hexadecimal BLAKE2b digest of the name, country, salary and skills of the job.
+
+    """
+    content = json.dumps([job.name, job.country, job.salary, list(job.skills)], separators=(",", ":"))
+
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+class MirrorJobRepository:
+    """A repository holding a local copy of the catalogue of an external source.
+
+    The jobs are kept by content hash, so a new snapshot of the catalogue is applied by adding the jobs whose hash
+    is new and removing the jobs whose hash is gone, without rebuilding the copy. The hashes are also indexed by
+    country and by skill, and sorted by salary, so filtered queries only check the jobs of the most selective index.
+    The repository is a JobFinderService answering from memory, used by the JobFinderAggregator in place of the
+    external source.
+
+    Attributes:
+        source_name (str): The name of the mirrored source, reported by the JobFinderAggregator.
+
+    """
+
+    def __init__(self, source_name: str = "MirrorJobRepository"):
+        """Initialize the MirrorJobRepository.
+
+        Args:
+            source_name (str): The name of the mirrored source, reported by the JobFinderAggregator.
+
+        """
+        self.source_name = source_name
+        self._jobs: dict[str, Job] = {}
+        self._order: dict[str, int] = {}
+        self._added = count()
+        self._countries: dict[str, set[str]] = {}
+        self._skills: dict[str, set[str]] = {}
+        self._salaries: list[tuple[int, str]] = []
+        self._salaries_sorted = True
+        self._version = next(VERSIONS)
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """int: The version of the repository, changing whenever jobs are added or removed."""
+        return self._version
+
+    def count(self) -> int:
+        """Count the jobs of the repository.
+
+        Returns:
+            int: The number of jobs in the mirror.
+
+        """
+        return len(self._jobs)
+
+    def hashes(self) -> set[str]:
+        """Retrieve the content hashes of the jobs of the repository.
+
+        Returns:
+            set[str]: The content hash of every job in the mirror.
+
+        """
+        with self._lock:
+            return set(self._jobs)
+
+    def apply(self, added: dict[str, Job], removed: Iterable[str]):
+        """Apply the difference between two snapshots of the catalogue.
+
+        Args:
+            added (dict[str, Job]): The new jobs, by content hash.
+            removed (Iterable[str]): The content hashes of the jobs gone from the catalogue.
+
+        """
+        with self._lock:
+            removed_jobs = {}
+            for key in removed:
+                job = self._jobs.pop(key, None)
+                if job is not None:
+                    removed_jobs[key] = job
+                    del self._order[key]
+                    self._countries[job.country].discard(key)
+                    for skill in job.skills:
+                        self._skills[skill].discard(key)
+            if removed_jobs:
+                self._salaries = [entry for entry in self._salaries if entry[1] not in removed_jobs]
+
+            changed = bool(removed_jobs)
+            for key, job in added.items():
+                if key in self._jobs:
+                    continue
+                self._jobs[key] = job
+                self._order[key] = next(self._added)
+                self._countries.setdefault(job.country, set()).add(key)
+                for skill in job.skills:
+                    self._skills.setdefault(skill, set()).add(key)
+                self._salaries.append((job.salary, key))
+                self._salaries_sorted = False
+                changed = True
+            if changed:
+                self._version = next(VERSIONS)
+
+    def _candidates(self, job_filters: Optional[JobFilters]) -> Optional[set[str]]:
+        """Retrieve the hashes of the jobs that may satisfy the filters, the lock being held.
+
+        The smallest candidate set among the indexed filters is chosen, the rest of the filters
+        must still be checked on every candidate.
+
+        Args:
+            job_filters (Optional[JobFilters]): The filters to satisfy.
+
+        Returns:
+            Optional[set[str]]: The candidate hashes, or None if no indexed filter is set.
+
+        """
+        if job_filters is None:
+            return None
+
+        candidates = None
+        if job_filters.country is not None:
+            candidates = self._countries.get(job_filters.country, set())
+        for skill in job_filters.skills or []:
+            postings = self._skills.get(skill, set())
+            if candidates is None or len(postings) < len(candidates):
+                candidates = postings
+        if job_filters.salary_min is not None or job_filters.salary_max is not None:
+            if not self._salaries_sorted:
+                self._salaries.sort()
+                self._salaries_sorted = True
+            low = 0 if job_filters.salary_min is None else bisect.bisect_left(self._salaries, job_filters.salary_min, key=lambda entry: entry[0])
+            high = len(self._salaries) if job_filters.salary_max is None else bisect.bisect_right(self._salaries, job_filters.salary_max, key=lambda entry: entry[0])
+            if candidates is None or high - low < len(candidates):
+                candidates = {key for _, key in self._salaries[low:high]}
+
+        return candidates
+
+    def get_jobs(self, job_filters: Optional[JobFilters] = None) -> list[Job]:
+        """Retrieve jobs from the repository.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Returns:
+            list[Job]: A list of Job objects representing the jobs in the mirror satisfying the filters, in insertion order.
+
+        """
+        return list(self.iter_jobs(job_filters))
+
+    def iter_jobs(self, job_filters: Optional[JobFilters] = None) -> Iterator[Job]:
+        """Iterate over the jobs of the repository.
+
+        The candidate jobs are looked up in the indexes and copied when the iteration starts, so a snapshot applied
+        meanwhile does not change the iterated jobs.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Yields:
+            Job: The jobs satisfying the filters, in insertion order.
+
+        """
+        with self._lock:
+            candidates = self._candidates(job_filters)
+            if candidates is None:
+                jobs = list(self._jobs.values())
+            else:
+                jobs = [self._jobs[key] for key in sorted(candidates, key=self._order.__getitem__)]
+
+        for job in jobs:
+            if job_filters is None or job_filters.matches(job):
+                yield job
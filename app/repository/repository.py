@@ -1,9 +1,23 @@
-from typing import Protocol
+import bisect
+import itertools
+import json
+import threading
+import time
+from array import array
+from typing import Callable, Iterator, Optional, Protocol, Sequence
 
+from app.database import SQLiteConnectionPool
 from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.metrics import STORAGE_ADD, STORAGE_ADD_MANY, STORAGE_GET, STORAGE_SEARCH
+from app.repository.search_index import SearchIndex, tokenize
 from app.storage import Storage
 
 
+# Versions of the in-memory repositories, drawn from a single counter so that no two states share a version
+VERSIONS = itertools.count(1)
+
+
 class JobRepository(Protocol):
     """A protocol defining the contract for a job repository.
 
@@ -20,6 +34,20 @@ class JobRepository(Protocol):
         """
         ...
 
+    @property
+    def version(self) -> int:
+        """int: The version of the repository, increasing on every write, used to invalidate what is derived from its jobs."""
+        ...
+
+    def count(self) -> int:
+        """Count the jobs of the repository.
+
+        Returns:
+            int: The number of jobs in the repository.
+
+        """
+        ...
+
     def add(self, job: Job):
         """Add a job to the repository.
 
@@ -31,20 +59,97 @@ class JobRepository(Protocol):
         """
         ...
 
-    def get_jobs(self) -> list[Job]:
-        """Retrieve all jobs from the repository.
+    def add_many(self, jobs: list[Job]):
+        """Add several jobs to the repository at once.
+
+        Args:
+            jobs (list[Job]): The Job objects to be added, in order.
+
+        """
+        ...
+
+    def get_jobs(self, job_filters: Optional[JobFilters] = None) -> list[Job]:
+        """Retrieve jobs from the repository.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Returns:
+            list[Job]: A list of Job objects representing the jobs in the repository satisfying the filters.
+
+        """
+        ...
+
+    def iter_jobs(self, job_filters: Optional[JobFilters] = None) -> Iterator[Job]:
+        """Iterate lazily over the jobs of the repository.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Yields:
+            Job: The jobs satisfying the filters, in insertion order.
+
+        """
+        ...
+
+    def scan(self, job_filters: Optional[JobFilters] = None, after: int = -1) -> Iterator[tuple[int, Job]]:
+        """Iterate lazily over the jobs of the repository, with their position.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+            after (int): Only the jobs at a position greater than this one are iterated.
+
+        Yields:
+            tuple[int, Job]: The position of each job satisfying the filters, in increasing order, and the job.
+
+        """
+        ...
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> list[tuple[Job, float]]:
+        """Search the jobs by free text over their name and skills.
+
+        Args:
+            query (str): The free text query.
+            limit (int): The maximum number of jobs to return.
+            prefix (bool): Whether each query word matches every word starting with it.
 
         Returns:
-            list[Job]: A list of Job objects representing all the jobs in the repository.
+            list[tuple[Job, float]]: The best matching jobs with their BM25 score, by decreasing score.
 
         """
         ...
 
 
+def row_fields(rows: Sequence) -> Callable[[int], tuple]:
+    """Build an accessor to the fields of the rows of a storage.
+
+    The rows of a ColumnarJobStorage are read straight from its columns, without building their views.
+
+    Args:
+        rows (Sequence): The rows of a storage, as returned by its get_all method.
+
+    Returns:
+        Callable[[int], tuple]: A function returning the name, country, salary and skills of the row at a position.
+
+    """
+    fields = getattr(rows, "fields", None)
+    if fields is not None:
+        return fields
+
+    def dict_fields(position: int) -> tuple:
+        row = rows[position]
+        return row["name"], row["country"], row["salary"], row["skills"]
+
+    return dict_fields
+
+
 class InMemoryJobRepository:
     """A repository to manage jobs using in-memory storage.
 
     This class provides methods to add and retrieve jobs from an in-memory storage.
+    The stored jobs are indexed by position in secondary indexes maintained on add: a hash index on country,
+    a sorted index on salary and an inverted index on skills, so filtered queries only build the matching jobs.
+    The words of their name and skills are indexed in a SearchIndex for the free text search.
 
     Attributes:
         storage (InMemoryStorage): An instance of InMemoryStorage used to store job data.
@@ -54,30 +159,488 @@ class InMemoryJobRepository:
     def __init__(self, storage: Storage):
         """Initialize the InMemoryJobRepository.
 
+        The jobs already in the storage are indexed.
+
         Args:
             storage (InMemoryStorage): An instance of InMemoryStorage used to store job data.
 
         """
         self.storage = storage
+        self._lock = threading.RLock()
+        self._reset_indexes()
+        self._sync()
+
+    def _reset_indexes(self):
+        self._version = next(VERSIONS)
+        self._indexed = 0
+        self._country_index: dict[str, array] = {}
+        self._skill_index: dict[str, array] = {}
+        self._salaries = array("q")
+        self._salary_index = array("q")
+        self._salary_index_sorted = True
+        self._search_index = SearchIndex()
+
+    def _sync(self) -> Sequence:
+        """Index the rows added to the storage since the last call.
+
+        The indexes are rebuilt from scratch if the storage was cleaned.
+
+        Returns:
+            Sequence: The rows of the storage.
+
+        """
+        rows = self.storage.get_all()
+        with self._lock:
+            if len(rows) < self._indexed:
+                self._reset_indexes()
+            fields = row_fields(rows)
+            for position in range(self._indexed, len(rows)):
+                name, country, salary, skills = fields(position)
+                self._search_index.add(position, [name, *skills])
+                postings = self._country_index.get(country)
+                if postings is None:
+                    postings = self._country_index[country] = array("q")
+                postings.append(position)
+                for skill in set(skills):
+                    postings = self._skill_index.get(skill)
+                    if postings is None:
+                        postings = self._skill_index[skill] = array("q")
+                    postings.append(position)
+                if self._salary_index and salary < self._salaries[self._salary_index[-1]]:
+                    self._salary_index_sorted = False
+                self._salaries.append(salary)
+                self._salary_index.append(position)
+            if self._indexed != len(rows):
+                self._version = next(VERSIONS)
+            self._indexed = len(rows)
+
+        return rows
+
+    def _salary_range(self, salary_min: Optional[int], salary_max: Optional[int]) -> tuple[int, int]:
+        """Bisect the salary index for a salary range.
+
+        Args:
+            salary_min (Optional[int]): The minimum salary, unbounded if None.
+            salary_max (Optional[int]): The maximum salary, unbounded if None.
+
+        Returns:
+            tuple[int, int]: The bounds of the slice of the salary index within the range.
+
+        """
+        salary = self._salaries.__getitem__
+        if not self._salary_index_sorted:
+            self._salary_index = array("q", sorted(self._salary_index, key=salary))
+            self._salary_index_sorted = True
+
+        low = 0 if salary_min is None else bisect.bisect_left(self._salary_index, salary_min, key=salary)
+        high = len(self._salary_index) if salary_max is None else bisect.bisect_right(self._salary_index, salary_max, key=salary)
+
+        return low, max(low, high)
+
+    def _candidates(self, job_filters: Optional[JobFilters]) -> Optional[Sequence[int]]:
+        """Retrieve the positions of the rows that may satisfy the filters.
+
+        The smallest candidate set among the indexed filters is chosen, the rest of the filters
+        must still be checked on every candidate.
+
+        Args:
+            job_filters (Optional[JobFilters]): The filters to satisfy.
+
+        Returns:
+            Optional[Sequence[int]]: The sorted candidate positions, or None if no indexed filter is set.
+
+        """
+        if job_filters is None:
+            return None
+
+        with self._lock:
+            candidates = None
+            if job_filters.country is not None:
+                candidates = self._country_index.get(job_filters.country, [])
+            for skill in job_filters.skills or []:
+                postings = self._skill_index.get(skill, [])
+                if candidates is None or len(postings) < len(candidates):
+                    candidates = postings
+            if job_filters.salary_min is not None or job_filters.salary_max is not None:
+                low, high = self._salary_range(job_filters.salary_min, job_filters.salary_max)
+                if candidates is None or high - low < len(candidates):
+                    candidates = sorted(self._salary_index[low:high])
+
+        return candidates
+
+    @property
+    def version(self) -> int:
+        """int: The version of the repository, changing whenever jobs are added to its storage or the storage is cleaned."""
+        self._sync()
+
+        return self._version
+
+    def count(self) -> int:
+        """Count the jobs of the repository.
+
+        Returns:
+            int: The number of jobs in the storage.
+
+        """
+        return len(self._sync())
 
     def add(self, job: Job):
         """Add a job to the repository.
 
-        The job will be stored in the in-memory storage.
+        The job will be stored in the in-memory storage and indexed.
 
         Args:
             job (Job): The Job object to be added.
 
         """
-        self.storage.add(job.to_dict())
+        start = time.perf_counter()
+        with self._lock:
+            self.storage.add(job.to_dict())
+            self._sync()
+        STORAGE_ADD.observe(time.perf_counter() - start)
+
+    def add_many(self, jobs: list[Job]):
+        """Add several jobs to the repository at once.
+
+        The jobs are stored in the in-memory storage and indexed together, with a single call to the add_many
+        of the storage if it has one.
+
+        Args:
+            jobs (list[Job]): The Job objects to be added, in order.
+
+        """
+        start = time.perf_counter()
+        with self._lock:
+            if callable(getattr(type(self.storage), "add_many", None)):
+                self.storage.add_many([job.to_dict() for job in jobs])
+            else:
+                for job in jobs:
+                    self.storage.add(job.to_dict())
+            self._sync()
+        STORAGE_ADD_MANY.observe(time.perf_counter() - start)
 
-    def get_jobs(self) -> list[Job]:
-        """Retrieve all jobs from the repository.
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> list[tuple[Job, float]]:
+        """Search the jobs by free text over their name and skills.
+
+        The jobs are ranked with BM25 by the SearchIndex, only the best ones are turned into Job objects.
+
+        Args:
+            query (str): The free text query.
+            limit (int): The maximum number of jobs to return.
+            prefix (bool): Whether each query word matches every word starting with it.
 
         Returns:
-            list[Job]: A list of Job objects representing all the jobs in the repository.
+            list[tuple[Job, float]]: The best matching jobs with their BM25 score, by decreasing score.
 
         """
-        all_items = [Job(**job) for job in self.storage.get_all()]
+        start = time.perf_counter()
+        rows = self._sync()
+        with self._lock:
+            hits = self._search_index.search(query, limit, prefix)
+
+        fields = row_fields(rows)
+        results = [(Job(*fields(position)), score) for position, score in hits]
+        STORAGE_SEARCH.observe(time.perf_counter() - start)
+
+        return results
+
+    def get_jobs(self, job_filters: Optional[JobFilters] = None) -> list[Job]:
+        """Retrieve jobs from the repository.
+
+        Only the rows selected by the most selective index are turned into Job objects and checked against the filters.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Returns:
+            list[Job]: A list of Job objects representing the jobs in the repository satisfying the filters, in insertion order.
+
+        """
+        start = time.perf_counter()
+        all_items = list(self.iter_jobs(job_filters))
+        STORAGE_GET.observe(time.perf_counter() - start)
+
+        return all_items
+
+    def iter_jobs(self, job_filters: Optional[JobFilters] = None) -> Iterator[Job]:
+        """Iterate lazily over the jobs of the repository.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Yields:
+            Job: The jobs satisfying the filters, in insertion order.
+
+        """
+        for _, job in self.scan(job_filters):
+            yield job
+
+    def scan(self, job_filters: Optional[JobFilters] = None, after: int = -1) -> Iterator[tuple[int, Job]]:
+        """Iterate lazily over the jobs of the repository, with their position.
+
+        The candidates are selected by the most selective index when the iteration starts,
+        each Job object is only built when it is reached.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+            after (int): Only the jobs at a position greater than this one are iterated.
+
+        Yields:
+            tuple[int, Job]: The position of each job satisfying the filters, in increasing order, and the job.
+
+        """
+        rows = self._sync()
+        candidates = self._candidates(job_filters)
+        if candidates is None:
+            positions = range(max(after + 1, 0), len(rows))
+        else:
+            positions = candidates[bisect.bisect_right(candidates, after):]
+
+        fields = row_fields(rows)
+        for position in positions:
+            job = Job(*fields(position))
+            if job_filters is None or job_filters.matches(job):
+                yield position, job
+
+
+class SQLiteJobRepository:
+    """A repository to manage jobs in a SQLite database.
+
+    The jobs are stored in a jobs table indexed on country and salary, and their skills in a job_skills
+    join table keyed by skill, so the filters are pushed down to SQL and only the matching rows are read.
+    The name filter matches substrings with LIKE '%...%', which no index can serve, so the name is not indexed.
+    The position of a job is its rowid, increasing with insertion order.
+    The words of their name and skills are indexed in a jobs_search FTS5 table for the free text search.
+
+    Attributes:
+        pool (SQLiteConnectionPool): The pool of connections to the database.
+        chunk_size (int): The number of rows fetched per query while scanning.
+
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        " id INTEGER PRIMARY KEY,"
+        " name TEXT NOT NULL,"
+        " country TEXT NOT NULL,"
+        " salary INTEGER NOT NULL,"
+        " skills TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS job_skills ("
+        " skill TEXT NOT NULL,"
+        " job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,"
+        " PRIMARY KEY (skill, job_id)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS jobs_country ON jobs(country)",
+        "CREATE INDEX IF NOT EXISTS jobs_salary ON jobs(salary)",
+        "DROP INDEX IF EXISTS jobs_name",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_search USING fts5(name, skills, content='', tokenize='unicode61')",
+        "CREATE TABLE IF NOT EXISTS jobs_version (version INTEGER NOT NULL)",
+        "INSERT INTO jobs_version (version) SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM jobs_version)",
+    )
+
+    def __init__(self, pool: SQLiteConnectionPool, chunk_size: int = 1000):
+        """Initialize the SQLiteJobRepository, creating its tables if they do not exist.
+
+        Args:
+            pool (SQLiteConnectionPool): The pool of connections to the database.
+            chunk_size (int): The number of rows fetched per query while scanning.
+
+        """
+        self.pool = pool
+        self.chunk_size = chunk_size
+        with self.pool.transaction() as connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+
+    @property
+    def version(self) -> int:
+        """int: The version of the database, incremented by every transaction writing to the jobs."""
+        with self.pool.connection() as connection:
+            (version,) = connection.execute("SELECT version FROM jobs_version").fetchone()
+
+        return version
+
+    def count(self) -> int:
+        """Count the jobs of the database.
+
+        Returns:
+            int: The number of jobs in the database.
+
+        """
+        with self.pool.connection() as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM jobs").fetchone()
+
+        return count
+
+    def add(self, job: Job):
+        """Add a job to the database.
+
+        Args:
+            job (Job): The Job object to be added.
+
+        """
+        self.add_many([job])
+
+    def add_many(self, jobs: list[Job]):
+        """Add several jobs to the database in a single transaction.
+
+        The rowids are allocated up front within the transaction, so the jobs and their skills
+        are inserted with one executemany each.
+
+        Args:
+            jobs (list[Job]): The Job objects to be added, in order.
+
+        """
+        if not jobs:
+            return
+
+        start = time.perf_counter()
+        with self.pool.transaction() as connection:
+            (last_id,) = connection.execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()
+            connection.executemany(
+                "INSERT INTO jobs (id, name, country, salary, skills) VALUES (?, ?, ?, ?, ?)",
+                ((last_id + offset, job.name, job.country, job.salary, json.dumps(job.skills)) for offset, job in enumerate(jobs, 1)),
+            )
+            connection.executemany(
+                "INSERT INTO job_skills (skill, job_id) VALUES (?, ?)",
+                ((skill, last_id + offset) for offset, job in enumerate(jobs, 1) for skill in set(job.skills)),
+            )
+            connection.executemany(
+                "INSERT INTO jobs_search (rowid, name, skills) VALUES (?, ?, ?)",
+                ((last_id + offset, job.name, " ".join(job.skills)) for offset, job in enumerate(jobs, 1)),
+            )
+            connection.execute("UPDATE jobs_version SET version = version + 1")
+        STORAGE_ADD_MANY.observe(time.perf_counter() - start)
+
+    def clean(self):
+        """Delete every job of the database."""
+        with self.pool.transaction() as connection:
+            connection.execute("DELETE FROM job_skills")
+            connection.execute("DELETE FROM jobs")
+            connection.execute("INSERT INTO jobs_search (jobs_search) VALUES ('delete-all')")
+            connection.execute("UPDATE jobs_version SET version = version + 1")
+
+    @staticmethod
+    def _where(job_filters: Optional[JobFilters]) -> tuple[list[str], list]:
+        """Translate filters into SQL conditions.
+
+        The name is matched with LIKE, which only folds the case of ASCII letters, so it is only
+        pushed down for ASCII names, and the rows selected are checked again against the filters.
+
+        Args:
+            job_filters (Optional[JobFilters]): The filters to translate.
+
+        Returns:
+            tuple[list[str], list]: The conditions to join with AND and their parameters.
+
+        """
+        conditions, parameters = [], []
+        if job_filters is None:
+            return conditions, parameters
+
+        if job_filters.name is not None and job_filters.name.isascii():
+            escaped = job_filters.name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            parameters.append(f"%{escaped}%")
+        if job_filters.country is not None:
+            conditions.append("country = ?")
+            parameters.append(job_filters.country)
+        if job_filters.salary_min is not None:
+            conditions.append("salary >= ?")
+            parameters.append(job_filters.salary_min)
+        if job_filters.salary_max is not None:
+            conditions.append("salary <= ?")
+            parameters.append(job_filters.salary_max)
+        for skill in sorted(set(job_filters.skills or [])):
+            conditions.append("id IN (SELECT job_id FROM job_skills WHERE skill = ?)")
+            parameters.append(skill)
+
+        return conditions, parameters
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> list[tuple[Job, float]]:
+        """Search the jobs by free text over their name and skills.
+
+        The jobs are ranked with the BM25 function of FTS5, whose scores are negated so that greater is better.
+
+        Args:
+            query (str): The free text query.
+            limit (int): The maximum number of jobs to return.
+            prefix (bool): Whether each query word matches every word starting with it.
+
+        Returns:
+            list[tuple[Job, float]]: The best matching jobs with their BM25 score, by decreasing score.
+
+        """
+        start = time.perf_counter()
+        terms = ['"' + token.replace('"', '""') + ('"*' if prefix else '"') for token in dict.fromkeys(tokenize(query))]
+        if not terms:
+            return []
+
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT jobs.name, jobs.country, jobs.salary, jobs.skills, -bm25(jobs_search) AS score"
+                " FROM jobs_search JOIN jobs ON jobs.id = jobs_search.rowid"
+                " WHERE jobs_search MATCH ? ORDER BY bm25(jobs_search), jobs_search.rowid LIMIT ?",
+                (" OR ".join(terms), limit),
+            ).fetchall()
+
+        results = [(Job(name=name, country=country, salary=salary, skills=json.loads(skills)), score) for name, country, salary, skills, score in rows]
+        STORAGE_SEARCH.observe(time.perf_counter() - start)
+
+        return results
+
+    def get_jobs(self, job_filters: Optional[JobFilters] = None) -> list[Job]:
+        """Retrieve jobs from the database.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Returns:
+            list[Job]: A list of Job objects representing the jobs in the database satisfying the filters, in insertion order.
+
+        """
+        start = time.perf_counter()
+        all_items = list(self.iter_jobs(job_filters))
+        STORAGE_GET.observe(time.perf_counter() - start)
 
         return all_items
+
+    def iter_jobs(self, job_filters: Optional[JobFilters] = None) -> Iterator[Job]:
+        """Iterate lazily over the jobs of the database.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Yields:
+            Job: The jobs satisfying the filters, in insertion order.
+
+        """
+        for _, job in self.scan(job_filters):
+            yield job
+
+    def scan(self, job_filters: Optional[JobFilters] = None, after: int = -1) -> Iterator[tuple[int, Job]]:
+        """Iterate lazily over the jobs of the database, with their position.
+
+        The rows are fetched chunk_size at a time by keyset pagination on the rowid, and the connection
+        is given back to the pool between chunks, so a slow consumer does not hold it.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+            after (int): Only the jobs at a position greater than this one are iterated.
+
+        Yields:
+            tuple[int, Job]: The position of each job satisfying the filters, in increasing order, and the job.
+
+        """
+        conditions, parameters = self._where(job_filters)
+        query = "SELECT id, name, country, salary, skills FROM jobs WHERE " + " AND ".join(["id > ?", *conditions]) + " ORDER BY id LIMIT ?"
+
+        while True:
+            with self.pool.connection() as connection:
+                rows = connection.execute(query, [after, *parameters, self.chunk_size]).fetchall()
+            for position, name, country, salary, skills in rows:
+                job = Job(name=name, country=country, salary=salary, skills=json.loads(skills))
+                if job_filters is None or job_filters.matches(job):
+                    yield position, job
+            if len(rows) < self.chunk_size:
+                return
+            after = rows[-1][0]
@@ -0,0 +1,162 @@
+import bisect
+import heapq
+import math
+import re
+from array import array
+from typing import Iterable
+
+TOKEN_PATTERN = re.compile(r"\w+[#+]*")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into lowercase search terms.
+
+    Terms are runs of letters and digits, keeping trailing "#" and "+" so that "C#" and "C++" stay apart from "C".
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list[str]: The terms of the text, in order.
+
+    """
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+class SearchIndex:
+    """An in-process inverted index of documents ranked with BM25.
+
+    Each term maps to its postings: the positions of the documents holding it, in increasing order, and how many
+    times each one holds it. The documents are numbered by consecutive positions from 0, as the jobs of a storage.
+    The vocabulary is kept sorted, so a query term can match every term it is a prefix of.
+
+    Attributes:
+        k1 (float): The BM25 term frequency saturation.
+        b (float): The BM25 document length normalization.
+
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """Initialize the SearchIndex.
+
+        Args:
+            k1 (float): The BM25 term frequency saturation.
+            b (float): The BM25 document length normalization.
+
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._vocabulary: list[str] = []
+        self._lengths = array("I")
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, position: int, texts: Iterable[str]):
+        """Index the next document.
+
+        Args:
+            position (int): The position of the document, the number of documents already indexed.
+            texts (Iterable[str]): The texts of the document, such as its name and each of its skills.
+
+        Raises:
+            ValueError: If the position is not the next one.
+
+        """
+        if position != len(self._lengths):
+            raise ValueError(f"Expected document {len(self._lengths)}, got {position}")
+
+        frequencies: dict[str, int] = {}
+        for text in texts:
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0) + 1
+
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("q"), array("I"))
+                bisect.insort(self._vocabulary, term)
+            postings[0].append(position)
+            postings[1].append(frequency)
+
+        length = sum(frequencies.values())
+        self._lengths.append(length)
+        self._total_length += length
+
+    def expand(self, token: str, prefix: bool) -> list[str]:
+        """Find the terms of the vocabulary matching a query token.
+
+        Args:
+            token (str): The query token.
+            prefix (bool): Whether the token matches every term starting with it, or only itself.
+
+        Returns:
+            list[str]: The matching terms.
+
+        """
+        if not prefix:
+            return [token] if token in self._postings else []
+
+        terms = []
+        for index in range(bisect.bisect_left(self._vocabulary, token), len(self._vocabulary)):
+            term = self._vocabulary[index]
+            if not term.startswith(token):
+                break
+            terms.append(term)
+
+        return terms
+
+    def _score(self, term: str, scores: dict[int, float]):
+        """Add the BM25 score of a term to the scores of the documents holding it, keeping the best one."""
+        positions, frequencies = self._postings[term]
+        documents = len(self._lengths)
+        idf = math.log(1 + (documents - len(positions) + 0.5) / (len(positions) + 0.5))
+        weight = idf * (self.k1 + 1)
+        base = self.k1 * (1 - self.b)
+        per_length = self.k1 * self.b * documents / self._total_length
+        lengths = self._lengths
+
+        if not scores:
+            scores.update(
+                (position, weight * frequency / (frequency + base + per_length * lengths[position]))
+                for position, frequency in zip(positions, frequencies)
+            )
+            return
+
+        for position, frequency in zip(positions, frequencies):
+            score = weight * frequency / (frequency + base + per_length * lengths[position])
+            if score > scores.get(position, 0.0):
+                scores[position] = score
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> list[tuple[int, float]]:
+        """Rank the documents matching any term of a query with BM25.
+
+        The score of a document is the sum over the query tokens of the BM25 score of the best term each token matches.
+        Only the limit best documents are kept, selected with a heap.
+
+        Args:
+            query (str): The free text query.
+            limit (int): The maximum number of documents to return.
+            prefix (bool): Whether each query token matches every term starting with it.
+
+        Returns:
+            list[tuple[int, float]]: The position and score of the best documents, by decreasing score then position.
+
+        """
+        if not self._total_length:
+            return []
+
+        totals: dict[int, float] = {}
+        for token in dict.fromkeys(tokenize(query)):
+            scores: dict[int, float] = {}
+            for term in self.expand(token, prefix):
+                self._score(term, scores)
+            if not totals:
+                totals = scores
+                continue
+            for position, score in scores.items():
+                totals[position] = totals.get(position, 0.0) + score
+
+        return heapq.nlargest(limit, totals.items(), key=lambda hit: (hit[1], -hit[0]))
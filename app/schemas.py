@@ -1,4 +1,7 @@
-from pydantic import BaseModel, NonNegativeInt
+import re
+from typing import Literal, Optional
+
+from pydantic import BaseModel, NonNegativeInt, field_validator, model_validator
 
 
 class JobIn(BaseModel):
@@ -12,9 +15,59 @@ class JobOut(JobIn):
     pass
 
 
+class AddedJobOut(JobOut):
+    dropped_notifications: int = 0
+
+
+class SearchResultOut(JobOut):
+    score: float
+
+
+class JobStatusOut(BaseModel):
+    index: int
+    status: Literal["created", "invalid"]
+    errors: list[str] = []
+
+
+class BulkJobsOut(BaseModel):
+    created: int
+    rejected: int
+    subscribers: int
+    notifications: int
+    dropped_notifications: int = 0
+    elapsed: float
+    jobs_per_second: float
+    items: list[JobStatusOut]
+
+
 class JobAlertIn(BaseModel):
     email: str
-    regex_name: str
+    regex_name: str = ""
+    skills: list[str] = []
+    countries: list[str] = []
+    salary_min: Optional[NonNegativeInt] = None
+    salary_max: Optional[NonNegativeInt] = None
+
+    @field_validator("regex_name")
+    @classmethod
+    def check_regex_name(cls, regex_name: str) -> str:
+        try:
+            re.compile(regex_name)
+        except re.error as error:
+            raise ValueError(f"invalid regular expression: {error}")
+        return regex_name
+
+    @model_validator(mode="after")
+    def check_criteria(self) -> "JobAlertIn":
+        if not (self.regex_name or self.skills or self.countries or self.salary_min is not None or self.salary_max is not None):
+            raise ValueError("at least one of regex_name, skills, countries, salary_min or salary_max must be set")
+        return self
+
+    @model_validator(mode="after")
+    def check_salary_range(self) -> "JobAlertIn":
+        if self.salary_min is not None and self.salary_max is not None and self.salary_min > self.salary_max:
+            raise ValueError("salary_min must not be greater than salary_max")
+        return self
 
 
 class JobAlertOut(JobAlertIn):
@@ -0,0 +1,527 @@
+"""Matching of new jobs against every job alert at once.
+
+The literals of the name regexes are extracted from the parse trees of re._parser and re._constants, private
+modules of the standard library with no compatibility guarantee, renamed from sre_parse and sre_constants in
+Python 3.11. If they are missing or fail to parse a pattern, the alert is indexed as having no literal, which
+only makes it a candidate for every job name.
+"""
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain
+from typing import AbstractSet, Optional
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:
+    sre_constants = sre_parse = None
+
+from app.domain.job import Job
+from app.domain.job_alert import JobAlert
+
+# The regex_name of the alerts matching any job name, which then only filter on their other criteria
+ANY_NAME = frozenset({"", ".*"})
+
+# The number of entries added to an AhoCorasick or an IntervalIndex that are scanned linearly before they are merged
+MERGE_THRESHOLD = 64
+
+
+@dataclass(frozen=True)
+class CompiledAlert:
+    """A job alert with its compiled pattern, the literals extracted from it and its other criteria as sets and bounds.
+
+    Attributes:
+        alert (JobAlert): The registered job alert.
+        pattern (re.Pattern): The compiled regex_name of the alert.
+        prefix (str): The literal text every matching job name starts with, or an empty string.
+        required (str): The longest literal text every matching job name contains, or an empty string.
+        any_name (bool): Whether the regex_name of the alert matches any job name.
+        skills (frozenset[str]): The skills a matching job must all have.
+        countries (frozenset[str]): The countries a matching job must be in one of, any country if empty.
+        salary_min (float): The minimum salary of a matching job, -inf if unbounded.
+        salary_max (float): The maximum salary of a matching job, inf if unbounded.
+
+    """
+
+    alert: JobAlert
+    pattern: re.Pattern
+    prefix: str
+    required: str
+    any_name: bool = False
+    skills: frozenset[str] = frozenset()
+    countries: frozenset[str] = frozenset()
+    salary_min: float = float("-inf")
+    salary_max: float = float("inf")
+
+    def matches(self, job: Job, job_skills: AbstractSet[str]) -> bool:
+        """Check whether a job satisfies every criterion of the alert.
+
+        Args:
+            job (Job): The job to check.
+            job_skills (AbstractSet[str]): The skills of the job, as a set.
+
+        Returns:
+            bool: True if the job satisfies every criterion of the alert.
+
+        """
+        return (
+            (not self.countries or job.country in self.countries)
+            and self.salary_min <= job.salary <= self.salary_max
+            and self.skills <= job_skills
+            and (self.any_name or self.pattern.match(job.name) is not None)
+        )
+
+
+def extract_literals(pattern: re.Pattern) -> tuple[str, list[str]]:
+    """Extract the literal prefix and the required literal runs of a pattern.
+
+    The pattern is evaluated with re.match semantics, so the prefix is the literal text a job name
+    must start with. Any construct that is not a plain literal (repeats, branches, classes, case
+    insensitive sections, ...) ends the current run of literals. No literal is extracted when the
+    private parser of re is not available or fails on the pattern.
+
+    Args:
+        pattern (re.Pattern): The compiled pattern to analyse.
+
+    Returns:
+        tuple[str, list[str]]: The literal prefix and every run of literals required by the pattern.
+
+    """
+    if pattern.flags & re.IGNORECASE or sre_parse is None:
+        return "", []
+
+    runs: list[str] = []
+    current: list[str] = []
+    prefix = None
+
+    def close_run():
+        nonlocal prefix
+        if prefix is None:
+            prefix = "".join(current)
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    def walk(items, at_start):
+        for op, av in items:
+            if op is sre_constants.LITERAL:
+                current.append(chr(av))
+            elif op is sre_constants.AT and at_start and av in (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING):
+                continue
+            elif op is sre_constants.SUBPATTERN and not av[1] & re.IGNORECASE:
+                walk(av[3], at_start and not current and prefix is None)
+            else:
+                close_run()
+            at_start = False
+
+    try:
+        walk(sre_parse.parse(pattern.pattern, pattern.flags), True)
+    except Exception:
+        return "", []
+    close_run()
+
+    return prefix or "", runs
+
+
+def compile_alert(alert: JobAlert) -> CompiledAlert:
+    """Compile a job alert for the AlertMatcher.
+
+    Args:
+        alert (JobAlert): The job alert to compile.
+
+    Returns:
+        CompiledAlert: The compiled alert.
+
+    Raises:
+        re.error: If the regex_name of the alert is not a valid regular expression.
+
+    """
+    pattern = re.compile(alert.regex_name)
+    prefix, runs = extract_literals(pattern)
+    required = max(runs, key=len, default="")
+
+    return CompiledAlert(
+        alert=alert,
+        pattern=pattern,
+        prefix=prefix,
+        required=required,
+        any_name=alert.regex_name in ANY_NAME,
+        skills=frozenset(alert.skills),
+        countries=frozenset(alert.countries),
+        salary_min=float("-inf") if alert.salary_min is None else alert.salary_min,
+        salary_max=float("inf") if alert.salary_max is None else alert.salary_max,
+    )
+
+
+class PrefixTrie:
+    """A character trie mapping literal prefixes to the alert ids registered under them."""
+
+    def __init__(self):
+        """Initialize the PrefixTrie."""
+        self.root: dict = {}
+
+    def add(self, prefix: str, alert_id: int):
+        """Register an alert id under a literal prefix.
+
+        Args:
+            prefix (str): The literal prefix.
+            alert_id (int): The id of the alert.
+
+        """
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append(alert_id)
+
+    def find(self, text: str) -> list[int]:
+        """Retrieve the alert ids whose prefix is a prefix of the given text.
+
+        Args:
+            text (str): The text to walk the trie with.
+
+        Returns:
+            list[int]: The ids of the alerts whose prefix matches.
+
+        """
+        found = []
+        node = self.root
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            found.extend(node.get(None, ()))
+
+        return found
+
+
+class AhoCorasick:
+    """An Aho-Corasick automaton mapping literal substrings to the alert ids registered under them.
+
+    The keywords added are kept pending, and searched one by one in the text, until merge_threshold of them are
+    pending: they are then inserted in the goto trie and the failure links rebuilt, so adding an alert does not
+    rebuild the automaton and the cost of a rebuild is shared by merge_threshold additions.
+
+    Attributes:
+        merge_threshold (int): The number of pending keywords triggering a merge.
+
+    """
+
+    def __init__(self, merge_threshold: int = MERGE_THRESHOLD):
+        """Initialize the AhoCorasick automaton.
+
+        Args:
+            merge_threshold (int): The number of pending keywords triggering a merge.
+
+        """
+        self.merge_threshold = merge_threshold
+        self.goto: list[dict[str, int]] = [{}]
+        self.keywords: list[list[int]] = [[]]
+        self.automaton: tuple[list[int], list[list[int]]] = ([0], [[]])
+        self.pending: list[tuple[str, int]] = []
+
+    def add(self, keyword: str, alert_id: int):
+        """Register an alert id under a literal substring.
+
+        Args:
+            keyword (str): The literal substring.
+            alert_id (int): The id of the alert.
+
+        """
+        self.pending.append((keyword, alert_id))
+        if len(self.pending) >= self.merge_threshold:
+            self.merge()
+
+    def merge(self):
+        """Insert the pending keywords in the goto trie and rebuild the failure links."""
+        for keyword, alert_id in self.pending:
+            node = 0
+            for char in keyword:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.keywords.append([])
+                node = next_node
+            self.keywords[node].append(alert_id)
+        self.pending = []
+        self._build()
+
+    def _build(self):
+        """Rebuild the failure links and the outputs of every state."""
+        fail = [0] * len(self.goto)
+        output = [list(ids) for ids in self.keywords]
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for char, child in self.goto[node].items():
+                state = fail[node]
+                while state and char not in self.goto[state]:
+                    state = fail[state]
+                fail[child] = self.goto[state].get(char, 0)
+                output[child].extend(output[fail[child]])
+                queue.append(child)
+
+        self.automaton = (fail, output)
+
+    def find(self, text: str) -> set[int]:
+        """Retrieve the alert ids whose keyword occurs in the given text.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            set[int]: The ids of the alerts whose keyword occurs in the text.
+
+        """
+        goto = self.goto
+        fail, output = self.automaton
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        found.update(alert_id for keyword, alert_id in self.pending if keyword in text)
+
+        return found
+
+
+class IntervalIndex:
+    """A centered interval tree mapping closed intervals to the alert ids registered under them.
+
+    The intervals added are kept pending, and checked one by one, until merge_threshold of them are pending: the
+    tree is then rebuilt with them, so adding an alert does not rebuild the tree and the cost of a rebuild is shared
+    by merge_threshold additions. A search walks a single path of the tree, so it takes time logarithmic in the
+    number of intervals plus the number of intervals found, plus the number of pending intervals.
+
+    Attributes:
+        merge_threshold (int): The number of pending intervals triggering a merge.
+
+    """
+
+    def __init__(self, merge_threshold: int = MERGE_THRESHOLD):
+        """Initialize the IntervalIndex.
+
+        Args:
+            merge_threshold (int): The number of pending intervals triggering a merge.
+
+        """
+        self.merge_threshold = merge_threshold
+        self.intervals: list[tuple[float, float, int]] = []
+        self.root: Optional[tuple] = None
+        self.pending: list[tuple[float, float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def add(self, low: float, high: float, alert_id: int):
+        """Register an alert id under an interval.
+
+        An empty interval, whose lower bound is greater than its upper bound, is never found and is not stored.
+
+        Args:
+            low (float): The lower bound of the interval, included, -inf if unbounded.
+            high (float): The upper bound of the interval, included, inf if unbounded.
+            alert_id (int): The id of the alert.
+
+        """
+        if low > high:
+            return
+
+        self.intervals.append((low, high, alert_id))
+        self.pending.append((low, high, alert_id))
+        if len(self.pending) >= self.merge_threshold:
+            self.merge()
+
+    def merge(self):
+        """Rebuild the tree with the pending intervals."""
+        self.root = self._build(self.intervals)
+        self.pending = []
+
+    @staticmethod
+    def _build(intervals: list[tuple[float, float, int]]) -> Optional[tuple]:
+        """Build the subtree of a list of intervals.
+
+        The center of a node is the median of the bounds of its intervals. The intervals containing it are kept in
+        the node, sorted by increasing lower bound and by decreasing upper bound, the others go to the subtrees.
+
+        Returns:
+            Optional[tuple]: The center, the intervals of the node by lower bound and by upper bound, and the left
+                and right subtrees, or None if there are no intervals.
+
+        """
+        if not intervals:
+            return None
+
+        bounds = sorted(bound for low, high, _ in intervals for bound in (low, high))
+        center = bounds[len(bounds) // 2]
+        here = [interval for interval in intervals if interval[0] <= center <= interval[1]]
+        left = [interval for interval in intervals if interval[1] < center]
+        right = [interval for interval in intervals if interval[0] > center]
+
+        return (
+            center,
+            sorted(here, key=lambda interval: interval[0]),
+            sorted(here, key=lambda interval: interval[1], reverse=True),
+            IntervalIndex._build(left),
+            IntervalIndex._build(right),
+        )
+
+    def find(self, value: float) -> list[int]:
+        """Retrieve the alert ids whose interval contains a value.
+
+        Args:
+            value (float): The value to look up.
+
+        Returns:
+            list[int]: The ids of the alerts whose interval contains the value.
+
+        """
+        found = [alert_id for low, high, alert_id in self.pending if low <= value <= high]
+        node = self.root
+        while node is not None:
+            center, by_low, by_high, left, right = node
+            if value < center:
+                for low, _, alert_id in by_low:
+                    if low > value:
+                        break
+                    found.append(alert_id)
+                node = left
+            elif value > center:
+                for _, high, alert_id in by_high:
+                    if high < value:
+                        break
+                    found.append(alert_id)
+                node = right
+            else:
+                found.extend(alert_id for _, _, alert_id in by_low)
+                break
+
+        return found
+
+
+class AlertMatcher:
+    """An index of compiled job alerts matching jobs against every alert at once.
+
+    Each alert is compiled once when it is added, and indexed under the first of its criteria that an index can
+    look up, its access predicate: its literal name prefix in a PrefixTrie, otherwise its longest required name
+    literal in an AhoCorasick automaton, otherwise its countries in hash buckets, otherwise its skills in postings
+    matched with the counting algorithm, the alerts having all their skills counted among the skills of the job,
+    otherwise its salary bounds in an IntervalIndex. A job is only checked against the candidate alerts found by
+    looking up its name, country, skills and salary in these indexes, so matching a job takes time in the number
+    of candidates, close to the number of matching alerts for selective alerts, rather than in the number of
+    alerts. Alerts with a name regex without any literal and no other criterion are always candidates, alerts
+    without any criterion always match.
+
+    """
+
+    def __init__(self):
+        """Initialize the AlertMatcher."""
+        self.alerts: list[CompiledAlert] = []
+        self.prefixes = PrefixTrie()
+        self.substrings = AhoCorasick()
+        self.unindexed: list[int] = []
+        self.countries: dict[str, list[int]] = {}
+        self.skills: dict[str, list[int]] = {}
+        self.salaries = IntervalIndex()
+        self.unconditional: list[int] = []
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def add(self, alert: JobAlert):
+        """Compile a job alert and add it to the index of its access predicate.
+
+        Args:
+            alert (JobAlert): The job alert to add.
+
+        Raises:
+            re.error: If the regex_name of the alert is not a valid regular expression.
+
+        """
+        compiled = compile_alert(alert)
+        with self.lock:
+            alert_id = len(self.alerts)
+            self.alerts.append(compiled)
+            if compiled.prefix:
+                self.prefixes.add(compiled.prefix, alert_id)
+            elif compiled.required:
+                self.substrings.add(compiled.required, alert_id)
+            elif compiled.countries:
+                for country in compiled.countries:
+                    self.countries.setdefault(country, []).append(alert_id)
+            elif compiled.skills:
+                for skill in compiled.skills:
+                    self.skills.setdefault(skill, []).append(alert_id)
+            elif alert.salary_min is not None or alert.salary_max is not None:
+                self.salaries.add(compiled.salary_min, compiled.salary_max, alert_id)
+            elif not compiled.any_name:
+                self.unindexed.append(alert_id)
+            else:
+                self.unconditional.append(alert_id)
+
+    def _name_candidates(self, name: str) -> set[int]:
+        """Retrieve the alerts indexed by name that may match a job name, the lock being held."""
+        candidates = self.substrings.find(name)
+        candidates.update(self.prefixes.find(name))
+        candidates.update(self.unindexed)
+
+        return candidates
+
+    def _candidates(self, job: Job, job_skills: AbstractSet[str], name_candidates: set[int]) -> set[int]:
+        """Retrieve the alerts whose access predicate a job satisfies, the lock being held."""
+        candidates = set(name_candidates)
+        candidates.update(self.countries.get(job.country, ()))
+        if self.skills:
+            alerts = self.alerts
+            counts = Counter(chain.from_iterable(self.skills.get(skill, ()) for skill in job_skills))
+            candidates.update(alert_id for alert_id, count in counts.items() if count == len(alerts[alert_id].skills))
+        if len(self.salaries):
+            candidates.update(self.salaries.find(job.salary))
+        candidates.update(self.unconditional)
+
+        return candidates
+
+    def match_job(self, job: Job) -> list[JobAlert]:
+        """Retrieve the job alerts whose criteria are all satisfied by a job.
+
+        Args:
+            job (Job): The job to match.
+
+        Returns:
+            list[JobAlert]: The matching job alerts, in the order they were added.
+
+        """
+        return self.match_jobs([job])[0]
+
+    def match_jobs(self, jobs: list[Job]) -> list[list[JobAlert]]:
+        """Retrieve the job alerts whose criteria are all satisfied by each of several jobs in one pass.
+
+        The index is locked once for the whole batch and the name candidates of each distinct name are only
+        looked up once.
+
+        Args:
+            jobs (list[Job]): The jobs to match.
+
+        Returns:
+            list[list[JobAlert]]: The matching job alerts of each job, in the order they were added.
+
+        """
+        alerts = self.alerts
+        matches = []
+        with self.lock:
+            name_candidates: dict[str, set[int]] = {}
+            for job in jobs:
+                by_name = name_candidates.get(job.name)
+                if by_name is None:
+                    by_name = name_candidates[job.name] = self._name_candidates(job.name)
+                job_skills = set(job.skills)
+                candidates = self._candidates(job, job_skills, by_name)
+                matches.append([alerts[alert_id].alert for alert_id in sorted(candidates) if alerts[alert_id].matches(job, job_skills)])
+
+        return matches
@@ -0,0 +1,319 @@
+import asyncio
+import inspect
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+from app.domain.job_filters import JobFilters
+from app.services.external_job_finder_service import ExternalJobFinderService, Job, sanitize_filters
+
+
+@dataclass
+class CacheStats:
+    """Counters of the CachedJobFinderService.
+
+    Attributes:
+        hits (int): The number of requests served from a fresh entry.
+        stale_hits (int): The number of requests served from a stale entry.
+        misses (int): The number of requests without a usable entry.
+        coalesced (int): The number of misses that waited for an upstream call already in flight.
+        refreshes (int): The number of background refreshes started.
+        errors (int): The number of failed upstream calls.
+        evictions (int): The number of entries evicted because the cache was full.
+        size (int): The number of entries in the cache.
+
+    """
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    errors: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+@dataclass
+class CacheEntry:
+    jobs: list[Job]
+    fetched_at: float
+
+
+class InflightStream:
+    """The jobs of an upstream stream in progress, shared by every request streaming the same filters.
+
+    Attributes:
+        jobs (list[Job]): The jobs received so far.
+        finished (bool): Whether the upstream stream ended.
+        error (Optional[BaseException]): The error the upstream stream failed with, if any.
+
+    """
+
+    def __init__(self):
+        """Initialize the InflightStream."""
+        self.jobs: list[Job] = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self._waiters: list[asyncio.Future] = []
+
+    def wake(self):
+        """Wake up the followers waiting for more jobs."""
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+    async def follow(self) -> AsyncIterator[Job]:
+        """Iterate over the jobs of the stream, from the first one, as they are received.
+
+        Yields:
+            Job: The jobs of the stream.
+
+        Raises:
+            Exception: The error the upstream stream failed with.
+
+        """
+        position = 0
+        while True:
+            while position < len(self.jobs):
+                yield self.jobs[position]
+                position += 1
+            if self.finished:
+                if self.error is not None:
+                    raise self.error
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+
+
+def cache_key(job_filters: Optional[JobFilters]) -> tuple:
+    """Build the cache key of a set of filters from its sanitized dictionary.
+
+    Args:
+        job_filters (Optional[JobFilters]): The filters, if any.
+
+    Returns:
+        tuple: A hashable key, equal for filters sending the same query upstream.
+
+    """
+    if job_filters is None:
+        return ()
+
+    return tuple(
+        (filter_name, tuple(filter_value) if isinstance(filter_value, list) else filter_value)
+        for filter_name, filter_value in sorted(sanitize_filters(job_filters).items())
+    )
+
+
+class CachedJobFinderService:
+    """A caching layer wrapped around an ExternalJobFinderService.
+
+    The jobs are cached by filters for ttl seconds. Once expired, an entry is still served for
+    stale_ttl seconds while a single background call refreshes it. Concurrent misses for the same
+    filters are coalesced into a single upstream call. The cache holds at most max_size entries,
+    evicting the least recently used one.
+
+    Attributes:
+        service (ExternalJobFinderService): The wrapped service.
+        ttl (float): The time in seconds an entry is fresh.
+        stale_ttl (float): The time in seconds an expired entry can still be served while it is refreshed.
+        max_size (int): The maximum number of entries.
+        stats (CacheStats): The counters of the cache.
+
+    """
+
+    def __init__(
+        self,
+        service: ExternalJobFinderService,
+        ttl: float = 60.0,
+        stale_ttl: float = 300.0,
+        max_size: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the CachedJobFinderService.
+
+        Args:
+            service (ExternalJobFinderService): The service to wrap.
+            ttl (float): The time in seconds an entry is fresh.
+            stale_ttl (float): The time in seconds an expired entry can still be served while it is refreshed.
+            max_size (int): The maximum number of entries.
+            clock (Callable[[], float]): The clock used to timestamp the entries.
+
+        """
+        self.service = service
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._streams: dict[tuple, InflightStream] = {}
+
+    @property
+    def source_name(self) -> str:
+        """str: The name of the wrapped service."""
+        name = getattr(self.service, "source_name", None)
+        return name if isinstance(name, str) else type(self.service).__name__
+
+    async def get_jobs(self, job_filters: Optional[JobFilters] = None) -> [Job]:
+        """Retrieve jobs from the cache, or from the wrapped service.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters to apply while fetching jobs.
+
+        Returns:
+            List[Job]: A list of Job objects representing the jobs found by the wrapped service.
+
+        """
+        key = cache_key(job_filters)
+        jobs = self._lookup(key, job_filters)
+        if jobs is not None:
+            return jobs
+
+        self.stats.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_fetch(key, job_filters)
+        else:
+            self.stats.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    async def stream_jobs(self, job_filters: Optional[JobFilters] = None) -> AsyncIterator[Job]:
+        """Retrieve jobs from the cache, or from the wrapped service as they are received.
+
+        A miss is streamed from the stream_jobs method of the wrapped service if it has one, in a single upstream call
+        shared by every concurrent miss for the same filters: the requests streaming them follow the jobs as they are
+        received, the requests calling get_jobs wait for the whole result. The jobs are cached once the stream is complete.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters to apply while fetching jobs.
+
+        Yields:
+            Job: The jobs found by the wrapped service.
+
+        """
+        key = cache_key(job_filters)
+        jobs = self._lookup(key, job_filters)
+        stream = self._streams.get(key)
+        if jobs is None and stream is None and (key in self._inflight or not inspect.isasyncgenfunction(getattr(self.service, "stream_jobs", None))):
+            jobs = await self.get_jobs(job_filters)
+        if jobs is not None:
+            for job in jobs:
+                yield job
+            return
+
+        self.stats.misses += 1
+        if stream is None:
+            stream = InflightStream()
+            self._start_fetch(key, job_filters, stream)
+        else:
+            self.stats.coalesced += 1
+
+        async for job in stream.follow():
+            yield job
+
+    def _lookup(self, key: tuple, job_filters: Optional[JobFilters]) -> Optional[list[Job]]:
+        """Look up a usable entry, refreshing it in the background if it is stale.
+
+        Args:
+            key (tuple): The cache key of the filters.
+            job_filters (Optional[JobFilters]): The filters to send upstream on refresh.
+
+        Returns:
+            Optional[list[Job]]: The jobs of the entry, None if there is no usable entry.
+
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self.clock() - entry.fetched_at
+            if age <= self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                if age <= self.ttl:
+                    self.stats.hits += 1
+                else:
+                    self.stats.stale_hits += 1
+                    if key not in self._inflight:
+                        self.stats.refreshes += 1
+                        self._start_fetch(key, job_filters)
+                return entry.jobs
+
+        return None
+
+    def invalidate(self):
+        """Drop every entry of the cache."""
+        self._entries.clear()
+        self.stats.size = 0
+
+    def _start_fetch(self, key: tuple, job_filters: Optional[JobFilters], stream: Optional[InflightStream] = None) -> asyncio.Task:
+        """Start an upstream call storing its result in the cache.
+
+        The call is shared by every request waiting for the same key and is not cancelled when they are.
+
+        Args:
+            key (tuple): The cache key of the filters.
+            job_filters (Optional[JobFilters]): The filters to send upstream.
+            stream (Optional[InflightStream]): The InflightStream receiving the jobs as they arrive, to stream them
+                from the wrapped service, None to call its get_jobs.
+
+        Returns:
+            asyncio.Task: The task of the upstream call, returning all the jobs.
+
+        """
+        if stream is None:
+            task = asyncio.ensure_future(self._fetch(key, job_filters))
+        else:
+            task = asyncio.ensure_future(self._fetch_stream(key, job_filters, stream))
+            self._streams[key] = stream
+        self._inflight[key] = task
+
+        def done(finished: asyncio.Task):
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            if stream is not None and self._streams.get(key) is stream:
+                del self._streams[key]
+            if not finished.cancelled() and finished.exception() is not None:
+                self.stats.errors += 1
+
+        task.add_done_callback(done)
+        return task
+
+    async def _fetch(self, key: tuple, job_filters: Optional[JobFilters]) -> [Job]:
+        jobs = await self.service.get_jobs(job_filters)
+        self._store(key, jobs)
+
+        return jobs
+
+    async def _fetch_stream(self, key: tuple, job_filters: Optional[JobFilters], stream: InflightStream) -> [Job]:
+        try:
+            async for job in self.service.stream_jobs(job_filters):
+                stream.jobs.append(job)
+                stream.wake()
+        except BaseException as error:
+            stream.error = error
+            raise
+        finally:
+            stream.finished = True
+            stream.wake()
+        self._store(key, stream.jobs)
+
+        return stream.jobs
+
+    def _store(self, key: tuple, jobs: list[Job]):
+        """Cache the jobs of an upstream call, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key (tuple): The cache key of the filters.
+            jobs (list[Job]): The jobs of the call.
+
+        """
+        self._entries[key] = CacheEntry(jobs=jobs, fetched_at=self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.size = len(self._entries)
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.domain.job import Job
+from app.repository.mirror_repository import MirrorJobRepository, content_hash
+from app.services.external_job_finder_service import ExternalJobFinderService
+from app.services.job_alert import JobAlertService
+from app.services.notify_service import Notifier
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncReport:
+    """The outcome of one synchronization of the catalogue.
+
+    Attributes:
+        fetched (int): The number of jobs in the catalogue of the source.
+        added (int): The number of jobs added to the mirror.
+        removed (int): The number of jobs removed from the mirror.
+        subscribers (int): The number of subscribers notified about the added jobs.
+        failed_subscribers (int): The number of subscribers whose notification failed.
+        elapsed (float): The time in seconds spent synchronizing.
+
+    """
+
+    fetched: int = 0
+    added: int = 0
+    removed: int = 0
+    subscribers: int = 0
+    failed_subscribers: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class SyncStats:
+    """Counters of the CatalogueSync.
+
+    Attributes:
+        syncs (int): The number of successful synchronizations.
+        failures (int): The number of synchronizations that failed, the mirror being left as it was.
+        added (int): The number of jobs added to the mirror, over all the synchronizations.
+        removed (int): The number of jobs removed from the mirror, over all the synchronizations.
+        failed_notifications (int): The number of subscribers whose notification failed, over all the synchronizations.
+        last_sync (Optional[float]): The time.time() of the last successful synchronization, None before the first one.
+        last_elapsed (float): The time in seconds spent by the last successful synchronization.
+
+    """
+
+    syncs: int = 0
+    failures: int = 0
+    added: int = 0
+    removed: int = 0
+    failed_notifications: int = 0
+    last_sync: Optional[float] = None
+    last_elapsed: float = 0.0
+
+
+class CatalogueSync:
+    """A background job mirroring the catalogue of an external source.
+
+    Every interval seconds, the whole catalogue is fetched from the source and diffed by content hash against the
+    mirror: only the jobs whose hash is new are added and only the jobs whose hash is gone are removed. The added jobs
+    are matched against the job alerts and their subscribers notified, like the jobs posted to the repository, except
+    on the first synchronization, which only fills the mirror. The subscribers are notified before the diff is applied
+    to the mirror, so if the matching fails the synchronization fails and the added jobs are notified by the next one,
+    and a failure to notify a subscriber is logged and counted without keeping the other subscribers from being
+    notified. A failed synchronization leaves the mirror as it was and is retried at the next interval.
+
+    Attributes:
+        source (ExternalJobFinderService): The external source whose catalogue is mirrored.
+        mirror (MirrorJobRepository): The local copy of the catalogue.
+        job_alert_service (Optional[JobAlertService]): The JobAlertService used to find the subscribers to notify, None to not notify.
+        notifier (Optional[Notifier]): The Notifier used to notify the subscribers, None to not notify.
+        interval (float): The time in seconds between two synchronizations.
+        stats (SyncStats): The counters of the synchronizations.
+
+    """
+
+    def __init__(
+        self,
+        source: ExternalJobFinderService,
+        mirror: MirrorJobRepository,
+        job_alert_service: Optional[JobAlertService] = None,
+        notifier: Optional[Notifier] = None,
+        interval: float = 60.0,
+    ):
+        """Initialize the CatalogueSync.
+
+        Args:
+            source (ExternalJobFinderService): The external source whose catalogue is mirrored.
+            mirror (MirrorJobRepository): The local copy of the catalogue.
+            job_alert_service (Optional[JobAlertService]): The JobAlertService used to find the subscribers to notify, None to not notify.
+            notifier (Optional[Notifier]): The Notifier used to notify the subscribers, None to not notify.
+            interval (float): The time in seconds between two synchronizations.
+
+        """
+        self.source = source
+        self.mirror = mirror
+        self.job_alert_service = job_alert_service
+        self.notifier = notifier
+        self.interval = interval
+        self.stats = SyncStats()
+        self._task: Optional[asyncio.Task] = None
+
+    async def sync(self) -> SyncReport:
+        """Synchronize the mirror with the catalogue of the source once.
+
+        Returns:
+            SyncReport: The size of the catalogue and the changes applied to the mirror.
+
+        Raises:
+            JobFinderServiceError: If the catalogue could not be fetched, the mirror being left as it was.
+            Exception: If the added jobs could not be matched against the job alerts, the mirror being left as it was.
+
+        """
+        start = time.perf_counter()
+        source_jobs = await self.source.get_jobs(None)
+
+        snapshot: dict[str, Job] = {}
+        for source_job in source_jobs:
+            job = Job(name=source_job.name, country=source_job.country, salary=source_job.salary, skills=list(source_job.skills))
+            snapshot.setdefault(content_hash(job), job)
+
+        known = self.mirror.hashes()
+        added = {key: job for key, job in snapshot.items() if key not in known}
+        removed = known.difference(snapshot)
+
+        report = SyncReport(fetched=len(source_jobs), added=len(added), removed=len(removed))
+        if added and self.stats.syncs and self.job_alert_service is not None and self.notifier is not None:
+            report.subscribers, report.failed_subscribers = await asyncio.to_thread(self._notify, list(added.values()))
+        self.mirror.apply(added, removed)
+
+        report.elapsed = time.perf_counter() - start
+        self.stats.syncs += 1
+        self.stats.added += report.added
+        self.stats.removed += report.removed
+        self.stats.failed_notifications += report.failed_subscribers
+        self.stats.last_sync = time.time()
+        self.stats.last_elapsed = report.elapsed
+
+        return report
+
+    def _notify(self, jobs: list[Job]) -> tuple[int, int]:
+        """Notify the subscribers of the job alerts matching new jobs of the catalogue.
+
+        A subscriber whose notification fails is logged and counted, and the other subscribers are still notified.
+
+        Args:
+            jobs (list[Job]): The jobs about to be added to the mirror.
+
+        Returns:
+            tuple[int, int]: The number of subscribers notified, and the number of subscribers whose notification failed.
+
+        """
+        to_notify = self.job_alert_service.get_jobs_to_notify(jobs)
+        failed = 0
+        for email, email_jobs in to_notify.items():
+            try:
+                self.notifier.notify_many(email, email_jobs)
+            except Exception:
+                failed += 1
+                logger.exception("Notifying %d new jobs of the catalogue to %s failed", len(email_jobs), email)
+
+        return len(to_notify) - failed, failed
+
+    async def _sync_safely(self):
+        """Synchronize the mirror once, logging and counting the failures."""
+        try:
+            report = await self.sync()
+        except Exception:
+            self.stats.failures += 1
+            logger.exception("Synchronizing the catalogue failed, the mirror keeps %d jobs", self.mirror.count())
+        else:
+            logger.info("Synchronized the catalogue: %d jobs, %d added, %d removed", report.fetched, report.added, report.removed)
+
+    async def _run(self):
+        """Synchronize the mirror every interval seconds, until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._sync_safely()
+
+    async def start(self):
+        """Synchronize the mirror once, then start synchronizing it in the background.
+
+        The first synchronization is awaited so the mirror is filled before the requests are served,
+        unless the source fails, in which case it is retried at the next interval.
+
+        """
+        if self._task is not None:
+            return
+
+        await self._sync_safely()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def aclose(self):
+        """Stop synchronizing the mirror."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,410 @@
+import asyncio
+import inspect
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Optional
+
+from app.domain.job_filters import JobFilters
+from app.services.cached_job_finder_service import cache_key
+from app.services.external_job_finder_service import ExternalJobFinderService, Job, JobFinderServiceError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(JobFinderServiceError):
+    """An exception raised when a call is rejected because the circuit is open and no fallback is available.
+
+    Inherits from:
+        JobFinderServiceError: The base class for errors related to the Job Finder Service.
+
+    """
+
+    pass
+
+
+@dataclass
+class BreakerStats:
+    """Counters of the CircuitBreakerJobFinderService.
+
+    Attributes:
+        calls (int): The number of calls sent to the service.
+        failures (int): The number of calls that failed.
+        rejected (int): The number of requests not sent to the service because the circuit was open.
+        fallbacks (int): The number of rejected requests served with the last good result.
+        hedged (int): The number of hedged calls started.
+        hedge_wins (int): The number of hedged calls that answered before the call they hedged.
+
+    """
+
+    calls: int = 0
+    failures: int = 0
+    rejected: int = 0
+    fallbacks: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+
+class CircuitBreaker:
+    """A circuit breaker opening when the failure rate of the recent calls is too high.
+
+    The outcomes of the calls of the last window seconds are kept. Once there are at least minimum_calls of them
+    and the share of failures reaches failure_rate_threshold, the circuit opens: calls are rejected for open_timeout
+    seconds. The circuit is then half-open: up to half_open_max_calls trial calls are let through, closing the circuit
+    if they succeed and opening it again if one fails.
+
+    Attributes:
+        failure_rate_threshold (float): The share of failed calls opening the circuit.
+        window (float): The time in seconds the outcomes of the calls are kept.
+        minimum_calls (int): The minimum number of calls in the window before the circuit can open.
+        open_timeout (float): The time in seconds the circuit stays open before letting trial calls through.
+        half_open_max_calls (int): The maximum number of concurrent trial calls while half-open.
+
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window: float = 30.0,
+        minimum_calls: int = 10,
+        open_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the CircuitBreaker.
+
+        Args:
+            failure_rate_threshold (float): The share of failed calls opening the circuit.
+            window (float): The time in seconds the outcomes of the calls are kept.
+            minimum_calls (int): The minimum number of calls in the window before the circuit can open.
+            open_timeout (float): The time in seconds the circuit stays open before letting trial calls through.
+            half_open_max_calls (int): The maximum number of concurrent trial calls while half-open.
+            clock (Callable[[], float]): The clock used to timestamp the calls.
+
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window = window
+        self.minimum_calls = minimum_calls
+        self.open_timeout = open_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self.opened = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+
+    @property
+    def state(self) -> str:
+        """str: "closed", "open" or "half_open"."""
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_timeout:
+            self._state = HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def _expire(self):
+        """Forget the outcomes older than the window."""
+        horizon = self.clock() - self.window
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            _, success = self._outcomes.popleft()
+            if not success:
+                self._failures -= 1
+
+    @property
+    def failure_rate(self) -> float:
+        """float: The share of failed calls in the window."""
+        self._expire()
+        return self._failures / len(self._outcomes) if self._outcomes else 0.0
+
+    @property
+    def calls_in_window(self) -> int:
+        """int: The number of calls in the window."""
+        self._expire()
+        return len(self._outcomes)
+
+    @property
+    def retry_after(self) -> float:
+        """float: The time in seconds before an open circuit lets trial calls through, 0 if it is not open."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.open_timeout - (self.clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Check whether a call can be sent, counting it as a trial call if the circuit is half-open.
+
+        Returns:
+            bool: True if the call can be sent, False if it must be rejected.
+
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._trials < self.half_open_max_calls:
+            self._trials += 1
+            return True
+        return False
+
+    def record(self, success: bool):
+        """Record the outcome of an allowed call.
+
+        Args:
+            success (bool): Whether the call succeeded.
+
+        """
+        state = self.state
+        if state == HALF_OPEN:
+            self._trials = max(0, self._trials - 1)
+            if success:
+                self._close()
+            else:
+                self._open()
+            return
+        if state == OPEN:
+            return
+
+        self._outcomes.append((self.clock(), success))
+        if not success:
+            self._failures += 1
+        self._expire()
+        if len(self._outcomes) >= self.minimum_calls and self._failures / len(self._outcomes) >= self.failure_rate_threshold:
+            self._open()
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self.opened += 1
+
+    def _close(self):
+        self._state = CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+
+
+class CircuitBreakerJobFinderService:
+    """A circuit breaker and request hedging layer wrapped around an ExternalJobFinderService.
+
+    The calls to the wrapped service go through a CircuitBreaker. While the circuit is open, requests fail fast:
+    they are answered with the last good result of the same filters if there is one, or rejected with
+    CircuitOpenError otherwise, without waiting for the service.
+
+    With a hedge_percentile, a call still running after that percentile of the latencies of the recent successful
+    calls is hedged: a second identical call is sent and the first answer is kept, the other call being cancelled.
+
+    Attributes:
+        service (ExternalJobFinderService): The wrapped service.
+        breaker (CircuitBreaker): The circuit breaker of the calls.
+        hedge_percentile (Optional[float]): The latency percentile, between 0 and 1, after which a call is hedged, None to never hedge.
+        hedge_min_samples (int): The minimum number of latencies measured before calls are hedged.
+        fallback_size (int): The maximum number of last good results kept, by filters.
+        stats (BreakerStats): The counters of the service.
+
+    """
+
+    def __init__(
+        self,
+        service: ExternalJobFinderService,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        fallback_size: int = 256,
+    ):
+        """Initialize the CircuitBreakerJobFinderService.
+
+        Args:
+            service (ExternalJobFinderService): The service to wrap.
+            breaker (Optional[CircuitBreaker]): The circuit breaker of the calls, one with the default settings by default.
+            hedge_percentile (Optional[float]): The latency percentile, between 0 and 1, after which a call is hedged, None to never hedge.
+            hedge_min_samples (int): The minimum number of latencies measured before calls are hedged.
+            fallback_size (int): The maximum number of last good results kept, by filters.
+
+        """
+        self.service = service
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.fallback_size = fallback_size
+        self.stats = BreakerStats()
+        self._latencies: deque[float] = deque(maxlen=200)
+        self._last_good: OrderedDict[tuple, list[Job]] = OrderedDict()
+
+    @property
+    def source_name(self) -> str:
+        """str: The name of the wrapped service."""
+        name = getattr(self.service, "source_name", None)
+        return name if isinstance(name, str) else type(self.service).__name__
+
+    @property
+    def hedge_delay(self) -> Optional[float]:
+        """Optional[float]: The time in seconds after which a call is hedged, None if calls are not hedged yet."""
+        if self.hedge_percentile is None or len(self._latencies) < self.hedge_min_samples:
+            return None
+
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(self.hedge_percentile * len(latencies)))]
+
+    async def get_jobs(self, job_filters: Optional[JobFilters] = None) -> [Job]:
+        """Retrieve jobs from the wrapped service, unless the circuit is open.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters to apply while fetching jobs.
+
+        Returns:
+            List[Job]: A list of Job objects representing the jobs found by the wrapped service, or its last good
+                result for the same filters while the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and there is no last good result for the filters.
+            JobFinderServiceError: If the call to the service failed.
+
+        """
+        key = cache_key(job_filters)
+        if not self.breaker.allow():
+            self.stats.rejected += 1
+            if key in self._last_good:
+                self.stats.fallbacks += 1
+                return self._last_good[key]
+            raise CircuitOpenError()
+
+        self.stats.calls += 1
+        start = time.perf_counter()
+        try:
+            jobs = await self._call(job_filters)
+        except asyncio.CancelledError:
+            self.breaker.record(False)
+            raise
+        except Exception:
+            self.stats.failures += 1
+            self.breaker.record(False)
+            raise
+
+        self._succeeded(key, jobs, time.perf_counter() - start)
+
+        return jobs
+
+    async def stream_jobs(self, job_filters: Optional[JobFilters] = None) -> AsyncIterator[Job]:
+        """Retrieve jobs from the wrapped service as they are received, unless the circuit is open.
+
+        The jobs are streamed from the stream_jobs method of the wrapped service if it has one, without hedging,
+        and the call is recorded by the circuit breaker once the stream ends. Otherwise the jobs of get_jobs are yielded.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters to apply while fetching jobs.
+
+        Yields:
+            Job: The jobs found by the wrapped service, or its last good result for the same filters while the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and there is no last good result for the filters.
+            JobFinderServiceError: If the call to the service failed.
+
+        """
+        if not inspect.isasyncgenfunction(getattr(self.service, "stream_jobs", None)):
+            for job in await self.get_jobs(job_filters):
+                yield job
+            return
+
+        key = cache_key(job_filters)
+        if not self.breaker.allow():
+            self.stats.rejected += 1
+            if key in self._last_good:
+                self.stats.fallbacks += 1
+                for job in self._last_good[key]:
+                    yield job
+                return
+            raise CircuitOpenError()
+
+        self.stats.calls += 1
+        start = time.perf_counter()
+        jobs = []
+        try:
+            async for job in self.service.stream_jobs(job_filters):
+                jobs.append(job)
+                yield job
+        except GeneratorExit:
+            # The stream was closed by its consumer, the service answered fine so far
+            self.breaker.record(True)
+            raise
+        except asyncio.CancelledError:
+            self.breaker.record(False)
+            raise
+        except Exception:
+            self.stats.failures += 1
+            self.breaker.record(False)
+            raise
+
+        self._succeeded(key, jobs, time.perf_counter() - start)
+
+    def _succeeded(self, key: tuple, jobs: list[Job], latency: float):
+        """Record a successful call, keeping its result as the last good result of its filters.
+
+        Args:
+            key (tuple): The cache key of the filters of the call.
+            jobs (list[Job]): The jobs of the call.
+            latency (float): The time in seconds the call took.
+
+        """
+        self._latencies.append(latency)
+        self.breaker.record(True)
+        self._last_good[key] = jobs
+        self._last_good.move_to_end(key)
+        while len(self._last_good) > self.fallback_size:
+            self._last_good.popitem(last=False)
+
+    async def _call(self, job_filters: Optional[JobFilters]) -> [Job]:
+        """Call the wrapped service, hedging the call if it is slower than the hedge delay.
+
+        Args:
+            job_filters (Optional[JobFilters]): The filters to send to the service.
+
+        Returns:
+            List[Job]: The jobs of the first call to succeed.
+
+        Raises:
+            Exception: The error of the last call to fail, if both failed.
+
+        """
+        delay = self.hedge_delay
+        if delay is None:
+            return await self.service.get_jobs(job_filters)
+
+        primary = asyncio.ensure_future(self.service.get_jobs(job_filters))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self.stats.hedged += 1
+        hedge = asyncio.ensure_future(self.service.get_jobs(job_filters))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+            raise (hedge.exception() or primary.exception())
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def snapshot(self) -> dict:
+        """Describe the state of the circuit breaker for monitoring.
+
+        Returns:
+            dict: The state of the circuit, its window and the counters of the service.
+
+        """
+        return {
+            "state": self.breaker.state,
+            "failure_rate": self.breaker.failure_rate,
+            "calls_in_window": self.breaker.calls_in_window,
+            "retry_after": self.breaker.retry_after,
+            "hedge_delay": self.hedge_delay,
+            "fallback_entries": len(self._last_good),
+            "opened": self.breaker.opened,
+            **asdict(self.stats),
+        }
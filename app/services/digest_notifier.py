@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.domain.job import Job
+from app.services.notify_service import Notifier
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DigestStats:
+    """Counters of the DigestNotifier.
+
+    Attributes:
+        received (int): The number of job notifications received.
+        duplicates (int): The number of job notifications dropped as a job already pending for the same email.
+        digests (int): The number of digests sent to the sink.
+        delivered (int): The number of job notifications sent to the sink, within the digests.
+        failed (int): The number of job notifications dropped because the sink failed.
+
+    """
+
+    received: int = 0
+    duplicates: int = 0
+    digests: int = 0
+    delivered: int = 0
+    failed: int = 0
+
+
+def job_key(job: Job) -> tuple:
+    """Identify a job by its fields.
+
+    Args:
+        job (Job): The job.
+
+    Returns:
+        tuple: The name, country, salary and skills of the job.
+
+    """
+    return job.name, job.country, job.salary, tuple(job.skills)
+
+
+class DigestNotifier:
+    """A notifier coalescing the notifications of each email into digests.
+
+    The jobs notified to an email are accumulated, each job once, and sent to the sink in a single notify_many
+    call, a digest, when max_batch_size jobs are pending for the email or max_delay seconds after the first of
+    them was received, whichever comes first. The delayed digests are sent by a background thread. During an
+    ingestion spike a subscriber thus gets a digest per max_batch_size matching jobs, or per max_delay seconds,
+    instead of an email per job and per matching alert.
+
+    The DigestNotifier implements the Notifier protocol, so it can be used as the sink of a NotificationDispatcher
+    in front of a PrintEmailNotifier.
+
+    Attributes:
+        sink (Notifier): The notifier the digests are sent to.
+        max_batch_size (int): The maximum number of jobs of a digest.
+        max_delay (float): The maximum time in seconds a job waits before its digest is sent.
+        stats (DigestStats): The counters of the notifier.
+
+    """
+
+    def __init__(self, sink: Notifier, max_batch_size: int = 50, max_delay: float = 60.0):
+        """Initialize the DigestNotifier.
+
+        Args:
+            sink (Notifier): The notifier the digests are sent to.
+            max_batch_size (int): The maximum number of jobs of a digest.
+            max_delay (float): The maximum time in seconds a job waits before its digest is sent.
+
+        """
+        self.sink = sink
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.stats = DigestStats()
+
+        # The pending jobs of each email, by job key, with the time the first of them was received,
+        # in the order of that time, so the first entry is always the next digest due
+        self._pending: dict[str, tuple[float, dict[tuple, Job]]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """int: The number of jobs waiting for their digest, over all the emails."""
+        with self._lock:
+            return sum(len(jobs) for _, jobs in self._pending.values())
+
+    def start(self):
+        """Start the background thread sending the delayed digests, if it is not running yet."""
+        with self._lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._run, name="notification-digest", daemon=True)
+            self._thread.start()
+
+    def notify(self, email: str, new_job: Job):
+        """Add a job to the pending digest of an email.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_job (Job): The new job.
+
+        """
+        self.notify_many(email, [new_job])
+
+    def notify_many(self, email: str, new_jobs: list[Job]):
+        """Add several jobs to the pending digest of an email, sending it if it is full.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_jobs (list[Job]): The new jobs.
+
+        """
+        self.start()
+        with self._lock:
+            entry = self._pending.get(email)
+            if entry is None:
+                entry = self._pending[email] = (time.monotonic(), {})
+                self._wakeup.notify()
+            jobs = entry[1]
+            for job in new_jobs:
+                key = job_key(job)
+                if key in jobs:
+                    self.stats.duplicates += 1
+                else:
+                    jobs[key] = job
+            self.stats.received += len(new_jobs)
+            if len(jobs) < self.max_batch_size and not self._closed:
+                return
+            del self._pending[email]
+
+        self._send(email, list(jobs.values()))
+
+    def flush(self):
+        """Send every pending digest now."""
+        with self._lock:
+            due, self._pending = self._pending, {}
+        for email, (_, jobs) in due.items():
+            self._send(email, list(jobs.values()))
+
+    def close(self, timeout: Optional[float] = None):
+        """Send every pending digest and stop the background thread.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait for the background thread, forever by default.
+
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+            self._wakeup.notify()
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def _run(self):
+        """Send the digests whose delay expired, until closed."""
+        while True:
+            with self._lock:
+                while not self._closed:
+                    if not self._pending:
+                        self._wakeup.wait()
+                        continue
+                    since, _ = next(iter(self._pending.values()))
+                    delay = since + self.max_delay - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._wakeup.wait(delay)
+                if self._closed:
+                    return
+
+                now = time.monotonic()
+                due = []
+                for email, (since, jobs) in self._pending.items():
+                    if since + self.max_delay > now:
+                        break
+                    due.append((email, jobs))
+                for email, _ in due:
+                    del self._pending[email]
+
+            for email, jobs in due:
+                self._send(email, list(jobs.values()))
+
+    def _send(self, email: str, jobs: list[Job]):
+        """Send the jobs of an email to the sink, in digests of at most max_batch_size jobs.
+
+        Args:
+            email (str): The email of the subscriber.
+            jobs (list[Job]): The jobs to send.
+
+        """
+        for start in range(0, len(jobs), self.max_batch_size):
+            digest = jobs[start : start + self.max_batch_size]
+            try:
+                self.sink.notify_many(email, digest)
+            except Exception:
+                logger.exception("Dropping a digest of %d notifications to %s", len(digest), email)
+                with self._lock:
+                    self.stats.failed += len(digest)
+            else:
+                with self._lock:
+                    self.stats.digests += 1
+                    self.stats.delivered += len(digest)
@@ -1,16 +1,13 @@
+import time
 from dataclasses import asdict, dataclass
-from typing import Optional, Protocol
+from typing import Any, AsyncIterator, Optional, Protocol
 from urllib.parse import urljoin
 
 import httpx
 
-
-@dataclass
-class JobFilters:
-    name: Optional[str] = None
-    salary_max: Optional[int] = None
-    salary_min: Optional[int] = None
-    country: Optional[str] = None
+from app.domain.job_filters import JobFilters
+from app.json_stream import iter_json_array
+from app.metrics import EXTRA_SOURCE_DURATION, EXTRA_SOURCE_ERRORS
 
 
 @dataclass
@@ -28,7 +25,7 @@ class ExternalJobFinderService(Protocol):
 
     """
 
-    def get_jobs(self, job_filters: JobFilters) -> [Job]:
+    async def get_jobs(self, job_filters: JobFilters) -> [Job]:
         """Retrieve jobs from the external job finder service.
 
         This method should be implemented to fetch jobs based on the provided filters.
@@ -66,52 +63,122 @@ class JobberwockyExtraSource:
     """A class to interact with the Jobberwocky external source.
 
     This class provides methods to fetch job data from the Jobberwocky extra source service and convert it into Job objects.
+    The requests are sent through a long-lived httpx.AsyncClient, so its pool of keep-alive connections is reused across requests.
+    The client is created by start(), or on the first request, and must be closed with aclose().
 
     Attributes:
         service_url (str): The base URL of the Jobberwocky extra source service.
+        limits (httpx.Limits): The limits of the connection pool.
+        timeout (httpx.Timeout): The timeouts of the requests.
 
     """
 
-    def __init__(self, service_url: str):
+    def __init__(
+        self,
+        service_url: str,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 5.0,
+    ):
         """Initialize the JobberwockyExtraSource.
 
         Args:
             service_url (str): The base URL of the Jobberwocky extra source service.
+            max_connections (int): The maximum number of concurrent connections to the service.
+            max_keepalive_connections (int): The maximum number of idle connections kept alive in the pool.
+            keepalive_expiry (float): The time in seconds an idle connection is kept alive.
+            timeout (float): The timeout in seconds of connecting, reading, writing and acquiring a connection from the pool.
 
         """
         self.service_url = service_url
-
-    def _get(self, url: str, filters: Optional[JobFilters] = None) -> dict:
-        """Send an HTTP GET request to the specified URL.
-
-        This method sends an HTTP GET request to the provided URL and returns the response in JSON format.
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """httpx.AsyncClient: The client of the service, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+        return self._client
+
+    async def start(self):
+        """Create the client of the service and its connection pool."""
+        self.client
+
+    async def aclose(self):
+        """Close the client of the service and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _stream(self, url: str, filters: Optional[JobFilters] = None) -> AsyncIterator[list[Any]]:
+        """Send an HTTP GET request to the specified URL, parsing the JSON array of the response as it is received.
+
+        The body of the response is read in chunks and fed to a JSONArrayParser, so the items of the array are yielded
+        as soon as they are received, without buffering nor decoding the whole body first.
 
         Args:
             url (str): The URL to send the GET request to.
             filters (Optional[JobFilters]): An optional object representing filters to apply to the request.
 
-        Returns:
-            dict: A dictionary representing the JSON response from the HTTP GET request.
+        Yields:
+            list[Any]: The decoded items of the JSON array of the response completed by each chunk of the body, in order.
 
         Raises:
-            JobFinderServiceError: If an HTTP error occurs while making the request.
+            JobFinderServiceError: If an HTTP error occurs while making the request or reading the response, the service
+                answers with an error status or its response is not a JSON array.
 
         """
+        start = time.perf_counter()
         try:
-            if filters:
-                sanitized_filters = self._sanitize_filters(filters)
-                response = httpx.get(url, sanitized_filters)
-            else:
-                response = httpx.get(url)
-            return response.json()
-        except httpx.HTTPError:
+            params = self._sanitize_filters(filters) if filters else None
+            async with self.client.stream("GET", url, params=params) as response:
+                if response.is_error:
+                    raise JobFinderServiceError()
+                async for items in iter_json_array(response.aiter_bytes()):
+                    yield items
+        except (httpx.HTTPError, ValueError):
+            EXTRA_SOURCE_ERRORS.inc()
             raise JobFinderServiceError()
+        except JobFinderServiceError:
+            EXTRA_SOURCE_ERRORS.inc()
+            raise
+        finally:
+            EXTRA_SOURCE_DURATION.observe(time.perf_counter() - start)
+
+    async def stream_jobs(self, job_filters: Optional[JobFilters] = None) -> AsyncIterator[Job]:
+        """Retrieve jobs from the Jobberwocky extra source service as they are received.
+
+        The rows of the response are converted into Job objects as soon as they are parsed, so the first jobs are available
+        before the whole response is received. The filters are sent to the service as query parameters, except the skills
+        filter, which the service does not support and is applied on the received jobs.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters to apply while fetching jobs.
 
-    def get_jobs(self, job_filters: Optional[JobFilters] = None) -> [Job]:
+        Yields:
+            Job: The jobs fetched from the Jobberwocky service, in the order of the response.
+
+        Raises:
+            JobFinderServiceError: If the jobs could not be fetched.
+
+        """
+        async for jobs in self._stream_batches(job_filters):
+            for job in jobs:
+                yield job
+
+    async def get_jobs(self, job_filters: Optional[JobFilters] = None) -> [Job]:
         """Retrieve jobs from the Jobberwocky extra source service.
 
         This method fetches job data from the Jobberwocky extra source service, applies optional filters, and converts the data into
-        a list of Job objects.
+        a list of Job objects. The response is parsed as it is received, so only the Job objects are held in memory, not the body
+        of the response and its decoded rows as well.
 
         Args:
             job_filters (Optional[JobFilters]): An optional object representing filters to apply while fetching jobs.
@@ -120,28 +187,37 @@ class JobberwockyExtraSource:
             List[Job]: A list of Job objects representing the jobs fetched from the Jobberwocky service.
 
         """
-        endpoint_name = "jobs"
-        url = urljoin(self.service_url, endpoint_name)
-
-        external_jobs = self._get(url, job_filters)
-
         jobs = []
-        for job_row in external_jobs:
-            job_name = job_row[0]
-            job_salary = job_row[1]
-            job_country = job_row[2]
-            job_skills = job_row[3]
-            job = Job(
-                name=job_name, salary=job_salary, country=job_country, skills=job_skills
-            )
-            jobs.append(job)
+        async for batch in self._stream_batches(job_filters):
+            jobs.extend(batch)
 
         return jobs
 
+    async def _stream_batches(self, job_filters: Optional[JobFilters]) -> AsyncIterator[list[Job]]:
+        """Fetch the jobs of the service, converting the rows of each chunk of the response into Job objects.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters to apply while fetching jobs.
+
+        Yields:
+            list[Job]: The jobs satisfying the skills filter among the rows of each chunk of the response.
+
+        """
+        endpoint_name = "jobs"
+        url = urljoin(self.service_url, endpoint_name)
+        skills = set(job_filters.skills) if job_filters is not None and job_filters.skills else None
+
+        async for rows in self._stream(url, job_filters):
+            jobs = [Job(name=row[0], salary=row[1], country=row[2], skills=row[3]) for row in rows]
+            if skills is not None:
+                jobs = [job for job in jobs if skills.issubset(job.skills)]
+            yield jobs
+
     def _sanitize_filters(self, job_filters: JobFilters) -> dict:
         """Sanitize job filters.
 
-        This method takes a JobFilters object and converts it into a dictionary, excluding any None values.
+        This method takes a JobFilters object and converts it into a dictionary of query parameters, excluding any None values
+        and the skills filter, which the service does not support.
 
         Args:
             job_filters (JobFilters): The JobFilters object to sanitize.
@@ -150,10 +226,28 @@ class JobberwockyExtraSource:
             dict: A dictionary representing the sanitized filters.
 
         """
-        filters = {
-            filter_name: filter_value
-            for filter_name, filter_value in asdict(job_filters).items()
-            if filter_value is not None
-        }
+        filters = sanitize_filters(job_filters)
+        filters.pop("skills", None)
 
         return filters
+
+
+def sanitize_filters(job_filters: JobFilters) -> dict:
+    """Sanitize job filters.
+
+    This function takes a JobFilters object and converts it into a dictionary, excluding any None values.
+
+    Args:
+        job_filters (JobFilters): The JobFilters object to sanitize.
+
+    Returns:
+        dict: A dictionary representing the sanitized filters.
+
+    """
+    filters = {
+        filter_name: filter_value
+        for filter_name, filter_value in asdict(job_filters).items()
+        if filter_value is not None
+    }
+
+    return filters
@@ -1,9 +1,13 @@
-import re
-from typing import Protocol
+import asyncio
+import threading
+import time
+from typing import Optional, Protocol
 
 from app.domain.job import Job
 from app.domain.job_alert import JobAlert
+from app.metrics import ALERT_MATCH_DURATION, ALERT_MATCHED_JOBS, ALERT_MATCHES
 from app.repository.alert_repository import JobAlertRepository
+from app.services.alert_matcher import AlertMatcher, compile_alert
 
 
 class JobAlertService(Protocol):
@@ -28,30 +32,101 @@ class JobAlertService(Protocol):
         """
         ...
 
+    def get_jobs_to_notify(self, jobs: list[Job]) -> dict[str, list[Job]]:
+        """Match a batch of new jobs against the job alerts, grouping them per subscriber.
+
+        Args:
+            jobs (list[Job]): The new jobs.
+
+        Returns:
+            dict[str, list[Job]]: The jobs to notify to each subscriber email, in the order of the batch,
+                each job once per subscriber even if several of its job alerts match it.
+
+        """
+        ...
+
+    def add_job_alert(self, job_alert: JobAlert):
+        """Register a new job alert.
+
+        This method should be implemented to store the job alert so that it is considered by
+        get_job_alerts_to_notify from then on.
+
+        Args:
+            job_alert (JobAlert): The JobAlert object to be registered.
+
+        """
+        ...
+
 
 class JobberwockyJobAlert:
     """An implementation of the JobAlertService protocol.
 
     This class provides methods to retrieve job alerts to notify based on a given job by matching job names with regular expressions.
+    The alerts are kept compiled in an AlertMatcher, which is brought up to date with the alerts added to the repository since,
+    by this process or by another one sharing the repository, before matching: at most once every refresh_interval seconds,
+    and right after an alert is registered.
 
     Attributes:
         repo (JobAlertRepository): The JobAlertRepository instance used to retrieve job alerts.
+        matcher (AlertMatcher): The AlertMatcher indexing the compiled job alerts.
+        refresh_interval (float): The minimum time in seconds between two reads of the new alerts of the repository.
 
     """
 
-    def __init__(self, job_alert_repository: JobAlertRepository):
+    def __init__(self, job_alert_repository: JobAlertRepository, matcher: Optional[AlertMatcher] = None, refresh_interval: float = 0.0):
         """Initialize the JobberwockyJobAlert.
 
         Args:
             job_alert_repository (JobAlertRepository): The JobAlertRepository instance used to retrieve job alerts.
+            matcher (Optional[AlertMatcher]): The AlertMatcher used to index the job alerts, a new one by default.
+            refresh_interval (float): The minimum time in seconds between two reads of the new alerts of the repository.
 
         """
         self.repo = job_alert_repository
+        self.matcher = matcher if matcher is not None else AlertMatcher()
+        self.refresh_interval = refresh_interval
+        self._position = 0
+        self._refreshed_at = float("-inf")
+        self._load_lock = threading.Lock()
+
+    def _load(self, force: bool = False):
+        """Load the job alerts added to the repository since the last load into the matcher.
+
+        Args:
+            force (bool): Whether to read the repository even if refresh_interval has not elapsed.
+
+        """
+        if not force and time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+
+        with self._load_lock:
+            job_alerts, self._position = self.repo.get_job_alerts_after(self._position)
+            for job_alert in job_alerts:
+                self.matcher.add(job_alert)
+            self._refreshed_at = time.monotonic()
+
+    def add_job_alert(self, job_alert: JobAlert):
+        """Register a new job alert.
+
+        The job alert is stored in the repository, then compiled into the matcher with the alerts added before it.
+
+        Args:
+            job_alert (JobAlert): The JobAlert object to be registered.
+
+        Raises:
+            re.error: If the regex_name of the job alert is not a valid regular expression.
+
+        """
+        compile_alert(job_alert)
+        self.repo.add(job_alert)
+        self._load(force=True)
 
     def get_job_alerts_to_notify(self, job: Job) -> list[JobAlert]:
         """Retrieve job alerts to notify based on a given job.
 
-        This method retrieves all job alerts from the repository and filters them based on regular expressions matching the given job's name.
+        This method looks up the job alerts whose criteria are all satisfied by the given job in the matcher: its skills,
+        country and salary are matched through the predicate indexes, and the full regular expression of the name is only
+        run for the alerts whose other criteria are satisfied and whose literal text occurs in the name.
 
         Args:
             job (Job): The Job object for which to find matching job alerts.
@@ -60,10 +135,148 @@ class JobberwockyJobAlert:
             List[JobAlert]: A list of JobAlert objects representing all the job alerts to be notified for the given job.
 
         """
-        all_job_alert = self.repo.get_job_alerts()
-        to_notify = []
-        for job_alert in all_job_alert:
-            if re.match(job_alert.regex_name, job.name):
-                to_notify.append(job_alert)
+        self._load()
+        start = time.perf_counter()
+        to_notify = self.matcher.match_job(job)
+        ALERT_MATCH_DURATION.observe(time.perf_counter() - start)
+        ALERT_MATCHED_JOBS.inc()
+        ALERT_MATCHES.inc(len(to_notify))
 
         return to_notify
+
+    def get_jobs_to_notify(self, jobs: list[Job]) -> dict[str, list[Job]]:
+        """Match a batch of new jobs against the job alerts, grouping them per subscriber.
+
+        The whole batch is matched in a single pass over the matcher.
+
+        Args:
+            jobs (list[Job]): The new jobs.
+
+        Returns:
+            dict[str, list[Job]]: The jobs to notify to each subscriber email, in the order of the batch,
+                each job once per subscriber even if several of its job alerts match it.
+
+        """
+        self._load()
+        start = time.perf_counter()
+        matches = self.matcher.match_jobs(jobs)
+        ALERT_MATCH_DURATION.observe(time.perf_counter() - start)
+        ALERT_MATCHED_JOBS.inc(len(jobs))
+        ALERT_MATCHES.inc(sum(map(len, matches)))
+
+        to_notify: dict[str, list[Job]] = {}
+        for job, job_alerts in zip(jobs, matches):
+            for email in dict.fromkeys(job_alert.email for job_alert in job_alerts):
+                to_notify.setdefault(email, []).append(job)
+
+        return to_notify
+
+
+class AsyncJobAlertService(Protocol):
+    """A protocol defining the contract for a job alert service used from the event loop.
+
+    This protocol mirrors JobAlertService with coroutines.
+
+    """
+
+    async def get_job_alerts_to_notify(self, job: Job) -> list[JobAlert]:
+        """Retrieve job alerts to notify based on a given job.
+
+        Args:
+            job (Job): The Job object for which to find matching job alerts.
+
+        Returns:
+            List[JobAlert]: A list of JobAlert objects representing all the job alerts to be notified for the given job.
+
+        """
+        ...
+
+    async def get_jobs_to_notify(self, jobs: list[Job]) -> dict[str, list[Job]]:
+        """Match a batch of new jobs against the job alerts, grouping them per subscriber.
+
+        Args:
+            jobs (list[Job]): The new jobs.
+
+        Returns:
+            dict[str, list[Job]]: The jobs to notify to each subscriber email, in the order of the batch.
+
+        """
+        ...
+
+    async def add_job_alert(self, job_alert: JobAlert):
+        """Register a new job alert.
+
+        Args:
+            job_alert (JobAlert): The JobAlert object to be registered.
+
+        """
+        ...
+
+
+class AsyncJobAlertAdapter:
+    """An AsyncJobAlertService running the methods of a JobAlertService.
+
+    Matching runs against the alerts compiled in memory, so it runs on the event loop. With offload, for alerts
+    stored on disk or in a database, every method runs in a worker thread instead, as the first call loads the alerts
+    and add_job_alert writes them.
+
+    Attributes:
+        service (JobAlertService): The wrapped service.
+        offload (bool): Whether the methods run in a worker thread rather than on the event loop.
+
+    """
+
+    __slots__ = ("service", "offload")
+
+    def __init__(self, service: JobAlertService, offload: bool = False):
+        """Initialize the AsyncJobAlertAdapter.
+
+        Args:
+            service (JobAlertService): The service to wrap.
+            offload (bool): Whether the methods run in a worker thread rather than on the event loop.
+
+        """
+        self.service = service
+        self.offload = offload
+
+    async def get_job_alerts_to_notify(self, job: Job) -> list[JobAlert]:
+        """Retrieve job alerts to notify based on a given job.
+
+        Args:
+            job (Job): The Job object for which to find matching job alerts.
+
+        Returns:
+            List[JobAlert]: A list of JobAlert objects representing all the job alerts to be notified for the given job.
+
+        """
+        if self.offload:
+            return await asyncio.to_thread(self.service.get_job_alerts_to_notify, job)
+
+        return self.service.get_job_alerts_to_notify(job)
+
+    async def get_jobs_to_notify(self, jobs: list[Job]) -> dict[str, list[Job]]:
+        """Match a batch of new jobs against the job alerts, grouping them per subscriber.
+
+        Args:
+            jobs (list[Job]): The new jobs.
+
+        Returns:
+            dict[str, list[Job]]: The jobs to notify to each subscriber email, in the order of the batch.
+
+        """
+        if self.offload:
+            return await asyncio.to_thread(self.service.get_jobs_to_notify, jobs)
+
+        return self.service.get_jobs_to_notify(jobs)
+
+    async def add_job_alert(self, job_alert: JobAlert):
+        """Register a new job alert.
+
+        Args:
+            job_alert (JobAlert): The JobAlert object to be registered.
+
+        """
+        if self.offload:
+            await asyncio.to_thread(self.service.add_job_alert, job_alert)
+        else:
+            self.service.add_job_alert(job_alert)
@@ -1,19 +1,39 @@
-from typing import List, Protocol
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import AsyncIterator, List, Optional, Protocol
 
 from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.services.job_merge import JobMerger, job_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# The number of jobs read at once from the iter_jobs of a lazy service, in a worker thread
+LAZY_CHUNK_SIZE = 500
+# The number of arrivals of the other services buffered while stream_jobs is not consuming them
+ARRIVALS_QUEUE_SIZE = 1000
 
 
 class JobFinderService(Protocol):
     """A protocol defining the contract for a job finder service.
 
     This protocol outlines the methods that a class should implement to function as a job finder service.
+    The get_jobs method may be a coroutine function or a plain blocking function.
 
     """
 
-    def get_jobs(self) -> [Job]:
+    def get_jobs(self, job_filters: Optional[JobFilters] = None) -> [Job]:
         """Retrieve jobs from the job finder service.
 
-        This method should be implemented to fetch jobs from the job finder service and return them as a list of Job objects.
+        This method should be implemented to fetch the jobs satisfying the filters from the job finder service and return them
+        as a list of Job objects. The filters should be applied by the service itself, as close to its data as possible.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
 
         Returns:
             List[Job]: A list of Job objects representing the jobs found by the job finder service.
@@ -22,40 +42,285 @@ class JobFinderService(Protocol):
         ...
 
 
+@dataclass
+class SourceReport:
+    """The outcome of querying one JobFinder service.
+
+    Attributes:
+        name (str): The name of the service.
+        status (str): "ok" if the service answered in time, "timeout" if it missed its deadline, "error" if it failed.
+        jobs (int): The number of jobs the service answered with.
+        elapsed (float): The time in seconds spent waiting for the service.
+        duplicates (int): The number of jobs of the service removed as duplicates by the merge stage.
+
+    """
+
+    name: str
+    status: str
+    jobs: int = 0
+    elapsed: float = 0.0
+    duplicates: int = 0
+
+
+@dataclass
+class AggregatedJobs:
+    """The jobs aggregated from all JobFinder services.
+
+    Attributes:
+        jobs (list): The aggregated jobs, in the order of the services.
+        sources (list[SourceReport]): The outcome of querying each service.
+
+    """
+
+    jobs: list = field(default_factory=list)
+    sources: list[SourceReport] = field(default_factory=list)
+
+    @property
+    def contributors(self) -> list[str]:
+        """list[str]: The names of the services that answered in time."""
+        return [source.name for source in self.sources if source.status == "ok"]
+
+    @property
+    def duplicates(self) -> int:
+        """int: The number of jobs removed as duplicates by the merge stage."""
+        return sum(source.duplicates for source in self.sources)
+
+
 class JobFinderAggregator:
     """A class to aggregate job data from multiple JobFinder services.
 
     This class takes a list of JobFinder services and aggregates job data from all of them.
+    The services are queried concurrently, each one with its own deadline, so the aggregation takes
+    as long as the slowest service answering within its deadline. The jobs of the services that fail
+    or miss their deadline are left out of the result. With a merger, the jobs posted by several services
+    are only kept once.
 
     Attributes:
         job_finder_services (List[JobFinderService]): A list of JobFinder services to be aggregated.
+        timeout (Optional[float]): The default deadline in seconds of each service, None for no deadline.
+        timeouts (dict[str, float]): Deadlines in seconds overriding the default one, by service name.
+        merger (Optional[JobMerger]): The merge stage removing the duplicated jobs, None to keep every job.
 
     """
 
-    def __init__(self, job_finder_services: List[JobFinderService]):
+    def __init__(
+        self,
+        job_finder_services: List[JobFinderService],
+        timeout: Optional[float] = None,
+        timeouts: Optional[dict[str, float]] = None,
+        merger: Optional[JobMerger] = None,
+    ):
         """Initialize the JobFinderAgreggator.
 
         Args:
             job_finder_services (List[JobFinderService]): A list of JobFinder services to be aggregated.
+            timeout (Optional[float]): The default deadline in seconds of each service, None for no deadline.
+            timeouts (Optional[dict[str, float]]): Deadlines in seconds overriding the default one, by service name.
+            merger (Optional[JobMerger]): The merge stage removing the duplicated jobs, None to keep every job.
 
         """
         self.job_finder_services = job_finder_services
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.merger = merger
 
-    def get_jobs(self):
-        """Aggregate job data from all JobFinder services.
-
-        This method calls the get_jobs() method on each JobFinder service and aggregates all the job data into a single list.
+    def source_names(self) -> list[str]:
+        """Name the JobFinder services after their source_name attribute or their class, numbering repeated names.
 
         Returns:
-            List[Job]: A list of Job objects representing all the aggregated jobs.
+            list[str]: The name of each service, in order.
 
         """
-        jobs = []
+        names = []
         for service in self.job_finder_services:
+            name = getattr(service, "source_name", None)
+            if not isinstance(name, str):
+                name = type(service).__name__
+            if name in names:
+                name = f"{name}#{sum(1 for other in names if other.split('#')[0] == name) + 1}"
+            names.append(name)
+
+        return names
+
+    async def _query(self, name: str, service: JobFinderService, job_filters: Optional[JobFilters]) -> tuple[list, SourceReport]:
+        """Query one JobFinder service within its deadline.
+
+        Blocking services are run in a worker thread.
+
+        Args:
+            name (str): The name of the service.
+            service (JobFinderService): The service to query.
+            job_filters (Optional[JobFilters]): The filters pushed down to the service.
+
+        Returns:
+            tuple[list, SourceReport]: The jobs of the service and the outcome of the query.
+
+        """
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(service.get_jobs):
+                call = service.get_jobs(job_filters)
+            else:
+                call = asyncio.to_thread(service.get_jobs, job_filters)
+            service_jobs = await asyncio.wait_for(call, self.timeouts.get(name, self.timeout))
+        except asyncio.TimeoutError:
+            return [], SourceReport(name=name, status="timeout", elapsed=time.perf_counter() - start)
+        except Exception:
+            return [], SourceReport(name=name, status="error", elapsed=time.perf_counter() - start)
+
+        service_jobs = list(service_jobs)
+        return service_jobs, SourceReport(name=name, status="ok", jobs=len(service_jobs), elapsed=time.perf_counter() - start)
+
+    async def _iterate(self, name: str, service: JobFinderService, job_filters: Optional[JobFilters]) -> AsyncIterator[list]:
+        """Iterate over the iter_jobs of a lazy service in chunks read in a worker thread, each within the deadline of the service.
+
+        The deadline bounds the read of each chunk, not the whole iteration, so the time the consumer spends on the
+        jobs already yielded does not count against it. A chunk that fails or misses the deadline ends the iteration,
+        which is logged with the number of jobs yielded before.
+
+        Args:
+            name (str): The name of the service.
+            service (JobFinderService): The service providing iter_jobs.
+            job_filters (Optional[JobFilters]): The filters pushed down to the service.
+
+        Yields:
+            list: The jobs of the service, LAZY_CHUNK_SIZE at a time, until it is exhausted, fails or misses its deadline.
+
+        """
+        timeout = self.timeouts.get(name, self.timeout)
+        jobs = service.iter_jobs(job_filters)
+        yielded = 0
+        while True:
             try:
-                service_jobs = service.get_jobs()
-                jobs.extend(service_jobs)
+                chunk = await asyncio.wait_for(asyncio.to_thread(lambda: list(islice(jobs, LAZY_CHUNK_SIZE))), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Reading the jobs of %s timed out after %d jobs, its remaining jobs are skipped", name, yielded)
+                return
             except Exception:
-                pass
+                logger.exception("Reading the jobs of %s failed after %d jobs, its remaining jobs are skipped", name, yielded)
+                return
+            if not chunk:
+                return
+            yielded += len(chunk)
+            yield chunk
+
+    async def _forward(self, name: str, service: JobFinderService, job_filters: Optional[JobFilters], arrivals: asyncio.Queue):
+        """Query one JobFinder service within its deadline, putting its jobs in a queue as they arrive.
+
+        The jobs of a service providing a stream_jobs async generator are put one by one, those of the other services
+        all at once. The queue is bounded, so a stream waits for room while the consumer is busy, and the time spent
+        waiting does not count against the deadline of the service. A None marks the end of the jobs of the service,
+        whether it answered, failed or missed its deadline.
+
+        Args:
+            name (str): The name of the service.
+            service (JobFinderService): The service to query.
+            job_filters (Optional[JobFilters]): The filters pushed down to the service.
+            arrivals (asyncio.Queue): The queue receiving lists of jobs, then None.
+
+        """
+        try:
+            if inspect.isasyncgenfunction(getattr(service, "stream_jobs", None)):
+                loop = asyncio.get_running_loop()
+                async with asyncio.timeout(self.timeouts.get(name, self.timeout)) as deadline:
+                    async for job in service.stream_jobs(job_filters):
+                        if not arrivals.full():
+                            arrivals.put_nowait([job])
+                            continue
+                        # The deadline is suspended while waiting for room, and resumed with the time that was left
+                        when = deadline.when()
+                        left = None if when is None else when - loop.time()
+                        deadline.reschedule(None)
+                        await arrivals.put([job])
+                        deadline.reschedule(None if left is None else loop.time() + left)
+            else:
+                service_jobs, _ = await self._query(name, service, job_filters)
+                await arrivals.put(service_jobs)
+        except Exception:
+            pass
+        await arrivals.put(None)
+
+    async def get_jobs(self, job_filters: Optional[JobFilters] = None) -> AggregatedJobs:
+        """Aggregate job data from all JobFinder services.
+
+        This method calls the get_jobs() method on every JobFinder service concurrently, pushing the filters down to them,
+        and aggregates the job data of the services answering within their deadline into a single list.
+        With a merger, the duplicated jobs are removed and counted in the report of their service.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Returns:
+            AggregatedJobs: The aggregated jobs and the outcome of querying each service.
+
+        """
+        results = await asyncio.gather(*(self._query(name, service, job_filters) for name, service in zip(self.source_names(), self.job_finder_services)))
+
+        aggregated = AggregatedJobs(sources=[report for _, report in results])
+        if self.merger is None:
+            for service_jobs, _ in results:
+                aggregated.jobs.extend(service_jobs)
+            return aggregated
+
+        aggregated.jobs, duplicates = self.merger.merge([(report.name, service_jobs) for service_jobs, report in results])
+        for report in aggregated.sources:
+            report.duplicates = duplicates[report.name]
+
+        return aggregated
+
+    async def stream_jobs(self, job_filters: Optional[JobFilters] = None) -> AsyncIterator:
+        """Aggregate job data from all JobFinder services lazily.
+
+        The services are queried concurrently as in get_jobs. The jobs of the services providing an iter_jobs method,
+        like the job repository, are iterated lazily first, LAZY_CHUNK_SIZE jobs at a time in a worker thread so the
+        event loop is not blocked by their scans, each chunk within the deadline of the service, then the jobs of the other services are yielded as they
+        arrive: one by one for the services providing a stream_jobs async generator, like the external source, whose
+        response is parsed as it is received, and all at once for the others, as each of them answers. The services that
+        fail or miss their deadline are skipped, keeping the jobs a streaming service yielded before. With a merger, the
+        first posting of a duplicated job is kept, whatever the conflict resolution, as the jobs are yielded before the
+        next ones are known.
+
+        Args:
+            job_filters (Optional[JobFilters]): An optional object representing filters the jobs must satisfy.
+
+        Yields:
+            Job: The aggregated jobs.
+
+        """
+        lazy_services = []
+        pending = []
+        arrivals: asyncio.Queue = asyncio.Queue(ARRIVALS_QUEUE_SIZE)
+        for name, service in zip(self.source_names(), self.job_finder_services):
+            if callable(getattr(type(service), "iter_jobs", None)):
+                lazy_services.append((name, service))
+            else:
+                pending.append(asyncio.ensure_future(self._forward(name, service, job_filters, arrivals)))
+
+        seen = set()
+
+        def unseen(jobs):
+            if self.merger is None:
+                yield from jobs
+                return
+            for job in jobs:
+                fingerprint = job_fingerprint(job)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    yield job
 
-        return jobs
+        try:
+            for name, service in lazy_services:
+                async for service_jobs in self._iterate(name, service, job_filters):
+                    for job in unseen(service_jobs):
+                        yield job
+            remaining = len(pending)
+            while remaining:
+                service_jobs = await arrivals.get()
+                if service_jobs is None:
+                    remaining -= 1
+                    continue
+                for job in unseen(service_jobs):
+                    yield job
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable
+
+from pydantic import ValidationError
+
+from app.domain.job import Job
+from app.metrics import NOTIFICATIONS_DROPPED
+from app.repository.async_repository import AsyncJobRepository
+from app.schemas import JobIn
+from app.services.job_alert import AsyncJobAlertService
+from app.services.notification_dispatcher import NotificationQueueFull
+from app.services.notify_service import AsyncNotifier
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ItemStatus:
+    """The outcome of ingesting one item of a batch.
+
+    Attributes:
+        index (int): The position of the item in the batch.
+        status (str): "created" if the job was added, "invalid" if the item was rejected.
+        errors (list[str]): The validation errors of a rejected item.
+
+    """
+
+    index: int
+    status: str
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class IngestionReport:
+    """The outcome of ingesting a batch of jobs.
+
+    Attributes:
+        items (list[ItemStatus]): The outcome of each item, in order.
+        created (int): The number of jobs added.
+        rejected (int): The number of items rejected.
+        subscribers (int): The number of subscribers notified.
+        notifications (int): The number of jobs notified, over all the subscribers.
+        dropped_notifications (int): The number of job notifications dropped because the notification queue was full.
+        elapsed (float): The time in seconds spent ingesting the batch.
+
+    """
+
+    items: list[ItemStatus] = field(default_factory=list)
+    created: int = 0
+    rejected: int = 0
+    subscribers: int = 0
+    notifications: int = 0
+    dropped_notifications: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def jobs_per_second(self) -> float:
+        """float: The number of jobs added per second."""
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+
+def validate_job(item: Any) -> Job:
+    """Validate one item of a batch as a JobIn.
+
+    Args:
+        item (Any): A decoded JSON value, or the raw JSON text of the item.
+
+    Returns:
+        Job: The job described by the item.
+
+    Raises:
+        ValidationError: If the item is not valid JSON or not a valid JobIn.
+
+    """
+    if isinstance(item, (str, bytes)):
+        job_in = JobIn.model_validate_json(item)
+    else:
+        job_in = JobIn.model_validate(item)
+
+    return Job(name=job_in.name, country=job_in.country, salary=job_in.salary, skills=job_in.skills)
+
+
+def validate_chunk(chunk: list[Any], first_index: int) -> tuple[list[ItemStatus], list[Job]]:
+    """Validate a chunk of the items of a batch.
+
+    Args:
+        chunk (list[Any]): The items of the chunk, decoded JSON values or raw JSON texts.
+        first_index (int): The position of the first item of the chunk in the batch.
+
+    Returns:
+        tuple[list[ItemStatus], list[Job]]: The outcome of each item, in order, and the jobs of the valid items.
+
+    """
+    statuses = []
+    jobs = []
+    for index, item in enumerate(chunk, first_index):
+        try:
+            jobs.append(validate_job(item))
+        except ValidationError as error:
+            messages = [f"{'.'.join(str(part) for part in detail['loc']) or 'job'}: {detail['msg']}" for detail in error.errors()]
+            statuses.append(ItemStatus(index=index, status="invalid", errors=messages))
+        else:
+            statuses.append(ItemStatus(index=index, status="created"))
+
+    return statuses, jobs
+
+
+async def ingest_jobs(
+    batches: AsyncIterable[list[Any]],
+    job_repository: AsyncJobRepository,
+    job_alert_service: AsyncJobAlertService,
+    notifier: AsyncNotifier,
+    chunk_size: int = 1000,
+) -> IngestionReport:
+    """Validate, store and notify a batch of jobs, as its items are received.
+
+    The items are processed chunk_size at a time, as soon as enough of them are received: the chunk is validated in
+    a worker thread, then its valid jobs are added to the repository with a single add_many call and matched against
+    the job alerts in one pass. The notifications are grouped per subscriber over the whole batch, so each subscriber
+    gets a single notify_many call. Invalid items are reported and skipped.
+    The jobs are stored before their notifications are enqueued, so the notifications of a subscriber that do not
+    fit in a full notification queue are dropped, logged and counted, and the other subscribers are still notified.
+
+    If the body turns out to be malformed once jobs were received, the jobs before the malformed part are kept and
+    the malformed part is reported as a last invalid item.
+
+    Args:
+        batches (AsyncIterable[list[Any]]): The items of the batch, decoded JSON values or raw JSON texts, in batches
+            as they are parsed from the body.
+        job_repository (AsyncJobRepository): The AsyncJobRepository instance used to store the jobs.
+        job_alert_service (AsyncJobAlertService): The AsyncJobAlertService instance used to find the subscribers to notify.
+        notifier (AsyncNotifier): The AsyncNotifier instance used to notify the subscribers.
+        chunk_size (int): The number of items validated and stored at once.
+
+    Returns:
+        IngestionReport: The outcome of each item and the throughput of the ingestion.
+
+    Raises:
+        ValueError: If the body is malformed before its first item.
+
+    """
+    start = time.perf_counter()
+    report = IngestionReport()
+    to_notify: dict[str, list[Job]] = {}
+    received: list[Any] = []
+
+    async def ingest_chunk(chunk: list[Any]):
+        statuses, jobs = await asyncio.to_thread(validate_chunk, chunk, len(report.items))
+        report.items.extend(statuses)
+        report.rejected += len(chunk) - len(jobs)
+        if jobs:
+            await job_repository.add_many(jobs)
+            report.created += len(jobs)
+            for email, email_jobs in (await job_alert_service.get_jobs_to_notify(jobs)).items():
+                to_notify.setdefault(email, []).extend(email_jobs)
+
+    malformed = None
+    iterator = aiter(batches)
+    while True:
+        try:
+            batch = await anext(iterator)
+        except StopAsyncIteration:
+            break
+        except ValueError as error:
+            if not report.items and not received:
+                raise
+            malformed = error
+            break
+        received.extend(batch)
+        while len(received) >= chunk_size:
+            chunk, received = received[:chunk_size], received[chunk_size:]
+            await ingest_chunk(chunk)
+    if received:
+        await ingest_chunk(received)
+    if malformed is not None:
+        report.items.append(ItemStatus(index=len(report.items), status="invalid", errors=[f"body: {malformed}"]))
+        report.rejected += 1
+
+    report.subscribers = len(to_notify)
+    for email, email_jobs in to_notify.items():
+        try:
+            await notifier.notify_many(email, email_jobs)
+        except NotificationQueueFull:
+            report.dropped_notifications += len(email_jobs)
+        else:
+            report.notifications += len(email_jobs)
+    if report.dropped_notifications:
+        logger.warning("Dropped %d notifications of %d stored jobs, the notification queue is full", report.dropped_notifications, report.created)
+        NOTIFICATIONS_DROPPED.inc(report.dropped_notifications)
+    report.elapsed = time.perf_counter() - start
+
+    return report
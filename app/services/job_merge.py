@@ -0,0 +1,119 @@
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Literal, Optional
+
+ConflictResolution = Literal["priority", "first", "last"]
+
+
+def job_fingerprint(job) -> tuple:
+    """Build the normalized fingerprint of a job, equal for postings of the same job.
+
+    The name and country are compared case-insensitively with their whitespace collapsed,
+    the skills regardless of their case, order and repetitions.
+
+    Args:
+        job: The job, a dataclass or a dictionary with the fields of a Job.
+
+    Returns:
+        tuple: A hashable fingerprint.
+
+    """
+    if isinstance(job, Mapping):
+        name, country, salary, skills = job["name"], job["country"], job["salary"], job["skills"]
+    else:
+        name, country, salary, skills = job.name, job.country, job.salary, job.skills
+
+    return (
+        " ".join(name.casefold().split()),
+        " ".join(country.casefold().split()),
+        salary,
+        frozenset(skill.strip().casefold() for skill in skills),
+    )
+
+
+def fingerprint_digest(job) -> str:
+    """Digest the fingerprint of a job into a short string, the same in every process.
+
+    Args:
+        job: The job, a dataclass or a dictionary with the fields of a Job.
+
+    Returns:
+        str: The hexadecimal BLAKE2b digest of the fingerprint of the job.
+
+    """
+    name, country, salary, skills = job_fingerprint(job)
+    content = json.dumps([name, country, salary, sorted(skills)], separators=(",", ":"))
+
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+class JobMerger:
+    """A merge stage removing the duplicated jobs of several sources in a single pass.
+
+    Each job is looked up by fingerprint in a hash table of the jobs kept so far, so merging takes linear time.
+    When a job is duplicated, one of the postings is kept at the position of the first one, depending on conflict:
+    "priority" keeps the posting of the source coming first in priority, then the first one; "first" keeps the
+    first posting and "last" the last one, in the order of the sources.
+
+    Attributes:
+        conflict (str): The conflict resolution, "priority", "first" or "last".
+        priority (list[str]): The names of the sources by decreasing priority, the sources left out come after
+            them in their order.
+
+    """
+
+    def __init__(self, conflict: ConflictResolution = "priority", priority: Optional[list[str]] = None):
+        """Initialize the JobMerger.
+
+        Args:
+            conflict (str): The conflict resolution, "priority", "first" or "last".
+            priority (Optional[list[str]]): The names of the sources by decreasing priority, the order of the sources by default.
+
+        Raises:
+            ValueError: If the conflict resolution is unknown.
+
+        """
+        if conflict not in ("priority", "first", "last"):
+            raise ValueError(f"Unknown conflict resolution: {conflict}")
+
+        self.conflict = conflict
+        self.priority = priority or []
+
+    def merge(self, results: list[tuple[str, list]]) -> tuple[list, dict[str, int]]:
+        """Merge the jobs of several sources, removing the duplicates.
+
+        Args:
+            results (list[tuple[str, list]]): The name and the jobs of each source.
+
+        Returns:
+            tuple[list, dict[str, int]]: The jobs without duplicates, and the number of postings of each source
+                removed as duplicates.
+
+        """
+        ranks = {name: rank for rank, name in enumerate(self.priority)}
+        jobs: list = []
+        owners: list[tuple[int, str]] = []
+        kept: dict[tuple, int] = {}
+        duplicates = {name: 0 for name, _ in results}
+
+        for order, (name, source_jobs) in enumerate(results):
+            rank = ranks.get(name, len(ranks) + order)
+            for job in source_jobs:
+                fingerprint = job_fingerprint(job)
+                index = kept.get(fingerprint)
+                if index is None:
+                    kept[fingerprint] = len(jobs)
+                    jobs.append(job)
+                    owners.append((rank, name))
+                    continue
+
+                kept_rank, kept_name = owners[index]
+                if self.conflict == "last" or (self.conflict == "priority" and rank < kept_rank):
+                    jobs[index] = job
+                    owners[index] = (rank, name)
+                    duplicates[kept_name] += 1
+                else:
+                    duplicates[name] += 1
+
+        return jobs, duplicates
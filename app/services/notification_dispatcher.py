@@ -0,0 +1,256 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.domain.job import Job
+from app.services.notify_service import NotificationQueueFull, Notifier
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class DispatcherStats:
+    """Counters of the NotificationDispatcher.
+
+    Attributes:
+        enqueued (int): The number of job notifications accepted in the queue.
+        delivered (int): The number of job notifications delivered to the sink.
+        retried (int): The number of failed deliveries that were retried.
+        failed (int): The number of job notifications dropped after exhausting the retries.
+        batches (int): The number of calls made to the sink.
+
+    """
+
+    enqueued: int = 0
+    delivered: int = 0
+    retried: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class NotificationDispatcher:
+    """A notifier delivering notifications asynchronously through a bounded queue.
+
+    Notifications are put in a bounded in-process queue and delivered to the sink by worker threads,
+    so the caller returns as soon as the notification is enqueued. Each worker takes up to batch_size
+    notifications at a time and delivers them grouped per email with a single notify_many call,
+    retrying failed deliveries with an exponential backoff. When the queue is full the caller is
+    blocked for up to enqueue_timeout seconds before NotificationQueueFull is raised, while try_notify_many
+    returns at once.
+
+    The NotificationDispatcher implements the Notifier protocol, so it can be used wherever a
+    PrintEmailNotifier is expected.
+
+    Attributes:
+        sink (Notifier): The notifier the notifications are delivered to.
+        stats (DispatcherStats): The counters of the dispatcher.
+
+    """
+
+    def __init__(
+        self,
+        sink: Notifier,
+        max_queue_size: int = 10000,
+        workers: int = 2,
+        batch_size: int = 100,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+        enqueue_timeout: float = 5.0,
+    ):
+        """Initialize the NotificationDispatcher.
+
+        Args:
+            sink (Notifier): The notifier the notifications are delivered to.
+            max_queue_size (int): The maximum number of notifications waiting in the queue.
+            workers (int): The number of worker threads.
+            batch_size (int): The maximum number of notifications taken from the queue at once by a worker.
+            max_retries (int): The number of times a failed delivery is retried before it is dropped.
+            retry_backoff (float): The delay in seconds before the first retry, doubled on each retry.
+            enqueue_timeout (float): The maximum time in seconds a caller waits for room in a full queue.
+
+        """
+        self.sink = sink
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.enqueue_timeout = enqueue_timeout
+        self.stats = DispatcherStats()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """int: The number of notifications enqueued and not yet delivered or dropped."""
+        return self._pending
+
+    def start(self):
+        """Start the worker threads, if they are not running yet."""
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"notification-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def notify(self, email: str, new_job: Job):
+        """Enqueue a notification about a new job.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_job (Job): The new job.
+
+        Raises:
+            NotificationQueueFull: If the queue is still full after waiting enqueue_timeout seconds.
+
+        """
+        self.notify_many(email, [new_job])
+
+    def notify_many(self, email: str, new_jobs: list[Job]):
+        """Enqueue a notification about several new jobs.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_jobs (list[Job]): The new jobs.
+
+        Raises:
+            NotificationQueueFull: If the queue is still full after waiting enqueue_timeout seconds.
+
+        """
+        if not self._enqueue(email, new_jobs, self.enqueue_timeout):
+            raise NotificationQueueFull()
+
+    def try_notify_many(self, email: str, new_jobs: list[Job]) -> bool:
+        """Enqueue a notification about several new jobs if the queue has room, without waiting.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_jobs (list[Job]): The new jobs.
+
+        Returns:
+            bool: True if the notification was enqueued, False if the queue is full.
+
+        """
+        return self._enqueue(email, new_jobs, None)
+
+    def _enqueue(self, email: str, new_jobs: list[Job], timeout: Optional[float]) -> bool:
+        """Enqueue a notification, waiting up to timeout seconds for room in the queue, or not at all with None."""
+        self.start()
+        with self._lock:
+            self._pending += 1
+        try:
+            self._queue.put((email, list(new_jobs)), block=timeout is not None, timeout=timeout)
+        except queue.Full:
+            self._done(1)
+            return False
+        with self._lock:
+            self.stats.enqueued += len(new_jobs)
+
+        return True
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every enqueued notification is delivered or dropped.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait, forever by default.
+
+        Returns:
+            bool: True if the queue was drained, False if the timeout expired first.
+
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Drain the queue and stop the worker threads.
+
+        Args:
+            timeout (Optional[float]): The maximum time in seconds to wait for the queue to drain, forever by default.
+
+        Returns:
+            bool: True if the queue was drained, False if the timeout expired first.
+
+        """
+        drained = self.drain(timeout)
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join(timeout)
+
+        return drained
+
+    def _done(self, count: int):
+        with self._idle:
+            self._pending -= count
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def _run(self):
+        """Take batches of notifications from the queue and deliver them until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            per_email: dict[str, list[Job]] = {}
+            for email, jobs in batch:
+                per_email.setdefault(email, []).extend(jobs)
+            for email, jobs in per_email.items():
+                self._deliver(email, jobs)
+
+            self._done(len(batch))
+            if stop:
+                return
+
+    def _deliver(self, email: str, jobs: list[Job]):
+        """Deliver the notifications of an email to the sink, retrying on failure.
+
+        Args:
+            email (str): The email of the subscriber.
+            jobs (list[Job]): The new jobs to notify.
+
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                if len(jobs) == 1:
+                    self.sink.notify(email, jobs[0])
+                else:
+                    self.sink.notify_many(email, jobs)
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.exception("Dropping %d notifications to %s", len(jobs), email)
+                    with self._lock:
+                        self.stats.failed += len(jobs)
+                    return
+                with self._lock:
+                    self.stats.retried += 1
+                time.sleep(self.retry_backoff * 2**attempt)
+            else:
+                with self._lock:
+                    self.stats.batches += 1
+                    self.stats.delivered += len(jobs)
+                return
@@ -1,6 +1,140 @@
+import asyncio
+from typing import Protocol
+
 from app.domain.job import Job
 
 
+class NotificationQueueFull(Exception):
+    """An exception raised when a notification can not be enqueued because the queue is full.
+
+    Inherits from:
+        Exception: The base class for all built-in exceptions.
+
+    """
+
+    pass
+
+
+class Notifier(Protocol):
+    """A protocol defining the contract for a notifier.
+
+    This protocol outlines the methods that a class should implement to notify subscribers about new jobs.
+
+    """
+
+    def notify(self, email: str, new_job: Job):
+        """Notify a subscriber about a new job.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_job (Job): The new job.
+
+        """
+        ...
+
+    def notify_many(self, email: str, new_jobs: list[Job]):
+        """Notify a subscriber about several new jobs at once.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_jobs (list[Job]): The new jobs.
+
+        """
+        ...
+
+
+class AsyncNotifier(Protocol):
+    """A protocol defining the contract for a notifier used from the event loop.
+
+    This protocol mirrors Notifier with coroutines.
+
+    """
+
+    async def notify(self, email: str, new_job: Job):
+        """Notify a subscriber about a new job.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_job (Job): The new job.
+
+        """
+        ...
+
+    async def notify_many(self, email: str, new_jobs: list[Job]):
+        """Notify a subscriber about several new jobs at once.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_jobs (list[Job]): The new jobs.
+
+        """
+        ...
+
+
+class AsyncNotifierAdapter:
+    """An AsyncNotifier calling a Notifier without blocking the event loop.
+
+    A notifier providing try_notify_many, like the NotificationDispatcher, is called on the event loop and never
+    waited for: a notification its queue has no room for is dropped at once with NotificationQueueFull, so a request
+    notifying many subscribers under backpressure is not held for the enqueue timeout of each of them. Any other
+    notifier is called in a worker thread.
+
+    Attributes:
+        notifier (Notifier): The wrapped notifier.
+
+    """
+
+    __slots__ = ("notifier",)
+
+    def __init__(self, notifier: Notifier):
+        """Initialize the AsyncNotifierAdapter.
+
+        Args:
+            notifier (Notifier): The notifier to wrap.
+
+        """
+        self.notifier = notifier
+
+    async def notify(self, email: str, new_job: Job):
+        """Notify a subscriber about a new job.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_job (Job): The new job.
+
+        Raises:
+            NotificationQueueFull: If the notifier has a queue and it is full.
+
+        """
+        if callable(getattr(type(self.notifier), "try_notify_many", None)):
+            if not self.notifier.try_notify_many(email, [new_job]):
+                raise NotificationQueueFull()
+            return
+
+        await asyncio.to_thread(self.notifier.notify, email, new_job)
+
+    async def notify_many(self, email: str, new_jobs: list[Job]):
+        """Notify a subscriber about several new jobs at once.
+
+        Args:
+            email (str): The email of the subscriber.
+            new_jobs (list[Job]): The new jobs.
+
+        Raises:
+            NotificationQueueFull: If the notifier has a queue and it is full.
+
+        """
+        if callable(getattr(type(self.notifier), "try_notify_many", None)):
+            if not self.notifier.try_notify_many(email, new_jobs):
+                raise NotificationQueueFull()
+            return
+
+        await asyncio.to_thread(self.notifier.notify_many, email, new_jobs)
+
+
 class PrintEmailNotifier:
     def notify(self, email: str, new_job: Job):
         print(f"Sending email to {email} with new job {new_job}")
+
+    def notify_many(self, email: str, new_jobs: list[Job]):
+        print(f"Sending email to {email} with {len(new_jobs)} new jobs {new_jobs}")
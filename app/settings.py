@@ -1,8 +1,53 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     endpoint_extra_source_service: str
+    storage_backend: Literal["columnar", "memory", "log", "sqlite", "shared"] = "columnar"
+    storage_path: str = "data"
+    storage_fsync_every: int = 100
+    storage_fsync_interval: float = 1.0
+    storage_compact_every: int = 100000
+    storage_offload: Optional[bool] = None
+    storage_poll_interval: float = 0.05
+    sqlite_pool_size: int = 8
+    sqlite_timeout: float = 5.0
+    listing_cache_size: int = 32
+    extra_source_max_connections: int = 20
+    extra_source_max_keepalive_connections: int = 10
+    extra_source_keepalive_expiry: float = 30.0
+    extra_source_timeout: float = 5.0
+    extra_source_cache_ttl: float = 60.0
+    extra_source_cache_stale_ttl: float = 300.0
+    extra_source_cache_size: int = 256
+    extra_source_breaker_failure_rate: float = 0.5
+    extra_source_breaker_window: float = 30.0
+    extra_source_breaker_minimum_calls: int = 10
+    extra_source_breaker_open_timeout: float = 30.0
+    extra_source_breaker_half_open_calls: int = 1
+    extra_source_hedge_percentile: Optional[float] = None
+    extra_source_hedge_min_samples: int = 20
+    extra_source_sync_interval: float = 0.0
+    aggregator_timeout: float = 2.0
+    aggregator_source_timeouts: dict[str, float] = {}
+    aggregator_dedup: bool = True
+    aggregator_conflict: Literal["priority", "first", "last"] = "priority"
+    aggregator_source_priority: list[str] = []
+    bulk_chunk_size: int = 1000
+    notification_queue_size: int = 10000
+    notification_workers: int = 2
+    notification_batch_size: int = 100
+    notification_max_retries: int = 3
+    notification_digest_size: int = 50
+    notification_digest_delay: float = 0.0
+    profiling_sample_rate: float = 0.0
+    profiling_header: Optional[str] = None
+    profiling_threshold: float = 0.5
+    profiling_mode: Literal["cprofile", "sample"] = "cprofile"
+    profiling_interval: float = 0.005
+    profiling_buffer_size: int = 50
 
 
 settings = Settings()
@@ -1,4 +1,17 @@
-from typing import Protocol
+import json
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Iterator, Optional, Protocol
+
+from app.database import SQLiteConnectionPool
+
+logger = logging.getLogger(__name__)
 
 
 class Storage(Protocol):
@@ -34,6 +47,14 @@ class Storage(Protocol):
         """
         ...
 
+    def close(self):
+        """Close the storage.
+
+        This method should release the resources of the storage, making its items durable if it persists them.
+
+        """
+        ...
+
 
 class InMemoryStorage:
     """An implementation of the Storage protocol using in-memory storage.
@@ -76,3 +97,565 @@ class InMemoryStorage:
 
         """
         return self.storage
+
+    def close(self):
+        """Close the in-memory storage.
+
+        Nothing has to be released, the items are kept.
+
+        """
+        pass
+
+
+class AppendOnlyLogStorage:
+    """An implementation of the Storage protocol persisting the items on disk.
+
+    Every item is appended as a line of JSON to a log file, which is fsynced in batches: after fsync_every
+    items or once fsync_interval seconds have passed since the last fsync, whichever comes first. Items added
+    since the last fsync may be lost if the machine crashes. Once the log holds compact_every items, the log is
+    rotated: a new, empty log is started and a background thread writes the items added before the rotation to
+    a new snapshot file, so the items keep being appended to the new log while the snapshot is written.
+
+    A snapshot is a single JSON array, so on startup the latest snapshot is read and decoded at once,
+    then only the logs written after it are replayed line by line.
+    A partially written last line, left by a crash, is discarded. The items are also kept in memory.
+
+    Each snapshot and the log started with it share a generation number. A snapshot holds every item of the
+    older generations, so a crash during a compaction leaves the previous snapshot followed by the logs of both
+    generations, which are replayed in order.
+
+    Attributes:
+        path (Path): The directory holding the snapshot and log files.
+        storage (list[dict]): The list of the items, kept in memory.
+
+    """
+
+    FILE_PATTERN = re.compile(r"^(snapshot|log)-(\d+)\.jsonl$")
+
+    def __init__(self, path: str, fsync_every: int = 100, fsync_interval: float = 1.0, compact_every: int = 100000):
+        """Initialize the AppendOnlyLogStorage, loading the items already persisted in the directory.
+
+        Args:
+            path (str): The directory holding the snapshot and log files, created if missing.
+            fsync_every (int): The maximum number of items added between two fsyncs of the log.
+            fsync_interval (float): The maximum time in seconds between two fsyncs of the log, checked when items are added.
+            compact_every (int): The number of items in the log triggering a compaction, 0 to never compact.
+
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self.storage = []
+
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction: Optional[threading.Thread] = None
+        self._generation = 0
+        self._log_items = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._load()
+        self._log = open(self._file("log", self._generation), "ab")
+
+    def _file(self, kind: str, generation: int) -> Path:
+        return self.path / f"{kind}-{generation:08d}.jsonl"
+
+    def _generations(self) -> dict[str, list[int]]:
+        generations: dict[str, list[int]] = {"snapshot": [], "log": []}
+        for file in self.path.iterdir():
+            match = self.FILE_PATTERN.match(file.name)
+            if match:
+                generations[match.group(1)].append(int(match.group(2)))
+
+        return generations
+
+    def _load(self):
+        """Load the latest snapshot and replay the logs written after it, then remove the files of older generations."""
+        generations = self._generations()
+        snapshot_generation = max(generations["snapshot"], default=0)
+        log_generations = sorted(generation for generation in generations["log"] if generation >= snapshot_generation)
+        self._generation = max(log_generations, default=snapshot_generation)
+
+        snapshot = self._file("snapshot", snapshot_generation)
+        if snapshot.exists() and snapshot.stat().st_size:
+            with open(snapshot, "rb") as file:
+                self.storage.extend(json.load(file))
+
+        for generation in log_generations:
+            log = self._file("log", generation)
+            valid_size = 0
+            with open(log, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        break
+                    self.storage.append(item)
+                    self._log_items += 1
+                    valid_size += len(line)
+            if valid_size < log.stat().st_size:
+                os.truncate(log, valid_size)
+
+        for kind, kind_generations in generations.items():
+            for generation in kind_generations:
+                if generation < snapshot_generation:
+                    self._file(kind, generation).unlink(missing_ok=True)
+        for temporary in self.path.glob("snapshot-*.tmp"):
+            temporary.unlink()
+
+    def add(self, item: dict):
+        """Add an item to the storage.
+
+        The item is appended to the log and to the in-memory list.
+
+        Args:
+            item (dict): A dictionary representing the item to be added to the storage.
+
+        """
+        line = (json.dumps(item, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            self._log.write(line)
+            self.storage.append(item)
+            self._log_items += 1
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self.sync()
+            if self.compact_every and self._log_items >= self.compact_every and self._compaction is None:
+                self._compaction = threading.Thread(target=self._compact_in_background, name="storage-compaction", daemon=True)
+                self._compaction.start()
+
+    def sync(self):
+        """Flush the log and fsync it to disk."""
+        with self._lock:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def compact(self):
+        """Write every item to a new snapshot, the new items being appended to a new log meanwhile.
+
+        The log is rotated under the lock, then the items added before the rotation are written to a temporary
+        file, fsynced and renamed, without holding the lock, before the files of the older generations are removed.
+
+        """
+        with self._compaction_lock:
+            with self._lock:
+                if self._log.closed:
+                    return
+                self.sync()
+                items = self.storage
+                count = len(items)
+                generation = self._generation + 1
+                self._log.close()
+                self._log = open(self._file("log", generation), "ab")
+                self._sync_directory()
+                self._generation = generation
+                self._log_items = 0
+
+            snapshot = self._file("snapshot", generation)
+            temporary = snapshot.with_suffix(".tmp")
+            with open(temporary, "wb") as file:
+                file.write(b"[")
+                for index in range(count):
+                    file.write((("," if index else "") + json.dumps(items[index], separators=(",", ":")) + "\n").encode())
+                file.write(b"]")
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, snapshot)
+            self._sync_directory()
+
+            for kind, kind_generations in self._generations().items():
+                for old_generation in kind_generations:
+                    if old_generation < generation:
+                        self._file(kind, old_generation).unlink(missing_ok=True)
+
+    def _compact_in_background(self):
+        """Compact the storage from the background thread started by add, logging the failures."""
+        try:
+            self.compact()
+        except Exception:
+            logger.exception("Compacting the storage in %s failed, the items stay in its logs", self.path)
+        finally:
+            with self._lock:
+                self._compaction = None
+
+    def _sync_directory(self):
+        directory = os.open(self.path, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def clean(self):
+        """Clean the storage.
+
+        This method will clear all items from the storage and remove its files.
+
+        """
+        with self._compaction_lock, self._lock:
+            self._log.close()
+            for file in self.path.iterdir():
+                if self.FILE_PATTERN.match(file.name):
+                    file.unlink()
+            self.storage = []
+            self._generation = 0
+            self._log_items = 0
+            self._log = open(self._file("log", self._generation), "ab")
+            self.sync()
+
+    def get_all(self) -> list[dict]:
+        """Retrieve all items from the storage.
+
+        Returns:
+            list[dict]: A list of dictionaries representing all the items in the storage.
+
+        """
+        return self.storage
+
+    def close(self):
+        """Wait for a running compaction, then fsync the pending items and close the log."""
+        with self._lock:
+            compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        with self._compaction_lock, self._lock:
+            if not self._log.closed:
+                self.sync()
+                self._log.close()
+
+
+class StringTable:
+    """A table interning strings as consecutive integer ids.
+
+    Attributes:
+        ids (dict[str, int]): The id of each string.
+        values (list[str]): The string of each id.
+
+    """
+
+    __slots__ = ("ids", "values")
+
+    def __init__(self):
+        """Initialize the StringTable."""
+        self.ids: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def intern(self, value: str) -> int:
+        """Retrieve the id of a string, assigning the next one if the string is new.
+
+        Args:
+            value (str): The string to intern.
+
+        Returns:
+            int: The id of the string.
+
+        """
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+
+        return string_id
+
+
+class JobRow(Mapping):
+    """A read-only view of a job stored in a ColumnarJobStorage, behaving as its dictionary.
+
+    The fields are read from the columns when accessed, so a view costs two slots whatever the job.
+
+    """
+
+    __slots__ = ("_storage", "_position")
+
+    FIELDS = ("name", "country", "salary", "skills")
+
+    def __init__(self, storage: "ColumnarJobStorage", position: int):
+        self._storage = storage
+        self._position = position
+
+    def __getitem__(self, key: str):
+        storage, position = self._storage, self._position
+        if key == "name":
+            return storage.names[position]
+        if key == "country":
+            return storage.countries.values[storage.country_ids[position]]
+        if key == "salary":
+            return storage.salaries[position]
+        if key == "skills":
+            skills = storage.skills.values
+            return [skills[skill_id] for skill_id in storage.skill_ids[storage.skill_offsets[position]:storage.skill_offsets[position + 1]]]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class JobRows(Sequence):
+    """A read-only sequence of the JobRow views of the jobs of a ColumnarJobStorage.
+
+    The length is fixed when the sequence is built, the jobs added afterwards are not part of it.
+
+    """
+
+    __slots__ = ("_storage", "_length")
+
+    def __init__(self, storage: "ColumnarJobStorage", length: int):
+        self._storage = storage
+        self._length = length
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [JobRow(self._storage, index) for index in range(*position.indices(self._length))]
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("job position out of range")
+        return JobRow(self._storage, position)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def fields(self, position: int) -> tuple:
+        """Read the fields of a job straight from the columns, without building its view.
+
+        Args:
+            position (int): The position of the job, assumed to be in range.
+
+        Returns:
+            tuple: The name, country, salary and skills of the job.
+
+        """
+        storage = self._storage
+        skills = storage.skills.values
+        return (
+            storage.names[position],
+            storage.countries.values[storage.country_ids[position]],
+            storage.salaries[position],
+            [skills[skill_id] for skill_id in storage.skill_ids[storage.skill_offsets[position]:storage.skill_offsets[position + 1]]],
+        )
+
+
+class ColumnarJobStorage:
+    """An implementation of the Storage protocol keeping jobs in memory, column by column.
+
+    Instead of a dictionary per job, each field is stored in a column: the names in a list, the countries as
+    ids interned in a StringTable, the salaries in a typed array, and the skills as interned ids in a single
+    array, the skills of the job at position p being skill_ids[skill_offsets[p]:skill_offsets[p + 1]].
+    get_all returns JobRow views built on demand instead of dictionaries.
+
+    Only the items with the fields of a Job (name, country, salary and skills) can be stored.
+
+    Attributes:
+        names (list[str]): The name of each job.
+        countries (StringTable): The interned countries.
+        country_ids (array): The country id of each job.
+        salaries (array): The salary of each job.
+        skills (StringTable): The interned skills.
+        skill_ids (array): The skill ids of every job, one after the other.
+        skill_offsets (array): The offset in skill_ids of the skills of each job, followed by the total number of skill ids.
+
+    """
+
+    def __init__(self):
+        """Initialize the ColumnarJobStorage."""
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.names: list[str] = []
+        self.countries = StringTable()
+        self.country_ids = array("I")
+        self.salaries = array("q")
+        self.skills = StringTable()
+        self.skill_ids = array("I")
+        self.skill_offsets = array("Q", [0])
+
+    def add(self, item: dict):
+        """Add a job to the columns.
+
+        Args:
+            item (dict): A dictionary representing the job, with its name, country, salary and skills.
+
+        """
+        with self._lock:
+            self.salaries.append(item["salary"])
+            self.country_ids.append(self.countries.intern(item["country"]))
+            self.skill_ids.extend(self.skills.intern(skill) for skill in item["skills"])
+            self.skill_offsets.append(len(self.skill_ids))
+            self.names.append(item["name"])
+
+    def clean(self):
+        """Clean the columnar storage.
+
+        This method will clear all the jobs from the columns.
+
+        """
+        with self._lock:
+            self._reset()
+
+    def get_all(self) -> Sequence[Mapping]:
+        """Retrieve all jobs from the storage.
+
+        Returns:
+            Sequence[Mapping]: A sequence of JobRow views, behaving as the dictionaries of the jobs in the storage.
+
+        """
+        return JobRows(self, len(self.names))
+
+    def close(self):
+        """Close the columnar storage.
+
+        There are no resources to release for the columnar storage, this method does nothing.
+
+        """
+        pass
+
+
+class SQLiteFeedStorage:
+    """An implementation of the Storage protocol sharing its items between processes through a SQLite change feed.
+
+    The items of every storage sharing the database are appended to a single feed table, each with an increasing
+    sequence number and the name of its stream. The database is the single writer: adding an item is a write
+    transaction, serialized with the writes of the other processes by the lock of the database. Each process keeps
+    a replica of its stream in memory, which get_all returns, and brings it up to date by reading the items of the
+    feed after the last one it has seen: before returning, at most once every poll_interval seconds, and right after
+    each of its own writes. The items are thus in the same order in every process, and an item added by a process
+    is visible to the other processes after at most poll_interval seconds.
+
+    Cleaning a stream deletes its items and increments its epoch, which makes every replica start over.
+
+    Attributes:
+        pool (SQLiteConnectionPool): The pool of connections to the database holding the feed.
+        stream (str): The name of the stream of the storage.
+        replica (Storage): The storage holding the items of the stream in memory.
+        poll_interval (float): The minimum time in seconds between two reads of the feed for get_all.
+
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS feed ("
+        " seq INTEGER PRIMARY KEY,"
+        " stream TEXT NOT NULL,"
+        " item TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS feed_stream ON feed(stream, seq)",
+        "CREATE TABLE IF NOT EXISTS feed_streams (stream TEXT PRIMARY KEY, epoch INTEGER NOT NULL)",
+    )
+
+    def __init__(self, pool: SQLiteConnectionPool, stream: str, replica: Optional[Storage] = None, poll_interval: float = 0.05):
+        """Initialize the SQLiteFeedStorage, creating the feed if it does not exist and loading the items of the stream.
+
+        Args:
+            pool (SQLiteConnectionPool): The pool of connections to the database holding the feed.
+            stream (str): The name of the stream of the storage.
+            replica (Optional[Storage]): The storage holding the items in memory, an InMemoryStorage by default.
+            poll_interval (float): The minimum time in seconds between two reads of the feed for get_all.
+
+        """
+        self.pool = pool
+        self.stream = stream
+        self.replica = replica if replica is not None else InMemoryStorage()
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._epoch: Optional[int] = None
+        self._polled_at = float("-inf")
+        with self.pool.transaction() as connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            connection.execute("INSERT OR IGNORE INTO feed_streams (stream, epoch) VALUES (?, 0)", (stream,))
+        self.poll()
+
+    def poll(self) -> int:
+        """Copy the items added to the stream since the last poll into the replica.
+
+        Returns:
+            int: The number of items copied.
+
+        """
+        with self._lock:
+            with self.pool.connection() as connection:
+                connection.execute("BEGIN")
+                try:
+                    (epoch,) = connection.execute("SELECT epoch FROM feed_streams WHERE stream = ?", (self.stream,)).fetchone()
+                    after = self._seq if epoch == self._epoch else 0
+                    rows = connection.execute(
+                        "SELECT seq, item FROM feed WHERE stream = ? AND seq > ? ORDER BY seq", (self.stream, after)
+                    ).fetchall()
+                finally:
+                    connection.execute("COMMIT")
+
+            if epoch != self._epoch:
+                self.replica.clean()
+                self._epoch = epoch
+                self._seq = 0
+            for _, item in rows:
+                self.replica.add(json.loads(item))
+            if rows:
+                self._seq = rows[-1][0]
+            self._polled_at = time.monotonic()
+
+        return len(rows)
+
+    def add(self, item: dict):
+        """Add an item to the stream.
+
+        Args:
+            item (dict): A dictionary representing the item to be added to the storage.
+
+        """
+        self.add_many([item])
+
+    def add_many(self, items: list[dict]):
+        """Add several items to the stream in a single transaction.
+
+        The replica is brought up to date right after, so it holds the items on return.
+
+        Args:
+            items (list[dict]): The dictionaries representing the items to be added, in order.
+
+        """
+        with self.pool.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO feed (stream, item) VALUES (?, ?)",
+                ((self.stream, json.dumps(item, separators=(",", ":"))) for item in items),
+            )
+        self.poll()
+
+    def clean(self):
+        """Clean the stream.
+
+        This method will delete the items of the stream from the feed, in every process.
+
+        """
+        with self.pool.transaction() as connection:
+            connection.execute("DELETE FROM feed WHERE stream = ?", (self.stream,))
+            connection.execute("UPDATE feed_streams SET epoch = epoch + 1 WHERE stream = ?", (self.stream,))
+        self.poll()
+
+    def get_all(self) -> Sequence[Mapping]:
+        """Retrieve all items from the storage, reading the items added by the other processes if poll_interval elapsed.
+
+        Returns:
+            Sequence[Mapping]: The items of the replica.
+
+        """
+        if time.monotonic() - self._polled_at >= self.poll_interval:
+            self.poll()
+
+        return self.replica.get_all()
+
+    def close(self):
+        """Close the replica. The pool is closed by its owner."""
+        self.replica.close()
@@ -0,0 +1,159 @@
+"""Benchmark of the job alert matching latency against the number of registered alerts.
+
+Compares the former per-alert re.match scan with AlertMatcher.match_job, the matching the job alert
+service runs, and measures JobberwockyJobAlert.get_job_alerts_to_notify, the AlertMatcher behind it.
+With --criteria, the alerts also select skills, countries and salary ranges, and testing every
+criterion of every alert is compared with the predicate indexes of AlertMatcher.match_job.
+
+Usage:
+    python -m benchmarks.bench_alert_matching --alerts 1000 10000 100000
+    python -m benchmarks.bench_alert_matching --criteria --alerts 1000 10000 100000
+"""
+import argparse
+import random
+import re
+import time
+
+from app.domain.job import Job
+from app.domain.job_alert import JobAlert
+from app.repository.alert_repository import InMemoryJobAlertRepository
+from app.services.alert_matcher import AlertMatcher
+from app.services.job_alert import JobberwockyJobAlert
+from app.storage import InMemoryStorage
+from benchmarks.common import COUNTRIES, NAME_LEVELS, NAME_ROLES, NAME_TITLES, SKILLS, print_table, random_job, random_job_name
+
+
+def random_alert(rng: random.Random, index: int) -> JobAlert:
+    """Build a random job alert, mixing anchored, unanchored and literal free patterns."""
+    kind = rng.random()
+    if kind < 0.6:
+        regex_name = f"^{rng.choice(NAME_LEVELS)} {rng.choice(NAME_ROLES)}"
+    elif kind < 0.95:
+        regex_name = f".*{rng.choice(NAME_ROLES)} {rng.choice(NAME_TITLES)}"
+    else:
+        regex_name = f"(?i).*{rng.choice(NAME_ROLES)}"
+
+    return JobAlert(email=f"user{index}@example.com", regex_name=regex_name)
+
+
+def random_criteria_alert(rng: random.Random, index: int) -> JobAlert:
+    """Build a random job alert on skills, countries and salary, half of them with a name pattern as well."""
+    salary_min = rng.randrange(10000, 100000, 5000)
+
+    return JobAlert(
+        email=f"user{index}@example.com",
+        regex_name=random_alert(rng, index).regex_name if rng.random() < 0.5 else "",
+        skills=rng.sample(SKILLS, rng.randint(1, 2)),
+        countries=rng.sample(COUNTRIES, rng.randint(1, 2)),
+        salary_min=salary_min,
+        salary_max=rng.choice([None, salary_min + 20000]),
+    )
+
+
+def scan(alerts: list[JobAlert], job: Job) -> list[JobAlert]:
+    return [
+        alert
+        for alert in alerts
+        if (not alert.countries or job.country in alert.countries)
+        and (alert.salary_min is None or job.salary >= alert.salary_min)
+        and (alert.salary_max is None or job.salary <= alert.salary_max)
+        and set(alert.skills) <= set(job.skills)
+        and re.match(alert.regex_name, job.name)
+    ]
+
+
+def run(alert_counts: list[int], jobs: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    new_jobs = [Job(name=random_job_name(rng), country="Argentina", salary=50000, skills=[]) for _ in range(jobs)]
+    rows = []
+    for count in alert_counts:
+        alerts = [random_alert(rng, index) for index in range(count)]
+
+        matcher = AlertMatcher()
+        start = time.perf_counter()
+        for alert in alerts:
+            matcher.add(alert)
+        matcher.match_job(new_jobs[0])
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matched = sum(len(matcher.match_job(job)) for job in new_jobs)
+        indexed = (time.perf_counter() - start) / jobs
+
+        start = time.perf_counter()
+        scanned = sum(len(scan(alerts, job)) for job in new_jobs)
+        full_scan = (time.perf_counter() - start) / jobs
+
+        service = JobberwockyJobAlert(InMemoryJobAlertRepository(InMemoryStorage()))
+        for alert in alerts:
+            service.add_job_alert(alert)
+        start = time.perf_counter()
+        notified = sum(len(service.get_job_alerts_to_notify(job)) for job in new_jobs)
+        service_latency = (time.perf_counter() - start) / jobs
+
+        assert matched == scanned == notified
+        rows.append(
+            {
+                "alerts": count,
+                "build_s": build,
+                "scan_ms_per_job": full_scan * 1000,
+                "indexed_ms_per_job": indexed * 1000,
+                "service_ms_per_job": service_latency * 1000,
+                "matches_per_job": matched / jobs,
+                "speedup": full_scan / indexed,
+            }
+        )
+
+    return rows
+
+
+def run_criteria(alert_counts: list[int], jobs: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    new_jobs = [Job(**random_job(rng)) for _ in range(jobs)]
+    rows = []
+    for count in alert_counts:
+        alerts = [random_criteria_alert(rng, index) for index in range(count)]
+
+        matcher = AlertMatcher()
+        start = time.perf_counter()
+        for alert in alerts:
+            matcher.add(alert)
+        matcher.match_job(new_jobs[0])
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matched = sum(len(matcher.match_job(job)) for job in new_jobs)
+        indexed = (time.perf_counter() - start) / jobs
+
+        start = time.perf_counter()
+        scanned = sum(len(scan(alerts, job)) for job in new_jobs)
+        full_scan = (time.perf_counter() - start) / jobs
+
+        assert matched == scanned
+        rows.append(
+            {
+                "alerts": count,
+                "build_s": build,
+                "scan_ms_per_job": full_scan * 1000,
+                "indexed_ms_per_job": indexed * 1000,
+                "matches_per_job": matched / jobs,
+                "speedup": full_scan / indexed,
+            }
+        )
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--criteria", action="store_true")
+    args = parser.parse_args()
+
+    print_table((run_criteria if args.criteria else run)(args.alerts, args.jobs, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark of the async route handlers against the former threadpool handlers, at high concurrency.
+
+Runs the load test of POST /add-job, GET /jobs and GET /search against app.main:app, whose handlers are
+async def, and against benchmarks.sync_app:app, serving the same routes with plain def handlers run on the
+FastAPI threadpool, for each storage backend and concurrency.
+
+Usage:
+    python -m benchmarks.bench_async --concurrency 64 256 --storage-backends columnar sqlite
+"""
+import argparse
+
+from benchmarks import bench_load
+from benchmarks.common import print_table
+
+APPS = {"threadpool": "benchmarks.sync_app:app", "async": "app.main:app"}
+SCENARIOS = ["add_job", "get_jobs_page", "get_jobs_filtered", "search"]
+
+
+def run(concurrencies: list[int], storage_backends: list[str], jobs: int, duration: float, seed: int) -> list[dict]:
+    rows = []
+    for storage_backend in storage_backends:
+        for concurrency in concurrencies:
+            results = {
+                handlers: bench_load.run(SCENARIOS, jobs, concurrency, duration, storage_backend=storage_backend, seed=seed, app=app)
+                for handlers, app in APPS.items()
+            }
+            for before, after in zip(results["threadpool"], results["async"]):
+                rows.append(
+                    {
+                        "storage": storage_backend,
+                        "scenario": before["scenario"],
+                        "concurrency": concurrency,
+                        "threadpool_rps": before["rps"],
+                        "async_rps": after["rps"],
+                        "threadpool_p99_ms": before["p99_ms"],
+                        "async_p99_ms": after["p99_ms"],
+                        "speedup": after["rps"] / before["rps"] if before["rps"] else 0.0,
+                    }
+                )
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--storage-backends", nargs="+", choices=["columnar", "memory", "log", "sqlite"], default=["columnar", "sqlite"])
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print_table(run(args.concurrency, args.storage_backends, args.jobs, args.duration, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark of the parsing of large responses of the extra source, collected or consumed as they are streamed.
+
+Serves a multi-megabyte catalogue from a StubExtraSource, optionally at a limited bandwidth, and fetches it with
+JobberwockyExtraSource in each mode:
+
+- get_jobs: get_jobs, the body parsed by a JSONArrayParser as it is received, the jobs returned at once in a list.
+- streamed: stream_jobs, the body parsed the same way, the jobs collected in a list as they are yielded.
+- streamed_iter: stream_jobs consumed job by job without keeping them, like the NDJSON streamed listings.
+
+Each mode runs in a fresh subprocess, warmed up by a request answered with an empty array, reporting the time to
+the first job, the total time and the growth of its peak RSS during the fetch, which includes the collected jobs
+for the get_jobs and streamed modes.
+
+Usage:
+    python -m benchmarks.bench_external_stream --jobs 10000 100000
+    python -m benchmarks.bench_external_stream --jobs 100000 --bandwidth 20000000
+"""
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+from typing import Optional
+
+from app.domain.job_filters import JobFilters
+from app.services.external_job_finder_service import JobberwockyExtraSource
+from benchmarks.common import print_table
+from benchmarks.stub_source import StubExtraSource
+
+MODES = ["get_jobs", "streamed", "streamed_iter"]
+
+
+def peak_rss_mb() -> float:
+    """Read the peak RSS of the process in megabytes, ru_maxrss being in kilobytes on Linux and bytes on macOS."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def fetch(mode: str, url: str) -> dict:
+    """Fetch the catalogue in one mode, measuring the time to the first job and the total time."""
+    source = JobberwockyExtraSource(url, timeout=60.0)
+    # Warm up the connection and the code paths with a request the stub answers with an empty array
+    await source.get_jobs(JobFilters(name="no such job"))
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    first_job: Optional[float] = None
+    jobs = 0
+    if mode == "get_jobs":
+        jobs_list = await source.get_jobs()
+        first_job = time.perf_counter()
+        jobs = len(jobs_list)
+    elif mode == "streamed":
+        jobs_list = []
+        async for job in source.stream_jobs():
+            if first_job is None:
+                first_job = time.perf_counter()
+            jobs_list.append(job)
+        jobs = len(jobs_list)
+    else:
+        async for job in source.stream_jobs():
+            if first_job is None:
+                first_job = time.perf_counter()
+            jobs += 1
+    total = time.perf_counter() - start
+    await source.aclose()
+
+    return {
+        "mode": mode,
+        "jobs": jobs,
+        "first_job_ms": (first_job - start) * 1000 if first_job is not None else total * 1000,
+        "total_s": total,
+        "jobs_per_s": jobs / total,
+        "peak_rss_mb": peak_rss_mb() - baseline,
+    }
+
+
+def measure(mode: str, url: str) -> dict:
+    """Fetch the catalogue in one mode in a fresh subprocess, so its peak RSS is not raised by the other modes."""
+    command = [sys.executable, "-m", "benchmarks.bench_external_stream", "--measure", mode, "--url", url]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+
+    return json.loads(output)
+
+
+def run(job_counts: list[int], bandwidth: Optional[float] = None, seed: int = 0) -> list[dict]:
+    rows = []
+    for count in job_counts:
+        with StubExtraSource(jobs=count, seed=seed, bandwidth=bandwidth) as stub:
+            payload_mb = len(stub._body) / (1024 * 1024)
+            for mode in MODES:
+                rows.append({**measure(mode, stub.url), "payload_mb": payload_mb})
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--bandwidth", type=float, default=None, help="The bytes per second the stub sends the body at")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--measure", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(asyncio.run(fetch(args.measure, args.url))))
+        return
+
+    print_table(run(args.jobs, args.bandwidth, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark of the job storage layouts: memory per job, add throughput and read cost.
+
+Compares the InMemoryStorage, holding a dictionary per job, with the ColumnarJobStorage, both behind an
+InMemoryJobRepository. GET /jobs is measured end to end through the application, encoding the listing
+then answering from the listing cache.
+
+Usage:
+    python -m benchmarks.bench_job_storage --jobs 100000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_job_repository
+from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.main import app
+from app.repository.repository import InMemoryJobRepository
+from app.storage import ColumnarJobStorage, InMemoryStorage
+from benchmarks.common import COUNTRIES, print_table, random_job
+
+LAYOUTS = {"dict": InMemoryStorage, "columnar": ColumnarJobStorage}
+
+
+def fill(layout: str, jobs: list[Job]) -> InMemoryJobRepository:
+    repository = InMemoryJobRepository(LAYOUTS[layout]())
+    for job in jobs:
+        repository.add(job)
+
+    return repository
+
+
+def run(jobs: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    items = [Job(**random_job(rng)) for _ in range(jobs)]
+    client = TestClient(app)
+
+    rows = []
+    for layout in LAYOUTS:
+        tracemalloc.start()
+        repository = fill(layout, items)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del repository
+
+        start = time.perf_counter()
+        repository = fill(layout, items)
+        add = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert len(repository.get_jobs()) == jobs
+        get_all = time.perf_counter() - start
+
+        start = time.perf_counter()
+        repository.get_jobs(JobFilters(country=COUNTRIES[0], salary_min=50000))
+        get_filtered = time.perf_counter() - start
+
+        app.dependency_overrides[get_job_repository] = lambda: repository
+        try:
+            start = time.perf_counter()
+            response = client.get("/jobs")
+            http_get = time.perf_counter() - start
+            start = time.perf_counter()
+            client.get("/jobs")
+            http_get_cached = time.perf_counter() - start
+        finally:
+            app.dependency_overrides.clear()
+        assert response.status_code == 200
+
+        rows.append(
+            {
+                "layout": layout,
+                "jobs": jobs,
+                "bytes_per_job": memory / jobs,
+                "adds_per_s": jobs / add,
+                "get_jobs_s": get_all,
+                "get_jobs_filtered_s": get_filtered,
+                "http_get_jobs_s": http_get,
+                "http_get_jobs_cached_s": http_get_cached,
+            }
+        )
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print_table(run(args.jobs, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""End to end load test of the service running under uvicorn, against a local stub of the extra source.
+
+Starts a StubExtraSource and uvicorn serving app.main:app, or the --app given, in a subprocess, fills the
+repository through POST /add-jobs, then runs each scenario with concurrent clients for a fixed duration,
+reporting the throughput and the latency percentiles. The clients run in this process, so on a small machine
+they compete with the server for the CPU: compare runs made on the same machine with the same options.
+
+Usage:
+    python -m benchmarks.bench_load --jobs 10000 --concurrency 16 --duration 10
+    python -m benchmarks.bench_load --scenarios get_jobs_page search --workers 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+import httpx
+
+from benchmarks.common import COUNTRIES, percentile, print_table, random_job
+from benchmarks.stub_source import StubExtraSource
+
+# The request of each scenario, built from a random generator: method, path, query parameters and JSON body
+SCENARIOS: dict[str, Callable[[random.Random], tuple[str, str, dict, object]]] = {
+    "add_job": lambda rng: ("POST", "/add-job", {}, random_job(rng)),
+    "get_jobs_page": lambda rng: ("GET", "/jobs", {"limit": 100}, None),
+    "get_jobs_filtered": lambda rng: ("GET", "/jobs", {"country": rng.choice(COUNTRIES), "salary_min": 50000}, None),
+    "search": lambda rng: ("GET", "/search", {"q": rng.choice(["python", "sr dev", "arch", "react engineer"])}, None),
+    "aggregated_jobs": lambda rng: ("GET", "/aggregated-jobs", {"country": rng.choice(COUNTRIES), "limit": 100}, None),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    port: int, extra_source_url: str, workers: int, storage_backend: str, storage_path: str, app: str = "app.main:app"
+) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "ENDPOINT_EXTRA_SOURCE_SERVICE": extra_source_url,
+        "STORAGE_BACKEND": storage_backend,
+        "STORAGE_PATH": storage_path,
+    }
+    command = [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+
+    return subprocess.Popen(command + ["--log-level", "warning"], env=env, stdout=subprocess.DEVNULL)
+
+
+def wait_ready(base_url: str, server: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"The server exited with code {server.returncode}")
+        try:
+            if httpx.get(base_url + "/metrics", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"The server did not answer within {timeout}s")
+
+
+async def load(base_url: str, scenario: str, concurrency: int, duration: float, seed: int) -> dict:
+    build = SCENARIOS[scenario]
+    latencies: list[float] = []
+    errors = 0
+
+    async def client_loop(client: httpx.AsyncClient, rng: random.Random, deadline: float):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            method, path, params, body = build(rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(client_loop(client, random.Random(seed + index), deadline) for index in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def run(
+    scenarios: list[str],
+    jobs: int,
+    concurrency: int,
+    duration: float,
+    workers: int = 1,
+    storage_backend: str = "columnar",
+    source_jobs: int = 1000,
+    source_latency: float = 0.01,
+    seed: int = 0,
+    app: str = "app.main:app",
+) -> list[dict]:
+    rng = random.Random(seed)
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    with StubExtraSource(source_jobs, source_latency, seed) as source, tempfile.TemporaryDirectory() as storage_path:
+        server = start_server(port, source.url, workers, storage_backend, storage_path, app)
+        try:
+            wait_ready(base_url, server)
+            for offset in range(0, jobs, 1000):
+                batch = [random_job(rng) for _ in range(min(1000, jobs - offset))]
+                httpx.post(base_url + "/add-jobs", json=batch, timeout=60.0).raise_for_status()
+
+            return [asyncio.run(load(base_url, scenario, concurrency, duration, seed)) for scenario in scenarios]
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--storage-backend", choices=["columnar", "memory", "log", "sqlite", "shared"], default="columnar")
+    parser.add_argument("--source-jobs", type=int, default=1000)
+    parser.add_argument("--source-latency", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--app", default="app.main:app")
+    args = parser.parse_args()
+
+    print_table(
+        run(
+            args.scenarios,
+            args.jobs,
+            args.concurrency,
+            args.duration,
+            args.workers,
+            args.storage_backend,
+            args.source_jobs,
+            args.source_latency,
+            args.seed,
+            args.app,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark of the free text job search: indexing throughput and query latency.
+
+Compares the BM25 SearchIndex of the InMemoryJobRepository with a linear scan of the jobs
+matching any query word, as a client filtering GET /jobs would do.
+
+Usage:
+    python -m benchmarks.bench_search --jobs 100000 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.domain.job import Job
+from app.repository.repository import InMemoryJobRepository
+from app.repository.search_index import tokenize
+from app.storage import ColumnarJobStorage
+from benchmarks.common import print_table, random_job
+
+QUERIES = {
+    "one_word": "python",
+    "two_words": "sr developer",
+    "prefix": "arch",
+    "rare": "principal rust architect",
+}
+
+
+def scan(jobs: list[Job], query: str, limit: int) -> list[Job]:
+    words = set(tokenize(query))
+    return [job for job in jobs if words & set(tokenize(" ".join([job.name, *job.skills])))][:limit]
+
+
+def run(job_counts: list[int], repeat: int, limit: int, seed: int) -> list[dict]:
+    rows = []
+    for count in job_counts:
+        rng = random.Random(seed)
+        jobs = [Job(**random_job(rng)) for _ in range(count)]
+
+        repository = InMemoryJobRepository(ColumnarJobStorage())
+        start = time.perf_counter()
+        for offset in range(0, count, 10000):
+            repository.add_many(jobs[offset:offset + 10000])
+        index = time.perf_counter() - start
+
+        for name, query in QUERIES.items():
+            latencies = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                hits = repository.search(query, limit)
+                latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            scan(jobs, query, limit)
+            scan_latency = time.perf_counter() - start
+
+            rows.append(
+                {
+                    "jobs": count,
+                    "query": name,
+                    "hits": len(hits),
+                    "adds_per_s": count / index,
+                    "p50_ms": statistics.median(latencies) * 1000,
+                    "max_ms": max(latencies) * 1000,
+                    "scan_ms": scan_latency * 1000,
+                }
+            )
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print_table(run(args.jobs, args.repeat, args.limit, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark of the serialization of job listings.
+
+Compares the encodings used by the routes: the FastAPI response_model path (validation into JobOut then
+jsonable_encoder and json.dumps), the direct encode_jobs of the listing cache, the NDJSON lines of the
+streamed listings, and pydantic dump_json for reference.
+
+Usage:
+    python -m benchmarks.bench_serialization --jobs 10000 100000
+"""
+import argparse
+import json
+import random
+import time
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.domain.job import Job
+from app.listing_cache import encode_jobs
+from app.pagination import job_to_dict, ndjson_lines
+from app.schemas import JobOut
+from benchmarks.common import print_table, random_job
+
+JOBS_OUT = TypeAdapter(list[JobOut])
+
+
+def fastapi_response(jobs: list[Job]) -> bytes:
+    validated = JOBS_OUT.validate_python([job_to_dict(job) for job in jobs])
+
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def pydantic_dump_json(jobs: list[Job]) -> bytes:
+    return JOBS_OUT.dump_json(JOBS_OUT.validate_python([job_to_dict(job) for job in jobs]))
+
+
+def ndjson(jobs: list[Job]) -> bytes:
+    return "".join(ndjson_lines(jobs)).encode("utf-8")
+
+
+ENCODERS = {
+    "fastapi_response": fastapi_response,
+    "pydantic_dump_json": pydantic_dump_json,
+    "encode_jobs": encode_jobs,
+    "ndjson": ndjson,
+}
+
+
+def run(job_counts: list[int], repeat: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for count in job_counts:
+        jobs = [Job(**random_job(rng)) for _ in range(count)]
+        for name, encode in ENCODERS.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                body = encode(jobs)
+                best = min(best, time.perf_counter() - start)
+            rows.append(
+                {
+                    "encoder": name,
+                    "jobs": count,
+                    "encode_s": best,
+                    "jobs_per_s": count / best,
+                    "bytes_per_job": len(body) / count,
+                }
+            )
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print_table(run(args.jobs, args.repeat, args.seed))
+
+
+if __name__ == "__main__":
+    main()
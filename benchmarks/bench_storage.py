@@ -0,0 +1,82 @@
+"""Benchmark of the AppendOnlyLogStorage: add throughput and cold-start time.
+
+Cold start is measured twice: replaying everything from the log, and loading a compacted snapshot.
+
+Usage:
+    python -m benchmarks.bench_storage --jobs 1000000 --fsync-every 100 1000
+"""
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from app.storage import AppendOnlyLogStorage, InMemoryStorage
+from benchmarks.common import print_table, random_job
+
+
+def run(jobs: int, fsync_every_values: list[int], seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    items = [random_job(rng) for _ in range(jobs)]
+
+    start = time.perf_counter()
+    memory = InMemoryStorage()
+    for item in items:
+        memory.add(item)
+    memory_add = time.perf_counter() - start
+
+    rows = []
+    for fsync_every in fsync_every_values:
+        path = tempfile.mkdtemp(prefix="bench-storage-")
+        try:
+            storage = AppendOnlyLogStorage(path, fsync_every=fsync_every, fsync_interval=60, compact_every=0)
+            start = time.perf_counter()
+            for item in items:
+                storage.add(item)
+            storage.close()
+            add = time.perf_counter() - start
+
+            start = time.perf_counter()
+            storage = AppendOnlyLogStorage(path, compact_every=0)
+            log_start = time.perf_counter() - start
+            assert len(storage.get_all()) == jobs
+
+            start = time.perf_counter()
+            storage.compact()
+            compact = time.perf_counter() - start
+            storage.close()
+
+            start = time.perf_counter()
+            storage = AppendOnlyLogStorage(path, compact_every=0)
+            snapshot_start = time.perf_counter() - start
+            storage.close()
+        finally:
+            shutil.rmtree(path)
+
+        rows.append(
+            {
+                "jobs": jobs,
+                "fsync_every": fsync_every,
+                "adds_per_s": jobs / add,
+                "memory_adds_per_s": jobs / memory_add,
+                "cold_start_log_s": log_start,
+                "compact_s": compact,
+                "cold_start_snapshot_s": snapshot_start,
+            }
+        )
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000000)
+    parser.add_argument("--fsync-every", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print_table(run(args.jobs, args.fsync_every, args.seed))
+
+
+if __name__ == "__main__":
+    main()
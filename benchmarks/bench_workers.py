@@ -0,0 +1,53 @@
+"""Throughput of the service as the number of uvicorn worker processes grows, with the shared storage backend.
+
+Runs bench_load with 1 to N workers sharing their jobs and alerts through the SQLite change feed of the
+"shared" backend, every worker serving its reads from its own replica of the catalogue. Reports the throughput
+of each scenario and its speedup over a single worker. The clients run in this process, so they take a core
+away from the workers: on a machine with C cores, expect the scaling to flatten before C workers.
+
+Usage:
+    python -m benchmarks.bench_workers --workers 1 2 4 --jobs 10000 --duration 10
+    python -m benchmarks.bench_workers --scenarios get_jobs_page search --concurrency 64
+"""
+import argparse
+import os
+
+from benchmarks import bench_load
+from benchmarks.common import print_table
+
+
+def run(
+    workers: list[int],
+    scenarios: list[str],
+    jobs: int,
+    concurrency: int,
+    duration: float,
+    storage_backend: str = "shared",
+    seed: int = 0,
+) -> list[dict]:
+    rows = []
+    single: dict[str, float] = {}
+    for count in workers:
+        for row in bench_load.run(scenarios, jobs, concurrency, duration, count, storage_backend, seed=seed):
+            single.setdefault(row["scenario"], row["rps"])
+            rows.append({"workers": count, **row, "speedup": row["rps"] / single[row["scenario"]]})
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, max(2, (os.cpu_count() or 2) - 1)}))
+    parser.add_argument("--scenarios", nargs="+", choices=list(bench_load.SCENARIOS), default=["add_job", "get_jobs_page", "search"])
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--storage-backend", choices=["shared", "sqlite"], default="shared")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print_table(run(args.workers, args.scenarios, args.jobs, args.concurrency, args.duration, args.storage_backend, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import random
+import time
+from contextlib import contextmanager
+
+NAME_LEVELS = ["Jr", "SSr", "Sr", "Lead", "Principal"]
+NAME_ROLES = ["Python", "Java", "PHP", "React", "Angular", "Ruby", "C#", "Go", "Rust", "Data", "UX", "QA"]
+NAME_TITLES = ["Developer", "Engineer", "Designer", "Analyst", "Administrator", "Architect"]
+COUNTRIES = ["Argentina", "Brazil", "Chile", "Spain", "USA", "Canada", "Germany", "Uruguay"]
+SKILLS = ["Python", "Java", "OOP", "Design Patterns", "UX", "React", "TypeScript", "Angular", "MySQL", "Docker", "AWS", "Git"]
+
+
+def random_job_name(rng: random.Random) -> str:
+    """Build a random job name like the ones served by the Jobberwocky extra source.
+
+    Args:
+        rng (random.Random): The random generator to use.
+
+    Returns:
+        str: The job name.
+
+    """
+    return f"{rng.choice(NAME_LEVELS)} {rng.choice(NAME_ROLES)} {rng.choice(NAME_TITLES)}"
+
+
+def random_job(rng: random.Random) -> dict:
+    """Build a random job as a dictionary with the fields of JobIn.
+
+    Args:
+        rng (random.Random): The random generator to use.
+
+    Returns:
+        dict: The job.
+
+    """
+    return {
+        "name": random_job_name(rng),
+        "country": rng.choice(COUNTRIES),
+        "salary": rng.randrange(10000, 100000, 500),
+        "skills": rng.sample(SKILLS, rng.randint(1, 4)),
+    }
+
+
+@contextmanager
+def timer(results: dict, key: str):
+    """Measure the wall time of a block and store it in seconds under results[key].
+
+    Args:
+        results (dict): The dictionary to store the measure in.
+        key (str): The key to store the measure under.
+
+    """
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Take a percentile of sorted values, by the nearest rank.
+
+    Args:
+        values (list[float]): The values, in increasing order.
+        q (float): The percentile, between 0 and 1.
+
+    Returns:
+        float: The value at the percentile, 0 if there are no values.
+
+    """
+    if not values:
+        return 0.0
+
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def print_table(rows: list[dict]):
+    """Print a list of result rows as an aligned table.
+
+    Args:
+        rows (list[dict]): The rows to print, all with the same keys.
+
+    """
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [[f"{row[column]:.6g}" if isinstance(row[column], float) else str(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[index]) for line in cells)) for index, column in enumerate(columns)]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)))
@@ -0,0 +1,165 @@
+"""Run the benchmark suite and write the results as JSON, to compare runs and catch regressions.
+
+Each benchmark is run with fixed sizes and seed, --quick selecting smaller sizes for a fast check. The results
+are written with the commit, Python version and platform they were measured on. Given a baseline written by
+a previous run, every measure worse than the baseline by more than the threshold is reported as a regression
+and the runner exits with status 1. Measures are compared by their name: durations ("_s", "_ms") are better
+lower, rates ("per_s", "rps", "speedup") better higher, the other numbers are not compared.
+
+Usage:
+    python -m benchmarks.runner --output benchmarks/results/latest.json
+    python -m benchmarks.runner --quick --only alert_matching serialization --baseline benchmarks/results/main.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import Callable, Optional
+
+from benchmarks import (
+    bench_alert_matching,
+    bench_external_stream,
+    bench_job_storage,
+    bench_load,
+    bench_search,
+    bench_serialization,
+    bench_storage,
+    bench_workers,
+)
+from benchmarks.common import print_table
+
+# The benchmarks of the suite, each run with the sizes of a full run or of a quick run
+SUITES: dict[str, Callable[[bool], list[dict]]] = {
+    "alert_matching": lambda quick: bench_alert_matching.run([100, 1000] if quick else [100, 1000, 10000, 100000], 100, 0),
+    "alert_criteria": lambda quick: bench_alert_matching.run_criteria([1000, 10000] if quick else [1000, 10000, 100000], 100, 0),
+    "job_storage": lambda quick: bench_job_storage.run(10000 if quick else 100000, 0),
+    "storage": lambda quick: bench_storage.run(10000 if quick else 200000, [100, 1000], 0),
+    "search": lambda quick: bench_search.run([10000] if quick else [100000], 5, 10, 0),
+    "serialization": lambda quick: bench_serialization.run([10000] if quick else [10000, 100000], 3, 0),
+    "external_stream": lambda quick: bench_external_stream.run([10000] if quick else [10000, 100000]),
+    "load": lambda quick: bench_load.run(list(bench_load.SCENARIOS), 2000 if quick else 10000, 8 if quick else 16, 2.0 if quick else 10.0),
+    "workers": lambda quick: bench_workers.run([1, 2] if quick else [1, 2, 4], ["add_job", "get_jobs_page"], 2000 if quick else 10000, 32, 2.0 if quick else 10.0),
+}
+
+
+def direction(measure: str) -> int:
+    """Tell whether a measure is better higher or lower, from its name.
+
+    Args:
+        measure (str): The name of the measure.
+
+    Returns:
+        int: 1 if it is better higher, -1 if it is better lower, 0 if it is not compared.
+
+    """
+    if measure.endswith(("per_s", "rps", "speedup")):
+        return 1
+    if measure.endswith(("_s", "_ms", "_ms_per_job")):
+        return -1
+
+    return 0
+
+
+def row_key(row: dict) -> tuple:
+    """Identify a result row by its parameters, its string and integer values."""
+    return tuple((name, value) for name, value in row.items() if isinstance(value, (str, int)) and not isinstance(value, bool))
+
+
+def compare(results: dict[str, list[dict]], baseline: dict[str, list[dict]], threshold: float) -> list[dict]:
+    """Find the measures of a run worse than in a baseline run.
+
+    Rows are matched by their parameters, so rows with no counterpart in the baseline are skipped.
+
+    Args:
+        results (dict[str, list[dict]]): The rows of each benchmark of the run.
+        baseline (dict[str, list[dict]]): The rows of each benchmark of the baseline run.
+        threshold (float): The relative change above which a measure is a regression, 0.2 for 20%.
+
+    Returns:
+        list[dict]: The benchmark, parameters, measure, baseline and current values and relative change of each regression.
+
+    """
+    regressions = []
+    for suite, rows in results.items():
+        baseline_rows = {row_key(row): row for row in baseline.get(suite, [])}
+        for row in rows:
+            previous = baseline_rows.get(row_key(row))
+            if previous is None:
+                continue
+            for measure, value in row.items():
+                better = direction(measure)
+                before = previous.get(measure)
+                if not better or not isinstance(value, float) or not isinstance(before, (int, float)) or not before:
+                    continue
+                change = (value - before) / before
+                if -better * change > threshold:
+                    regressions.append(
+                        {
+                            "benchmark": suite,
+                            "parameters": " ".join(f"{name}={value}" for name, value in row_key(row)),
+                            "measure": measure,
+                            "baseline": float(before),
+                            "current": value,
+                            "change": change,
+                        }
+                    )
+
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(suites: list[str], quick: bool) -> dict:
+    results = {}
+    for suite in suites:
+        print(f"== {suite}", file=sys.stderr)
+        results[suite] = SUITES[suite](quick)
+        print_table(results[suite])
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results", "latest.json"))
+    parser.add_argument("--baseline")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run(args.only, args.quick)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(report["results"], json.load(baseline)["results"], args.threshold)
+        if regressions:
+            print(f"== {len(regressions)} regressions over {args.threshold:.0%}", file=sys.stderr)
+            print_table(regressions)
+            sys.exit(1)
+        print("No regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
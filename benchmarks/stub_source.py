@@ -0,0 +1,148 @@
+"""A local stub of the Jobberwocky extra source, for load tests without the real service.
+
+Serves GET /jobs with a fixed set of random jobs in the format of the extra source, a JSON array of
+[name, salary, country, skills] rows, optionally filtered by name, with an optional latency and an optional
+bandwidth limit, at which the body is sent in chunks.
+
+Usage:
+    python -m benchmarks.stub_source --port 8080 --jobs 1000 --latency 0.02
+    python -m benchmarks.stub_source --port 8080 --jobs 100000 --bandwidth 10000000
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.common import random_job
+
+# The size in bytes of the chunks of a body sent with a bandwidth limit
+CHUNK_SIZE = 64 * 1024
+
+
+class StubExtraSource:
+    """A threaded HTTP server answering like the Jobberwocky extra source.
+
+    Attributes:
+        rows (list[list]): The jobs served, as rows of the extra source.
+        latency (float): The time in seconds each request waits before being answered.
+        bandwidth (Optional[float]): The number of bytes per second the bodies are sent at, None for no limit.
+        requests (int): The number of requests served.
+        url (str): The base URL of the server, once started.
+
+    """
+
+    def __init__(
+        self,
+        jobs: int = 1000,
+        latency: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        bandwidth: Optional[float] = None,
+    ):
+        """Initialize the StubExtraSource.
+
+        Args:
+            jobs (int): The number of random jobs served.
+            latency (float): The time in seconds each request waits before being answered.
+            seed (int): The seed of the random jobs.
+            host (str): The host to listen on.
+            port (int): The port to listen on, any free port by default.
+            bandwidth (Optional[float]): The number of bytes per second the bodies are sent at, None for no limit.
+
+        """
+        rng = random.Random(seed)
+        self.rows = [[job["name"], job["salary"], job["country"], job["skills"]] for job in (random_job(rng) for _ in range(jobs))]
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self._body = json.dumps(self.rows).encode()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self.url = f"http://{host}:{self._server.server_address[1]}/"
+
+    def _handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlsplit(self.path)
+                if url.path.rstrip("/") != "/jobs":
+                    self.send_error(404)
+                    return
+                name = parse_qs(url.query).get("name", [None])[0]
+                body = stub._body if name is None else json.dumps([row for row in stub.rows if name.lower() in row[0].lower()]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if stub.bandwidth is None:
+                    self.wfile.write(body)
+                    return
+                for start in range(0, len(body), CHUNK_SIZE):
+                    self.wfile.write(body[start : start + CHUNK_SIZE])
+                    time.sleep(min(CHUNK_SIZE, len(body) - start) / stub.bandwidth)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubExtraSource":
+        """Start serving in a background thread.
+
+        Returns:
+            StubExtraSource: The started server.
+
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def serve_forever(self):
+        """Serve in the current thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            self._server.server_close()
+
+    def close(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubExtraSource":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--bandwidth", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stub = StubExtraSource(args.jobs, args.latency, args.seed, args.host, args.port, args.bandwidth)
+    print(f"Serving {args.jobs} jobs at {stub.url}jobs")
+    stub.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""The job routes of app.main as plain def handlers, run on the FastAPI threadpool.
+
+This is how POST /add-job, GET /jobs and GET /search were served before the async handlers, kept as the
+baseline of bench_async. It shares the repository, alert service and notifier of app.main, through plain def
+dependencies as they were then, each run on the threadpool as well.
+"""
+from typing import Annotated, Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
+
+from app import dependencies
+from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.listing_cache import CachedListing, ListingCache, encode_jobs, listing_key
+from app.main import lifespan
+from app.metrics import CONTENT_TYPE, registry
+from app.pagination import encode_cursor, take_page
+from app.repository.repository import JobRepository
+from app.schemas import JobIn, JobOut, SearchResultOut
+from app.services.job_alert import JobAlertService
+from app.services.notification_dispatcher import NotificationQueueFull
+from app.services.notify_service import Notifier
+
+app = FastAPI(lifespan=lifespan)
+
+
+def get_job_repository() -> JobRepository:
+    return dependencies.job_repository
+
+
+def get_job_alert_service() -> JobAlertService:
+    return dependencies.job_alert_service
+
+
+def get_notifier_service() -> Notifier:
+    return dependencies.notifier
+
+
+def get_listing_cache() -> ListingCache:
+    return dependencies.listing_cache
+
+
+def get_job_filters(country: Optional[str] = None, salary_min: Optional[int] = None) -> JobFilters:
+    return JobFilters(country=country, salary_min=salary_min)
+
+
+@app.post("/add-job", status_code=201, response_model=JobOut)
+def add_new_job(
+    new_job: JobIn,
+    job_repository: Annotated[JobRepository, Depends(get_job_repository)],
+    job_alert_service: Annotated[JobAlertService, Depends(get_job_alert_service)],
+    notifier_service: Annotated[Notifier, Depends(get_notifier_service)],
+):
+    job = Job(name=new_job.name, country=new_job.country, salary=new_job.salary, skills=new_job.skills)
+    job_repository.add(job)
+
+    try:
+        for notification in job_alert_service.get_job_alerts_to_notify(job):
+            notifier_service.notify(notification.email, job)
+    except NotificationQueueFull:
+        raise HTTPException(status_code=503, detail="The job was added but its notifications could not be enqueued")
+
+    return new_job
+
+
+@app.get("/jobs", response_model=list[JobOut])
+def get_jobs(
+    repository: Annotated[JobRepository, Depends(get_job_repository)],
+    job_filters: Annotated[JobFilters, Depends(get_job_filters)],
+    listing_cache: Annotated[ListingCache, Depends(get_listing_cache)],
+    limit: Optional[int] = Query(None, ge=1),
+):
+    version = repository.version
+    key = listing_key(job_filters, -1, limit)
+    listing = listing_cache.get(repository, version, key)
+    if listing is None:
+        rows = repository.scan(job_filters)
+        rows, next_position = (list(rows), None) if limit is None else take_page(rows, limit)
+        listing = CachedListing(body=encode_jobs(job for _, job in rows), next_position=next_position)
+        listing_cache.put(repository, version, key, listing)
+
+    headers = {} if listing.next_position is None else {"X-Next-Cursor": encode_cursor(listing.next_position)}
+    return Response(content=listing.body, media_type="application/json", headers=headers)
+
+
+@app.get("/search", response_model=list[SearchResultOut])
+def search_jobs(
+    repository: Annotated[JobRepository, Depends(get_job_repository)],
+    q: str = Query(min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    prefix: bool = True,
+):
+    return [{**job.to_dict(), "score": score} for job, score in repository.search(q, limit, prefix)]
+
+
+@app.post("/add-jobs", include_in_schema=False)
+def add_new_jobs(new_jobs: list[JobIn], job_repository: Annotated[JobRepository, Depends(get_job_repository)]):
+    job_repository.add_many([Job(**new_job.model_dump()) for new_job in new_jobs])
+
+    return {"created": len(new_jobs)}
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
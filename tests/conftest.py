@@ -1 +1,6 @@
 import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
@@ -0,0 +1,180 @@
+import random
+import re
+
+import pytest
+
+from app.services.alert_matcher import AhoCorasick, AlertMatcher, IntervalIndex, extract_literals
+from app.domain.job import Job
+from app.domain.job_alert import JobAlert
+
+
+@pytest.fixture
+def matcher():
+    matcher = AlertMatcher()
+
+    return matcher
+
+
+@pytest.mark.parametrize(
+    "regex_name,prefix,runs",
+    [
+        ("^sr", "sr", ["sr"]),
+        ("sr (python|java)+ dev", "sr ", ["sr ", " dev"]),
+        (".*python", "", ["python"]),
+        ("(sr) dev", "sr dev", ["sr dev"]),
+        ("(?i)sr", "", []),
+        ("sr|ssr", "s", ["s"]),
+        ("python|java", "", []),
+    ]
+)
+def test_extract_literals(regex_name, prefix, runs):
+    assert extract_literals(re.compile(regex_name)) == (prefix, runs)
+
+
+class BrokenParser:
+    @staticmethod
+    def parse(pattern, flags):
+        raise TypeError("unsupported parse tree")
+
+
+@pytest.mark.parametrize("parser", [None, BrokenParser])
+def test_extract_literals_without_parser(monkeypatch, parser):
+    monkeypatch.setattr("app.services.alert_matcher.sre_parse", parser)
+    matcher = AlertMatcher()
+    matcher.add(JobAlert(email="email1@gmail.com", regex_name="^sr python"))
+
+    assert extract_literals(re.compile("^sr python")) == ("", [])
+    assert matcher.unindexed == [0]
+    assert matcher.match_job(Job(name="sr python", country="arg", salary=1, skills=[])) == [JobAlert(email="email1@gmail.com", regex_name="^sr python")]
+
+
+@pytest.mark.parametrize("merge_threshold", [1, 3, 64])
+def test_aho_corasick_find(merge_threshold):
+    automaton = AhoCorasick(merge_threshold)
+    for alert_id, keyword in enumerate(["he", "she", "his", "hers"]):
+        automaton.add(keyword, alert_id)
+
+    assert len(automaton.pending) == 4 % merge_threshold
+    assert automaton.find("ushers") == {0, 1, 3}
+    assert automaton.find("java") == set()
+
+
+def named(name):
+    return Job(name=name, country="arg", salary=1000, skills=[])
+
+
+def scan(alerts, job):
+    return [
+        alert
+        for alert in alerts
+        if (not alert.countries or job.country in alert.countries)
+        and (alert.salary_min is None or job.salary >= alert.salary_min)
+        and (alert.salary_max is None or job.salary <= alert.salary_max)
+        and set(alert.skills) <= set(job.skills)
+        and re.match(alert.regex_name, job.name)
+    ]
+
+
+def test_match_empty(matcher):
+    assert matcher.match_job(named("sr python")) == []
+
+
+def test_match_same_as_re_match(matcher):
+    alerts = [
+        JobAlert(email="email1@gmail.com", regex_name="^sr"),
+        JobAlert(email="email2@gmail.com", regex_name="^ssr"),
+        JobAlert(email="email3@gmail.com", regex_name=".*python"),
+        JobAlert(email="email4@gmail.com", regex_name="(?i)SR"),
+        JobAlert(email="email5@gmail.com", regex_name="python"),
+        JobAlert(email="email6@gmail.com", regex_name="s+r"),
+    ]
+    for alert in alerts:
+        matcher.add(alert)
+
+    for name in ["sr python", "ssr python", "Sr java", "python dev", "java"]:
+        expected = [alert for alert in alerts if re.match(alert.regex_name, name)]
+        assert matcher.match_job(named(name)) == expected
+
+
+def test_match_alert_added_after_search(matcher):
+    matcher.add(JobAlert(email="email1@gmail.com", regex_name=".*java"))
+    assert matcher.match_job(named("sr python")) == []
+
+    matcher.add(JobAlert(email="email2@gmail.com", regex_name=".*python"))
+    assert matcher.match_job(named("sr python")) == [JobAlert(email="email2@gmail.com", regex_name=".*python")]
+
+
+def test_add_invalid_regex(matcher):
+    with pytest.raises(re.error):
+        matcher.add(JobAlert(email="email1@gmail.com", regex_name="("))
+
+
+def test_match_jobs_same_as_match_job(matcher):
+    alerts = [
+        JobAlert(email="email1@gmail.com", regex_name="^sr"),
+        JobAlert(email="email2@gmail.com", regex_name=".*python"),
+        JobAlert(email="email3@gmail.com", regex_name="s+r"),
+    ]
+    for alert in alerts:
+        matcher.add(alert)
+    jobs = [named(name) for name in ["sr python", "java", "sr python", "python dev"]]
+
+    assert matcher.match_jobs(jobs) == [matcher.match_job(job) for job in jobs]
+
+
+@pytest.mark.parametrize("merge_threshold", [1, 7, 64])
+def test_interval_index_same_as_scan(merge_threshold):
+    rng = random.Random(0)
+    index = IntervalIndex(merge_threshold)
+    intervals = []
+    for alert_id in range(200):
+        low = rng.choice([float("-inf"), rng.randrange(100)])
+        high = rng.choice([float("inf"), rng.randrange(100)])
+        intervals.append((low, high))
+        index.add(low, high, alert_id)
+
+    for value in range(-1, 102):
+        expected = [alert_id for alert_id, (low, high) in enumerate(intervals) if low <= value <= high]
+        assert sorted(index.find(value)) == expected
+
+
+def test_match_job_criteria(matcher):
+    alerts = [
+        JobAlert(email="email1@gmail.com", regex_name="^sr", skills=["python"]),
+        JobAlert(email="email2@gmail.com", countries=["arg", "uru"]),
+        JobAlert(email="email3@gmail.com", regex_name=".*dev", salary_min=1000, salary_max=2000),
+        JobAlert(email="email4@gmail.com", skills=["python", "sql"], salary_min=1500),
+        JobAlert(email="email5@gmail.com"),
+    ]
+    for alert in alerts:
+        matcher.add(alert)
+
+    assert matcher.match_job(Job(name="sr dev", country="arg", salary=1500, skills=["python", "sql"])) == alerts
+    assert matcher.match_job(Job(name="jr dev", country="usa", salary=500, skills=["sql"])) == [alerts[4]]
+    assert matcher.match_job(Job(name="sr go", country="uru", salary=2500, skills=["python"])) == [alerts[0], alerts[1], alerts[4]]
+
+
+def test_match_jobs_same_as_scan(matcher):
+    rng = random.Random(0)
+    names = ["sr python dev", "jr java dev", "ssr go", "python architect"]
+    countries = ["arg", "uru", "usa", "esp"]
+    skills = ["python", "java", "sql", "aws", "go"]
+    alerts = [
+        JobAlert(
+            email=f"email{index}@gmail.com",
+            regex_name=rng.choice(["", ".*", "^sr", ".*python", "s+r", "jr|ssr"]),
+            skills=rng.sample(skills, rng.randrange(3)),
+            countries=rng.sample(countries, rng.randrange(3)),
+            salary_min=rng.choice([None, rng.randrange(0, 3000, 500)]),
+            salary_max=rng.choice([None, rng.randrange(1000, 5000, 500)]),
+        )
+        for index in range(300)
+    ]
+    for alert in alerts:
+        matcher.add(alert)
+    jobs = [
+        Job(name=rng.choice(names), country=rng.choice(countries), salary=rng.randrange(5000), skills=rng.sample(skills, rng.randrange(4)))
+        for _ in range(100)
+    ]
+
+    assert matcher.match_jobs(jobs) == [scan(alerts, job) for job in jobs]
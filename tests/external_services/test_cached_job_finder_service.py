@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from app.domain.job_filters import JobFilters
+from app.services.cached_job_finder_service import CachedJobFinderService, cache_key
+from app.services.external_job_finder_service import Job
+
+
+class StubSource:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    async def get_jobs(self, job_filters=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError()
+        return [Job(name=f"call {self.calls}", salary=1, country="arg", skills=[])]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def source():
+    source = StubSource()
+
+    return source
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+
+    return clock
+
+
+@pytest.fixture
+def cache(source, clock):
+    cache = CachedJobFinderService(source, ttl=10, stale_ttl=20, max_size=2, clock=clock)
+
+    return cache
+
+
+def test_cache_key_ignores_unset_filters():
+    assert cache_key(None) == cache_key(JobFilters())
+    assert cache_key(JobFilters(name="sr", country="arg")) == (("country", "arg"), ("name", "sr"))
+
+
+@pytest.mark.anyio
+async def test_get_jobs_hit(cache, source):
+    first = await cache.get_jobs(JobFilters(name="sr"))
+    second = await cache.get_jobs(JobFilters(name="sr"))
+
+    assert first == second
+    assert source.calls == 1
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_get_jobs_stale_while_revalidate(cache, source, clock):
+    first = await cache.get_jobs()
+    clock.now = 15
+
+    stale = await cache.get_jobs()
+    await asyncio.sleep(0.01)
+    refreshed = await cache.get_jobs()
+
+    assert stale == first
+    assert refreshed != first
+    assert source.calls == 2
+    assert (cache.stats.stale_hits, cache.stats.refreshes) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_get_jobs_expired(cache, source, clock):
+    await cache.get_jobs()
+    clock.now = 31
+
+    await cache.get_jobs()
+
+    assert source.calls == 2
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.anyio
+async def test_get_jobs_coalesces_misses(cache, source):
+    source.delay = 0.05
+
+    results = await asyncio.gather(*(cache.get_jobs() for _ in range(5)))
+
+    assert source.calls == 1
+    assert all(result == results[0] for result in results)
+    assert cache.stats.coalesced == 4
+
+
+@pytest.mark.anyio
+async def test_get_jobs_lru_eviction(cache, source):
+    await cache.get_jobs(JobFilters(name="a"))
+    await cache.get_jobs(JobFilters(name="b"))
+    await cache.get_jobs(JobFilters(name="a"))
+    await cache.get_jobs(JobFilters(name="c"))
+    await cache.get_jobs(JobFilters(name="a"))
+
+    assert source.calls == 3
+    assert cache.stats.evictions == 1
+    assert cache.stats.size == 2
+
+
+@pytest.mark.anyio
+async def test_get_jobs_error_not_cached(cache, source):
+    source.fail = True
+    with pytest.raises(ConnectionError):
+        await cache.get_jobs()
+
+    source.fail = False
+    await cache.get_jobs()
+
+    assert source.calls == 2
+    assert cache.stats.errors == 1
+
+
+class StreamingSource(StubSource):
+    async def stream_jobs(self, job_filters=None):
+        for job in await self.get_jobs(job_filters):
+            yield job
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_cached_once_complete(clock):
+    source = StreamingSource()
+    cache = CachedJobFinderService(source, ttl=10, stale_ttl=0, clock=clock)
+
+    first = [job async for job in cache.stream_jobs()]
+    second = [job async for job in cache.stream_jobs()]
+
+    assert first == second == await cache.get_jobs()
+    assert source.calls == 1
+    assert (cache.stats.misses, cache.stats.hits) == (1, 2)
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_coalesces_misses(clock):
+    source = StreamingSource(delay=0.05)
+    cache = CachedJobFinderService(source, ttl=10, stale_ttl=0, clock=clock)
+
+    async def stream():
+        return [job async for job in cache.stream_jobs()]
+
+    results = await asyncio.gather(*(stream() for _ in range(10)), cache.get_jobs())
+
+    assert source.calls == 1
+    assert all(result == results[0] for result in results)
+    assert cache.stats.coalesced == 10
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_coalesced_error(clock):
+    source = StreamingSource(delay=0.05)
+    source.fail = True
+    cache = CachedJobFinderService(source, ttl=10, stale_ttl=0, clock=clock)
+
+    async def stream():
+        return [job async for job in cache.stream_jobs()]
+
+    results = await asyncio.gather(*(stream() for _ in range(3)), return_exceptions=True)
+
+    assert source.calls == 1
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert cache.stats.errors == 1
@@ -0,0 +1,159 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.domain.job import Job as DomainJob
+from app.domain.job_alert import JobAlert
+from app.repository.alert_repository import InMemoryJobAlertRepository
+from app.repository.mirror_repository import MirrorJobRepository
+from app.services.catalogue_sync import CatalogueSync
+from app.services.external_job_finder_service import Job, JobFinderServiceError
+from app.services.job_alert import JobberwockyJobAlert
+from app.storage import InMemoryStorage
+
+
+class StubSource:
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+        self.fail = False
+
+    async def get_jobs(self, job_filters=None):
+        self.calls += 1
+        if self.fail:
+            raise JobFinderServiceError()
+        return [Job(name=name, salary=1, country="arg", skills=[]) for name in self.names]
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.sent = []
+
+    def notify(self, email, new_job):
+        self.notify_many(email, [new_job])
+
+    def notify_many(self, email, new_jobs):
+        self.sent.append((email, list(new_jobs)))
+
+
+def make_job(name):
+    return DomainJob(name=name, country="arg", salary=1, skills=[])
+
+
+@pytest.fixture
+def notifier():
+    return RecordingNotifier()
+
+
+@pytest.fixture
+def alert_service():
+    service = JobberwockyJobAlert(InMemoryJobAlertRepository(InMemoryStorage()))
+    service.add_job_alert(JobAlert(email="email1@gmail.com", regex_name=".*python"))
+
+    return service
+
+
+@pytest.mark.anyio
+async def test_sync_applies_diff(alert_service, notifier):
+    source = StubSource(["sr python", "java", "jr python"])
+    mirror = MirrorJobRepository()
+    sync = CatalogueSync(source, mirror, alert_service, notifier)
+
+    first = await sync.sync()
+    source.names = ["sr python", "jr python", "go", "ssr python", "go"]
+    second = await sync.sync()
+
+    assert (first.fetched, first.added, first.removed) == (3, 3, 0)
+    assert (second.fetched, second.added, second.removed) == (5, 2, 1)
+    assert mirror.get_jobs() == [make_job("sr python"), make_job("jr python"), make_job("go"), make_job("ssr python")]
+    assert (sync.stats.syncs, sync.stats.added, sync.stats.removed) == (2, 5, 1)
+
+
+@pytest.mark.anyio
+async def test_sync_notifies_new_jobs_after_first_sync(alert_service, notifier):
+    source = StubSource(["sr python"])
+    sync = CatalogueSync(source, MirrorJobRepository(), alert_service, notifier)
+
+    await sync.sync()
+    assert notifier.sent == []
+
+    source.names = ["sr python", "jr python", "java"]
+    report = await sync.sync()
+
+    assert report.subscribers == 1
+    assert notifier.sent == [("email1@gmail.com", [make_job("jr python")])]
+
+
+@pytest.mark.anyio
+async def test_failed_notification_does_not_stop_other_subscribers(alert_service):
+    alert_service.add_job_alert(JobAlert(email="email2@gmail.com", regex_name=".*python"))
+    notifier = RecordingNotifier()
+    notify_many = notifier.notify_many
+
+    def failing_notify_many(email, new_jobs):
+        if email == "email1@gmail.com":
+            raise RuntimeError("smtp down")
+        notify_many(email, new_jobs)
+
+    notifier.notify_many = failing_notify_many
+    source = StubSource(["java"])
+    mirror = MirrorJobRepository()
+    sync = CatalogueSync(source, mirror, alert_service, notifier)
+    await sync.sync()
+
+    source.names = ["java", "jr python"]
+    report = await sync.sync()
+
+    assert (report.subscribers, report.failed_subscribers) == (1, 1)
+    assert notifier.sent == [("email2@gmail.com", [make_job("jr python")])]
+    assert sync.stats.failed_notifications == 1
+    assert mirror.get_jobs() == [make_job("java"), make_job("jr python")]
+
+
+@pytest.mark.anyio
+async def test_failed_matching_keeps_mirror(notifier):
+    alert_service = MagicMock()
+    alert_service.get_jobs_to_notify.side_effect = RuntimeError("alerts unavailable")
+    source = StubSource(["java"])
+    mirror = MirrorJobRepository()
+    sync = CatalogueSync(source, mirror, alert_service, notifier)
+    await sync.sync()
+
+    source.names = ["java", "jr python"]
+    with pytest.raises(RuntimeError):
+        await sync.sync()
+
+    assert mirror.get_jobs() == [make_job("java")]
+
+
+@pytest.mark.anyio
+async def test_failed_sync_keeps_mirror(alert_service, notifier):
+    source = StubSource(["sr python"])
+    mirror = MirrorJobRepository()
+    sync = CatalogueSync(source, mirror, alert_service, notifier, interval=0.01)
+
+    await sync.start()
+    source.fail = True
+    await asyncio.sleep(0.05)
+    await sync.aclose()
+
+    assert mirror.get_jobs() == [make_job("sr python")]
+    assert sync.stats.syncs == 1
+    assert sync.stats.failures >= 1
+
+
+@pytest.mark.anyio
+async def test_start_syncs_in_background():
+    source = StubSource(["sr python"])
+    mirror = MirrorJobRepository()
+    sync = CatalogueSync(source, mirror, interval=0.01)
+
+    await sync.start()
+    assert mirror.count() == 1
+    source.names = ["sr python", "java"]
+    await asyncio.sleep(0.05)
+    await sync.aclose()
+
+    assert mirror.count() == 2
+    assert source.calls >= 2
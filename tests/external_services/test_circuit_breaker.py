@@ -0,0 +1,210 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.domain.job_filters import JobFilters
+from app.services.circuit_breaker import CircuitBreaker, CircuitBreakerJobFinderService, CircuitOpenError
+from app.services.external_job_finder_service import JobberwockyExtraSource, JobFinderServiceError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubServer:
+    """A local extra source answering GET /jobs, failing or answering slowly on demand."""
+
+    def __init__(self):
+        self.fail = False
+        self.delays = []
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                if stub.delays:
+                    time.sleep(stub.delays.pop(0))
+                if stub.fail:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = json.dumps([["Sr Python Developer", 50000, "Argentina", ["Python"]]]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+
+    return clock
+
+
+@pytest.fixture
+async def source(stub_server):
+    source = JobberwockyExtraSource(stub_server.url, timeout=5.0)
+    yield source
+    await source.aclose()
+
+
+def test_breaker_opens_on_failure_rate(clock):
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window=10, minimum_calls=4, open_timeout=5, clock=clock)
+
+    for success in (True, False, True):
+        breaker.record(success)
+    assert breaker.state == "closed"
+
+    breaker.record(False)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after == 5
+
+
+def test_breaker_forgets_outcomes_out_of_window(clock):
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window=10, minimum_calls=2, clock=clock)
+
+    breaker.record(False)
+    clock.now = 11
+    breaker.record(False)
+    assert breaker.calls_in_window == 1
+    assert breaker.state == "closed"
+
+
+def test_breaker_half_open_trials(clock):
+    breaker = CircuitBreaker(minimum_calls=1, open_timeout=5, half_open_max_calls=1, clock=clock)
+    breaker.record(False)
+
+    clock.now = 5
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open"
+
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == "closed"
+    assert breaker.failure_rate == 0
+    assert breaker.opened == 2
+
+
+@pytest.mark.anyio
+async def test_open_circuit_falls_back_to_last_good_result(stub_server, source, clock):
+    service = CircuitBreakerJobFinderService(source, CircuitBreaker(minimum_calls=3, open_timeout=30, clock=clock))
+    good = await service.get_jobs(JobFilters(name="python"))
+
+    stub_server.fail = True
+    for _ in range(2):
+        with pytest.raises(JobFinderServiceError):
+            await service.get_jobs(JobFilters(name="python"))
+    assert service.breaker.state == "open"
+
+    requests = stub_server.requests
+    assert await service.get_jobs(JobFilters(name="python")) == good
+    with pytest.raises(CircuitOpenError):
+        await service.get_jobs(JobFilters(name="java"))
+    assert stub_server.requests == requests
+    assert service.stats.rejected == 2
+    assert service.stats.fallbacks == 1
+
+    stub_server.fail = False
+    clock.now = 30
+    assert await service.get_jobs(JobFilters(name="java")) != []
+    assert service.breaker.state == "closed"
+
+
+@pytest.mark.anyio
+async def test_slow_call_is_hedged(stub_server, source):
+    service = CircuitBreakerJobFinderService(source, hedge_percentile=0.9, hedge_min_samples=3)
+    for _ in range(3):
+        await service.get_jobs()
+    assert service.hedge_delay is not None
+
+    stub_server.delays = [1.0]
+    start = time.perf_counter()
+    jobs = await service.get_jobs()
+
+    assert time.perf_counter() - start < 0.9
+    assert jobs[0].name == "Sr Python Developer"
+    assert service.stats.hedged == 1
+    assert service.stats.hedge_wins == 1
+
+
+@pytest.mark.anyio
+async def test_hedge_failure_keeps_waiting_for_the_first_call():
+    class Source:
+        def __init__(self):
+            self.calls = 0
+
+        async def get_jobs(self, job_filters=None):
+            self.calls += 1
+            if self.calls == 3:
+                await asyncio.sleep(0.05)
+                return ["slow"]
+            if self.calls == 4:
+                raise JobFinderServiceError()
+            return ["fast"]
+
+    service = CircuitBreakerJobFinderService(Source(), hedge_percentile=0.5, hedge_min_samples=2)
+    await service.get_jobs()
+    await service.get_jobs()
+
+    assert await service.get_jobs() == ["slow"]
+    assert service.stats.hedged == 1
+    assert service.stats.hedge_wins == 0
+    assert service.stats.failures == 0
+
+
+def test_snapshot(stub_server):
+    service = CircuitBreakerJobFinderService(JobberwockyExtraSource(stub_server.url))
+
+    snapshot = service.snapshot()
+    assert snapshot["state"] == "closed"
+    assert snapshot["hedge_delay"] is None
+    assert {"calls", "failures", "rejected", "fallbacks", "opened", "hedged"} <= set(snapshot)
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_records_outcome(stub_server, source, clock):
+    service = CircuitBreakerJobFinderService(source, CircuitBreaker(minimum_calls=2, open_timeout=30, clock=clock))
+    good = [job async for job in service.stream_jobs(JobFilters(name="python"))]
+
+    stub_server.fail = True
+    with pytest.raises(JobFinderServiceError):
+        [job async for job in service.stream_jobs(JobFilters(name="python"))]
+    assert service.breaker.state == "open"
+
+    assert [job async for job in service.stream_jobs(JobFilters(name="python"))] == good
+    assert service.stats.fallbacks == 1
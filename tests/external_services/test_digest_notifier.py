@@ -0,0 +1,109 @@
+import threading
+import time
+
+from app.domain.job import Job
+from app.services.digest_notifier import DigestNotifier
+from app.services.notification_dispatcher import NotificationDispatcher
+
+
+class RecordingNotifier:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+        self.sent_event = threading.Event()
+
+    def notify(self, email, new_job):
+        self.notify_many(email, [new_job])
+
+    def notify_many(self, email, new_jobs):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError()
+        self.sent.append((email, list(new_jobs)))
+        self.sent_event.set()
+
+
+def make_job(name):
+    return Job(name=name, country="arg", salary=1, skills=[])
+
+
+def test_digest_sent_when_full():
+    sink = RecordingNotifier()
+    digest = DigestNotifier(sink, max_batch_size=2, max_delay=60.0)
+
+    digest.notify("email1@gmail.com", make_job("sr python"))
+    assert sink.sent == []
+    digest.notify("email1@gmail.com", make_job("jr python"))
+
+    assert sink.sent == [("email1@gmail.com", [make_job("sr python"), make_job("jr python")])]
+    assert digest.pending == 0
+    assert digest.stats.digests == 1
+    digest.close()
+
+
+def test_duplicate_jobs_dropped():
+    sink = RecordingNotifier()
+    digest = DigestNotifier(sink, max_batch_size=10, max_delay=60.0)
+
+    digest.notify("email1@gmail.com", make_job("sr python"))
+    digest.notify_many("email1@gmail.com", [make_job("sr python"), make_job("jr python")])
+    digest.notify("email2@gmail.com", make_job("sr python"))
+    digest.close()
+
+    assert sink.sent == [
+        ("email1@gmail.com", [make_job("sr python"), make_job("jr python")]),
+        ("email2@gmail.com", [make_job("sr python")]),
+    ]
+    assert digest.stats.received == 4
+    assert digest.stats.duplicates == 1
+    assert digest.stats.delivered == 3
+
+
+def test_large_notify_many_split_into_digests():
+    sink = RecordingNotifier()
+    digest = DigestNotifier(sink, max_batch_size=2, max_delay=60.0)
+
+    digest.notify_many("email1@gmail.com", [make_job(f"python {index}") for index in range(5)])
+    digest.close()
+
+    assert [len(jobs) for _, jobs in sink.sent] == [2, 2, 1]
+    assert digest.stats.digests == 3
+
+
+def test_digest_sent_after_max_delay():
+    sink = RecordingNotifier()
+    digest = DigestNotifier(sink, max_batch_size=10, max_delay=0.05)
+
+    start = time.monotonic()
+    digest.notify("email1@gmail.com", make_job("sr python"))
+
+    assert sink.sent_event.wait(timeout=5)
+    assert time.monotonic() - start >= 0.05
+    assert sink.sent == [("email1@gmail.com", [make_job("sr python")])]
+    digest.close()
+
+
+def test_sink_failure_counted():
+    sink = RecordingNotifier(failures=1)
+    digest = DigestNotifier(sink, max_batch_size=1, max_delay=60.0)
+
+    digest.notify("email1@gmail.com", make_job("sr python"))
+    digest.notify("email1@gmail.com", make_job("jr python"))
+    digest.close()
+
+    assert sink.sent == [("email1@gmail.com", [make_job("jr python")])]
+    assert digest.stats.failed == 1
+    assert digest.stats.delivered == 1
+
+
+def test_behind_dispatcher():
+    sink = RecordingNotifier()
+    digest = DigestNotifier(sink, max_batch_size=10, max_delay=60.0)
+    dispatcher = NotificationDispatcher(digest, workers=1)
+
+    for _ in range(3):
+        dispatcher.notify("email1@gmail.com", make_job("sr python"))
+    dispatcher.close()
+    digest.close()
+
+    assert sink.sent == [("email1@gmail.com", [make_job("sr python")])]
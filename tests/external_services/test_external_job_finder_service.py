@@ -1,8 +1,10 @@
+import json
+
 from app.services.external_job_finder_service import JobberwockyExtraSource, Job, JobFilters, JobFinderServiceError
-from unittest.mock import patch
 
 import httpx
 import pytest
+from pytest_httpx import IteratorStream
 
 @pytest.fixture
 def external_job_finder():
@@ -26,34 +28,93 @@ dummy_jobs = [
     ['Ruby Developer', 34000, 'Argentina', ['Ruby', 'OOP']]
 ]
 
-def test__get_without_filters(external_job_finder):
-    filters = None
+@pytest.mark.anyio
+async def test_get_jobs_without_filters(httpx_mock, external_job_finder):
+    httpx_mock.add_response(json=[])
 
-    with patch.object(httpx, "get") as mock_method:
-        result = external_job_finder._get(url="test", filters=filters)
-        mock_method.assert_called_with("test")
+    await external_job_finder.get_jobs()
+    assert httpx_mock.get_request().url == "http://test_url/jobs"
 
 
-def test__get_with_filters(external_job_finder):
-    filters = JobFilters(name="sr python")
-    sanitized_filters = {
-        "name": "sr python"
-    }
+@pytest.mark.anyio
+async def test_get_jobs_with_filters(httpx_mock, external_job_finder):
+    httpx_mock.add_response(json=[])
 
-    with patch.object(httpx, "get") as mock_method:
-        result = external_job_finder._get(url="test", filters=filters)
-        mock_method.assert_called_with("test", sanitized_filters)
+    await external_job_finder.get_jobs(JobFilters(name="sr python"))
+    assert httpx_mock.get_request().url.params == httpx.QueryParams({"name": "sr python"})
 
 
-def test__get_http_error(httpx_mock, external_job_finder):
+@pytest.mark.anyio
+async def test_get_jobs_http_error(httpx_mock, external_job_finder):
     httpx_mock.add_exception(httpx.ReadTimeout("Unable to read within timeout"))
 
     with pytest.raises(JobFinderServiceError):
-        external_job_finder._get(url="http://test", filters=None)
+        await external_job_finder.get_jobs()
+
+
+@pytest.mark.anyio
+async def test_get_jobs_reuses_client(httpx_mock, external_job_finder):
+    httpx_mock.add_response(json=dummy_jobs)
+    httpx_mock.add_response(json=dummy_jobs)
+    client = external_job_finder.client
+
+    await external_job_finder.get_jobs()
+    await external_job_finder.get_jobs()
+
+    assert external_job_finder.client is client
+    await external_job_finder.aclose()
+    assert client.is_closed
+
+
+@pytest.mark.anyio
+async def test_get_jobs(httpx_mock, external_job_finder):
+    httpx_mock.add_response(json=dummy_jobs)
+
+    jobs = await external_job_finder.get_jobs()
+    assert len(jobs) == len(dummy_jobs)
+    assert all(isinstance(job, Job) for job in jobs)
+
+
+@pytest.mark.anyio
+async def test_get_jobs_with_skills_filter(httpx_mock, external_job_finder):
+    filters = JobFilters(country="Argentina", skills=["Java", "OOP"])
+
+    httpx_mock.add_response(json=dummy_jobs)
+
+    jobs = await external_job_finder.get_jobs(filters)
+    assert [job.name for job in jobs] == ["Jr Java Developer", "SSr Java Developer", "Sr Java Developer"]
+    assert httpx_mock.get_request().url.params == httpx.QueryParams({"country": "Argentina"})
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_parses_chunked_response(httpx_mock, external_job_finder):
+    body = json.dumps(dummy_jobs).encode()
+    httpx_mock.add_response(stream=IteratorStream([body[start : start + 7] for start in range(0, len(body), 7)]))
+
+    jobs = [job async for job in external_job_finder.stream_jobs()]
+    assert [job.name for job in jobs] == [row[0] for row in dummy_jobs]
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_invalid_response(httpx_mock, external_job_finder):
+    httpx_mock.add_response(content=b'[["Jr Java Developer", 24000, "Argentina", []], ')
+
+    jobs = []
+    with pytest.raises(JobFinderServiceError):
+        async for job in external_job_finder.stream_jobs():
+            jobs.append(job)
+    assert [job.name for job in jobs] == ["Jr Java Developer"]
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_error_status(httpx_mock, external_job_finder):
+    httpx_mock.add_response(status_code=500)
+
+    with pytest.raises(JobFinderServiceError):
+        await external_job_finder.get_jobs()
+
 
+def test__sanitize_filters_without_skills(external_job_finder):
+    filters = JobFilters(country="Argentina", salary_min=10, skills=["Java"])
 
-def test_get_jobs(external_job_finder):
-    with patch.object(external_job_finder, "_get", return_value=dummy_jobs):
-        jobs = external_job_finder.get_jobs()
-        assert len(jobs) == len(dummy_jobs)
-        assert all(isinstance(job, Job) for job in jobs)
+    assert external_job_finder._sanitize_filters(filters) == {"country": "Argentina", "salary_min": 10}
@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from app.services.job_alert import JobberwockyJobAlert
@@ -51,8 +53,64 @@ def test_get_job_alerts_to_notify_no_empty_repo(job_alert):
         JobAlert(email="email1@gmail.com", regex_name="^sr"),
         JobAlert(email="email1@gmail.com", regex_name="^ssr"),
     ]
-    with patch.object(job_alert.repo, "get_job_alerts", return_value=alerts) as mock_method:
+    with patch.object(job_alert.repo, "get_job_alerts_after", return_value=(alerts, len(alerts))) as mock_method:
 
         to_notify = job_alert.get_job_alerts_to_notify(job)
         mock_method.assert_called()
-        assert to_notify == [JobAlert(email="email1@gmail.com", regex_name="^sr"),]
\ No newline at end of file
+        assert to_notify == [JobAlert(email="email1@gmail.com", regex_name="^sr"),]
+
+def test_add_job_alert(job_alert):
+    job = Job(
+        name="sr python",
+        country="arg",
+        salary=1,
+        skills=[]
+    )
+    new_job_alert = JobAlert(email="email1@gmail.com", regex_name="^sr")
+
+    job_alert.add_job_alert(new_job_alert)
+
+    assert job_alert.repo.get_job_alerts() == [new_job_alert]
+    assert job_alert.get_job_alerts_to_notify(job) == [new_job_alert]
+
+
+def test_get_jobs_to_notify_grouped_per_email(job_alert):
+    job_alert.add_job_alert(JobAlert(email="email1@gmail.com", regex_name="^sr"))
+    job_alert.add_job_alert(JobAlert(email="email1@gmail.com", regex_name=".*python"))
+    job_alert.add_job_alert(JobAlert(email="email2@gmail.com", regex_name=".*java"))
+    jobs = [
+        Job(name="sr python", country="arg", salary=1, skills=[]),
+        Job(name="jr java", country="arg", salary=1, skills=[]),
+        Job(name="sr go", country="arg", salary=1, skills=[]),
+    ]
+
+    to_notify = job_alert.get_jobs_to_notify(jobs)
+
+    assert to_notify == {"email1@gmail.com": [jobs[0], jobs[2]], "email2@gmail.com": [jobs[1]]}
+
+
+def test_alerts_added_by_another_worker_are_matched(job_alert, storage):
+    other_worker = JobberwockyJobAlert(InMemoryJobAlertRepository(storage))
+    job = Job(name="sr python", country="arg", salary=1, skills=[])
+    assert job_alert.get_job_alerts_to_notify(job) == []
+
+    other_worker.add_job_alert(JobAlert(email="email1@gmail.com", regex_name="^sr"))
+
+    assert job_alert.get_job_alerts_to_notify(job) == [JobAlert(email="email1@gmail.com", regex_name="^sr")]
+
+
+def test_add_invalid_job_alert_is_not_stored(job_alert):
+    with pytest.raises(re.error):
+        job_alert.add_job_alert(JobAlert(email="email1@gmail.com", regex_name="("))
+
+    assert job_alert.repo.get_job_alerts() == []
+
+
+def test_get_job_alerts_to_notify_criteria(job_alert):
+    python_in_arg = JobAlert(email="email1@gmail.com", skills=["python"], countries=["arg"])
+    well_paid = JobAlert(email="email2@gmail.com", regex_name="^sr", salary_min=100)
+    job_alert.add_job_alert(python_in_arg)
+    job_alert.add_job_alert(well_paid)
+
+    assert job_alert.get_job_alerts_to_notify(Job(name="sr python", country="arg", salary=1, skills=["python"])) == [python_in_arg]
+    assert job_alert.get_job_alerts_to_notify(Job(name="sr java", country="arg", salary=200, skills=["java"])) == [well_paid]
@@ -0,0 +1,241 @@
+import asyncio
+import time
+
+import pytest
+
+from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.services.job_finder_aggregator import JobFinderAggregator
+from app.services.job_merge import JobMerger
+
+
+class SlowSource:
+    def __init__(self, jobs, delay):
+        self.jobs = jobs
+        self.delay = delay
+
+    def get_jobs(self, job_filters=None):
+        time.sleep(self.delay)
+        return self.jobs
+
+
+class AsyncSlowSource(SlowSource):
+    async def get_jobs(self, job_filters=None):
+        await asyncio.sleep(self.delay)
+        return self.jobs
+
+
+class StreamingSource:
+    def __init__(self, jobs, delay, fail=False):
+        self.jobs = jobs
+        self.delay = delay
+        self.fail = fail
+
+    async def get_jobs(self, job_filters=None):
+        return [job async for job in self.stream_jobs(job_filters)]
+
+    async def stream_jobs(self, job_filters=None):
+        for job in self.jobs:
+            await asyncio.sleep(self.delay)
+            yield job
+        if self.fail:
+            raise ConnectionError()
+
+
+class FailingSource:
+    def get_jobs(self, job_filters=None):
+        raise ConnectionError()
+
+
+def make_job(name):
+    return Job(name=name, country="arg", salary=1, skills=[])
+
+
+@pytest.mark.anyio
+async def test_get_jobs_queries_sources_concurrently():
+    aggregator = JobFinderAggregator([SlowSource([make_job("first")], 0.2), AsyncSlowSource([make_job("second")], 0.2)])
+
+    start = time.perf_counter()
+    aggregated = await aggregator.get_jobs()
+
+    assert time.perf_counter() - start < 0.35
+    assert aggregated.jobs == [make_job("first"), make_job("second")]
+    assert aggregated.contributors == ["SlowSource", "AsyncSlowSource"]
+
+
+@pytest.mark.anyio
+async def test_get_jobs_partial_results_on_timeout():
+    aggregator = JobFinderAggregator([AsyncSlowSource([make_job("slow")], 1), SlowSource([make_job("fast")], 0)], timeout=0.1)
+
+    aggregated = await aggregator.get_jobs()
+
+    assert aggregated.jobs == [make_job("fast")]
+    assert [(source.name, source.status) for source in aggregated.sources] == [("AsyncSlowSource", "timeout"), ("SlowSource", "ok")]
+
+
+@pytest.mark.anyio
+async def test_get_jobs_per_source_timeout():
+    aggregator = JobFinderAggregator(
+        [AsyncSlowSource([make_job("slow")], 0.2), AsyncSlowSource([make_job("fast")], 0)],
+        timeout=0.1,
+        timeouts={"AsyncSlowSource": 1},
+    )
+
+    aggregated = await aggregator.get_jobs()
+
+    assert aggregated.jobs == [make_job("slow"), make_job("fast")]
+    assert [source.name for source in aggregated.sources] == ["AsyncSlowSource", "AsyncSlowSource#2"]
+
+
+@pytest.mark.anyio
+async def test_get_jobs_failing_source():
+    aggregator = JobFinderAggregator([FailingSource(), SlowSource([make_job("first")], 0)])
+
+    aggregated = await aggregator.get_jobs()
+
+    assert aggregated.jobs == [make_job("first")]
+    assert aggregated.sources[0].status == "error"
+
+
+@pytest.mark.anyio
+async def test_get_jobs_pushes_filters_down():
+    class RecordingSource:
+        async def get_jobs(self, job_filters=None):
+            self.job_filters = job_filters
+            return []
+
+    sources = [RecordingSource(), RecordingSource()]
+    job_filters = JobFilters(name="sr", salary_min=10)
+
+    await JobFinderAggregator(sources).get_jobs(job_filters)
+
+    assert all(source.job_filters == job_filters for source in sources)
+
+
+@pytest.mark.anyio
+async def test_get_jobs_merges_duplicates():
+    aggregator = JobFinderAggregator(
+        [SlowSource([make_job("first"), make_job("shared")], 0), AsyncSlowSource([make_job("shared"), make_job("second")], 0)],
+        merger=JobMerger(priority=["AsyncSlowSource"]),
+    )
+
+    aggregated = await aggregator.get_jobs()
+
+    assert aggregated.jobs == [make_job("first"), make_job("shared"), make_job("second")]
+    assert [(source.name, source.duplicates) for source in aggregated.sources] == [("SlowSource", 1), ("AsyncSlowSource", 0)]
+    assert aggregated.duplicates == 1
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_merges_duplicates():
+    aggregator = JobFinderAggregator([SlowSource([make_job("shared")], 0), AsyncSlowSource([make_job("shared")], 0)], merger=JobMerger())
+
+    jobs = [job async for job in aggregator.stream_jobs()]
+
+    assert jobs == [make_job("shared")]
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_yields_streamed_jobs_as_they_arrive():
+    streaming = StreamingSource([make_job("first"), make_job("second")], 0.1)
+    aggregator = JobFinderAggregator([streaming, AsyncSlowSource([make_job("slow")], 0.15)])
+
+    start = time.perf_counter()
+    arrivals = []
+    async for job in aggregator.stream_jobs():
+        arrivals.append((job.name, time.perf_counter() - start))
+
+    assert [name for name, _ in arrivals] == ["first", "slow", "second"]
+    assert arrivals[0][1] < 0.15
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_keeps_jobs_streamed_before_failure():
+    aggregator = JobFinderAggregator([StreamingSource([make_job("first")], 0, fail=True), AsyncSlowSource([make_job("second")], 0)])
+
+    jobs = [job async for job in aggregator.stream_jobs()]
+
+    assert sorted(job.name for job in jobs) == ["first", "second"]
+
+
+class LazySource:
+    def __init__(self, jobs, delay):
+        self.jobs = jobs
+        self.delay = delay
+
+    def get_jobs(self, job_filters=None):
+        return list(self.iter_jobs(job_filters))
+
+    def iter_jobs(self, job_filters=None):
+        for job in self.jobs:
+            time.sleep(self.delay)
+            yield job
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_iterates_lazy_sources_off_the_event_loop():
+    aggregator = JobFinderAggregator([LazySource([make_job("lazy")], 0.2)])
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.ensure_future(tick())
+    jobs = [job async for job in aggregator.stream_jobs()]
+    ticker.cancel()
+
+    assert jobs == [make_job("lazy")]
+    assert ticks >= 5
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_lazy_source_deadline():
+    aggregator = JobFinderAggregator([LazySource([make_job(f"lazy {index}") for index in range(1000)], 0.001), AsyncSlowSource([make_job("fast")], 0)], timeout=0.1)
+
+    start = time.perf_counter()
+    jobs = [job async for job in aggregator.stream_jobs()]
+
+    assert time.perf_counter() - start < 0.5
+    assert make_job("fast") in jobs
+    assert make_job("lazy 999") not in jobs
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_lazy_source_deadline_is_per_chunk():
+    aggregator = JobFinderAggregator([LazySource([make_job(f"lazy {index}") for index in range(5000)], 0)], timeout=0.2)
+
+    jobs = []
+    async for job in aggregator.stream_jobs():
+        jobs.append(job)
+        if len(jobs) % 500 == 0:
+            await asyncio.sleep(0.05)
+
+    assert len(jobs) == 5000
+
+
+@pytest.mark.anyio
+async def test_stream_jobs_bounds_arrivals_without_missing_deadline(monkeypatch):
+    monkeypatch.setattr("app.services.job_finder_aggregator.ARRIVALS_QUEUE_SIZE", 10)
+    streaming = StreamingSource([make_job(f"streamed {index}") for index in range(100)], 0)
+    produced = 0
+
+    async def counted(job_filters=None):
+        nonlocal produced
+        async for job in StreamingSource.stream_jobs(streaming, job_filters):
+            produced += 1
+            yield job
+
+    streaming.stream_jobs = counted
+    aggregator = JobFinderAggregator([LazySource([make_job("lazy")], 0), streaming], timeout=0.2)
+
+    jobs = []
+    async for job in aggregator.stream_jobs():
+        if not jobs:
+            await asyncio.sleep(0.3)
+            assert produced <= 11
+        jobs.append(job)
+
+    assert len(jobs) == 101
@@ -0,0 +1,108 @@
+import pytest
+
+from unittest.mock import MagicMock
+
+from app.domain.job import Job
+from app.domain.job_alert import JobAlert
+from app.repository.alert_repository import InMemoryJobAlertRepository
+from app.repository.async_repository import AsyncJobRepositoryAdapter
+from app.repository.repository import InMemoryJobRepository
+from app.services.job_alert import AsyncJobAlertAdapter, JobberwockyJobAlert
+from app.services.job_ingestion import ingest_jobs
+from app.services.notification_dispatcher import NotificationQueueFull
+from app.services.notify_service import AsyncNotifierAdapter
+from app.storage import InMemoryStorage
+
+
+@pytest.fixture
+def job_repo():
+    repo = InMemoryJobRepository(InMemoryStorage())
+
+    return repo
+
+
+@pytest.fixture
+def job_alert():
+    job_alert = JobberwockyJobAlert(InMemoryJobAlertRepository(InMemoryStorage()))
+    job_alert.add_job_alert(JobAlert(email="email1@gmail.com", regex_name=".*python"))
+
+    return job_alert
+
+
+async def batches(*batches):
+    for batch in batches:
+        if isinstance(batch, Exception):
+            raise batch
+        yield batch
+
+
+async def ingest(batches, job_repo, job_alert, notifier, chunk_size=1000):
+    return await ingest_jobs(
+        batches, AsyncJobRepositoryAdapter(job_repo), AsyncJobAlertAdapter(job_alert), AsyncNotifierAdapter(notifier), chunk_size
+    )
+
+
+@pytest.mark.anyio
+async def test_ingest_jobs(job_repo, job_alert):
+    notifier = MagicMock()
+    items = batches(
+        [{"name": "sr python", "country": "arg", "salary": 1, "skills": []}],
+        [
+            {"name": "jr java", "country": "arg", "salary": -1, "skills": []},
+            b'{"name": "jr python", "country": "arg", "salary": 2, "skills": ["sql"]}',
+            b'{"name": ',
+        ],
+        [{"name": "sr go", "country": "arg", "salary": 3, "skills": []}],
+    )
+
+    report = await ingest(items, job_repo, job_alert, notifier, chunk_size=2)
+
+    assert [item.index for item in report.items] == [0, 1, 2, 3, 4]
+    assert [item.status for item in report.items] == ["created", "invalid", "created", "invalid", "created"]
+    assert report.items[1].errors == ["salary: Input should be greater than or equal to 0"]
+    assert (report.created, report.rejected, report.subscribers, report.notifications) == (3, 2, 1, 2)
+    assert [job.name for job in job_repo.get_jobs()] == ["sr python", "jr python", "sr go"]
+    notifier.notify_many.assert_called_once_with(
+        "email1@gmail.com",
+        [Job(name="sr python", country="arg", salary=1, skills=[]), Job(name="jr python", country="arg", salary=2, skills=["sql"])],
+    )
+
+
+@pytest.mark.anyio
+async def test_ingest_jobs_empty(job_repo, job_alert):
+    notifier = MagicMock()
+
+    report = await ingest(batches(), job_repo, job_alert, notifier)
+
+    assert report.items == []
+    assert report.jobs_per_second == 0.0
+    notifier.notify_many.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_ingest_jobs_malformed_body(job_repo, job_alert):
+    notifier = MagicMock()
+    items = batches([{"name": "sr python", "country": "arg", "salary": 1, "skills": []}], ValueError("Truncated JSON array"))
+
+    report = await ingest(items, job_repo, job_alert, notifier)
+
+    assert [(item.status, item.errors) for item in report.items] == [("created", []), ("invalid", ["body: Truncated JSON array"])]
+    assert (report.created, report.rejected) == (1, 1)
+    assert len(job_repo.get_jobs()) == 1
+
+    with pytest.raises(ValueError):
+        await ingest(batches(ValueError("Expected a JSON array")), job_repo, job_alert, notifier)
+
+
+@pytest.mark.anyio
+async def test_ingest_jobs_notification_queue_full(job_repo, job_alert):
+    job_alert.add_job_alert(JobAlert(email="email2@gmail.com", regex_name="sr"))
+    notifier = MagicMock()
+    notifier.notify_many.side_effect = [NotificationQueueFull(), None]
+    items = batches([{"name": "sr python", "country": "arg", "salary": 1, "skills": []}, {"name": "sr go", "country": "arg", "salary": 1, "skills": []}])
+
+    report = await ingest(items, job_repo, job_alert, notifier)
+
+    assert report.created == 2
+    assert (report.subscribers, report.notifications, report.dropped_notifications) == (2, 2, 1)
+    assert notifier.notify_many.call_count == 2
@@ -0,0 +1,52 @@
+import pytest
+
+from app.domain.job import Job
+from app.services.external_job_finder_service import Job as ExternalJob
+from app.services.job_merge import JobMerger, job_fingerprint
+
+
+def test_fingerprint_normalized():
+    local = Job(name="Sr  Python Developer", country="Arg", salary=10, skills=["Python", "OOP"])
+    external = ExternalJob(name="sr python developer ", salary=10, country="arg", skills=["oop", "python"])
+
+    assert job_fingerprint(local) == job_fingerprint(external)
+    assert job_fingerprint(local) == job_fingerprint(local.to_dict())
+    assert job_fingerprint(local) != job_fingerprint(Job(name="Sr Python Developer", country="Arg", salary=11, skills=["Python", "OOP"]))
+
+
+@pytest.fixture
+def results():
+    results = [
+        ("external", [ExternalJob(name="sr python", salary=1, country="arg", skills=[]), ExternalJob(name="jr java", salary=2, country="arg", skills=[])]),
+        ("local", [Job(name="Sr Python", country="Arg", salary=1, skills=[]), Job(name="ux", country="arg", salary=3, skills=[])]),
+    ]
+
+    return results
+
+
+@pytest.mark.parametrize(
+    "conflict,priority,kept_name,duplicates",
+    [
+        ("priority", ["local"], "Sr Python", {"external": 1, "local": 0}),
+        ("priority", None, "sr python", {"external": 0, "local": 1}),
+        ("first", ["local"], "sr python", {"external": 0, "local": 1}),
+        ("last", None, "Sr Python", {"external": 1, "local": 0}),
+    ]
+)
+def test_merge(results, conflict, priority, kept_name, duplicates):
+    jobs, removed = JobMerger(conflict=conflict, priority=priority).merge(results)
+
+    assert [job.name for job in jobs] == [kept_name, "jr java", "ux"]
+    assert removed == duplicates
+
+
+def test_merge_duplicates_within_source():
+    jobs, removed = JobMerger().merge([("local", [Job(name="ux", country="arg", salary=3, skills=[])] * 3)])
+
+    assert len(jobs) == 1
+    assert removed == {"local": 2}
+
+
+def test_unknown_conflict():
+    with pytest.raises(ValueError):
+        JobMerger(conflict="newest")
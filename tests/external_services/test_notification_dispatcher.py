@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+from app.domain.job import Job
+from app.services.notification_dispatcher import NotificationDispatcher, NotificationQueueFull
+from app.services.notify_service import AsyncNotifierAdapter
+
+
+class RecordingNotifier:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def notify(self, email, new_job):
+        self.notify_many(email, [new_job])
+
+    def notify_many(self, email, new_jobs):
+        self.release.wait()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError()
+        self.sent.append((email, list(new_jobs)))
+
+
+def make_job(name):
+    return Job(name=name, country="arg", salary=1, skills=[])
+
+
+@pytest.fixture
+def sink():
+    sink = RecordingNotifier()
+
+    return sink
+
+
+def test_notify_delivers_after_drain(sink):
+    dispatcher = NotificationDispatcher(sink, workers=1)
+
+    dispatcher.notify("email1@gmail.com", make_job("sr python"))
+
+    assert dispatcher.drain(timeout=5)
+    assert sink.sent == [("email1@gmail.com", [make_job("sr python")])]
+    assert dispatcher.stats.delivered == 1
+    dispatcher.close()
+
+
+def test_notifications_batched_per_email(sink):
+    dispatcher = NotificationDispatcher(sink, workers=1, batch_size=10)
+    sink.release.clear()
+
+    dispatcher.notify("email1@gmail.com", make_job("first"))
+    dispatcher.notify("email1@gmail.com", make_job("second"))
+    dispatcher.notify("email2@gmail.com", make_job("third"))
+    dispatcher.notify("email1@gmail.com", make_job("fourth"))
+    sink.release.set()
+
+    assert dispatcher.close(timeout=5)
+    email1_jobs = [job for email, jobs in sink.sent if email == "email1@gmail.com" for job in jobs]
+    assert email1_jobs == [make_job("first"), make_job("second"), make_job("fourth")]
+    assert ("email2@gmail.com", [make_job("third")]) in sink.sent
+    assert len(sink.sent) <= 3
+    assert dispatcher.stats.delivered == 4
+
+
+def test_failed_delivery_retried():
+    sink = RecordingNotifier(failures=2)
+    dispatcher = NotificationDispatcher(sink, workers=1, max_retries=2, retry_backoff=0)
+
+    dispatcher.notify("email1@gmail.com", make_job("sr python"))
+
+    assert dispatcher.close(timeout=5)
+    assert sink.sent == [("email1@gmail.com", [make_job("sr python")])]
+    assert dispatcher.stats.retried == 2
+    assert dispatcher.stats.failed == 0
+
+
+def test_failed_delivery_dropped_after_retries():
+    sink = RecordingNotifier(failures=5)
+    dispatcher = NotificationDispatcher(sink, workers=1, max_retries=1, retry_backoff=0)
+
+    dispatcher.notify("email1@gmail.com", make_job("sr python"))
+
+    assert dispatcher.close(timeout=5)
+    assert sink.sent == []
+    assert dispatcher.stats.failed == 1
+
+
+def test_notify_full_queue(sink):
+    dispatcher = NotificationDispatcher(sink, max_queue_size=1, workers=1, batch_size=1, enqueue_timeout=0.01)
+    sink.release.clear()
+
+    dispatcher.notify("email1@gmail.com", make_job("taken by the worker"))
+    while dispatcher._queue.qsize():
+        pass
+    dispatcher.notify("email1@gmail.com", make_job("queued"))
+
+    with pytest.raises(NotificationQueueFull):
+        dispatcher.notify("email1@gmail.com", make_job("rejected"))
+
+    sink.release.set()
+    assert dispatcher.close(timeout=5)
+    assert dispatcher.stats.delivered == 2
+
+
+def test_try_notify_many_does_not_wait(sink):
+    dispatcher = NotificationDispatcher(sink, max_queue_size=1, workers=1, batch_size=1, enqueue_timeout=5)
+    sink.release.clear()
+
+    assert dispatcher.try_notify_many("email1@gmail.com", [make_job("taken by the worker")])
+    while dispatcher._queue.qsize():
+        pass
+    assert dispatcher.try_notify_many("email1@gmail.com", [make_job("queued")])
+    assert not dispatcher.try_notify_many("email1@gmail.com", [make_job("rejected")])
+    assert dispatcher.pending == 2
+
+    sink.release.set()
+    assert dispatcher.close(timeout=5)
+    assert dispatcher.stats.delivered == 2
+
+
+@pytest.mark.anyio
+async def test_async_notifier_drops_without_waiting_when_full(sink):
+    dispatcher = NotificationDispatcher(sink, max_queue_size=1, workers=1, batch_size=1, enqueue_timeout=5.0)
+    notifier = AsyncNotifierAdapter(dispatcher)
+    sink.release.clear()
+
+    await notifier.notify("email1@gmail.com", make_job("taken by the worker"))
+    while dispatcher._queue.qsize():
+        pass
+    await notifier.notify_many("email1@gmail.com", [make_job("queued")])
+    start = time.perf_counter()
+    with pytest.raises(NotificationQueueFull):
+        await notifier.notify("email1@gmail.com", make_job("rejected"))
+    with pytest.raises(NotificationQueueFull):
+        await notifier.notify_many("email1@gmail.com", [make_job("rejected")])
+    assert time.perf_counter() - start < 1.0
+
+    sink.release.set()
+    assert dispatcher.close(timeout=5)
+    assert dispatcher.stats.delivered == 2
+
+
+@pytest.mark.anyio
+async def test_async_notifier_calls_plain_notifier_in_a_thread(sink):
+    notifier = AsyncNotifierAdapter(sink)
+
+    await notifier.notify("email1@gmail.com", make_job("python"))
+
+    assert sink.sent == [("email1@gmail.com", [make_job("python")])]
@@ -40,3 +40,16 @@ def test_get_job_alerts(job_alert_repo):
     all_job_alerts = job_alert_repo.get_job_alerts()
     assert all_job_alerts != []
     assert all_job_alerts == alerts
+
+
+def test_get_job_alerts_after(job_alert_repo):
+    first = JobAlert(email="email1@gmail.com", regex_name="^sr")
+    second = JobAlert(email="email2@gmail.com", regex_name="^ssr")
+    job_alert_repo.add(first)
+
+    alerts, position = job_alert_repo.get_job_alerts_after()
+    assert alerts == [first]
+    job_alert_repo.add(second)
+
+    assert job_alert_repo.get_job_alerts_after(position) == ([second], 2)
+    assert job_alert_repo.get_job_alerts_after(2) == ([], 2)
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.repository.async_repository import AsyncJobRepositoryAdapter, is_bounded
+from app.repository.repository import InMemoryJobRepository
+from app.storage import ColumnarJobStorage
+
+
+@pytest.fixture(params=[False, True], ids=["event_loop", "offload"])
+def async_repo(request):
+    repo = AsyncJobRepositoryAdapter(InMemoryJobRepository(ColumnarJobStorage()), offload=request.param)
+
+    return repo
+
+
+def make_job(name, country="Arg"):
+    return Job(name=name, country=country, salary=10, skills=["python"])
+
+
+@pytest.mark.anyio
+async def test_add_and_get_jobs(async_repo):
+    await async_repo.add(make_job("sr python"))
+    await async_repo.add_many([make_job("jr java", "Spain"), make_job("python dev", "Spain")])
+
+    assert await async_repo.count() == 3
+    assert [job.name for job in await async_repo.get_jobs(JobFilters(country="Spain"))] == ["jr java", "python dev"]
+    assert [job.name for job, _ in await async_repo.search("sr", limit=1)] == ["sr python"]
+
+
+@pytest.mark.anyio
+async def test_get_page(async_repo):
+    await async_repo.add_many([make_job(f"job {index}") for index in range(5)])
+
+    rows, next_position = await async_repo.get_page(limit=2)
+    assert [position for position, _ in rows] == [0, 1]
+    assert next_position == 1
+
+    rows, next_position = await async_repo.get_page(after=next_position)
+    assert [job.name for _, job in rows] == ["job 2", "job 3", "job 4"]
+    assert next_position is None
+
+
+@pytest.mark.anyio
+async def test_get_version(async_repo):
+    version = await async_repo.get_version()
+    await async_repo.add(make_job("sr python"))
+
+    assert await async_repo.get_version() > version
+    assert await AsyncJobRepositoryAdapter(object()).get_version() is None
+
+
+def test_is_bounded():
+    assert is_bounded(None, 10)
+    assert is_bounded(JobFilters(country="Arg"), 10)
+    assert not is_bounded(None, None)
+    assert not is_bounded(JobFilters(salary_min=10), 10)
+
+
+@pytest.mark.anyio
+async def test_unbounded_listings_run_in_a_worker_thread():
+    repository = InMemoryJobRepository(ColumnarJobStorage())
+    threads = []
+    scan = repository.scan
+    repository.scan = lambda *args: threads.append(threading.current_thread()) or scan(*args)
+    async_repo = AsyncJobRepositoryAdapter(repository)
+    await async_repo.add_many([make_job(f"job {index}") for index in range(5)])
+
+    await async_repo.get_page(limit=2)
+    await async_repo.get_page()
+    await async_repo.get_page(JobFilters(salary_min=10), limit=2)
+
+    assert [thread is threading.main_thread() for thread in threads] == [True, False, False]
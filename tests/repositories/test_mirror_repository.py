@@ -0,0 +1,71 @@
+import random
+
+from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.repository.mirror_repository import MirrorJobRepository, content_hash
+
+
+def make_job(name, country="arg"):
+    return Job(name=name, country=country, salary=1, skills=["python"])
+
+
+def test_content_hash_depends_on_every_field():
+    job = make_job("sr python")
+
+    assert content_hash(job) == content_hash(make_job("sr python"))
+    assert content_hash(job) != content_hash(make_job("sr python", country="usa"))
+    assert content_hash(job) != content_hash(Job(name="sr python", country="arg", salary=1, skills=["java"]))
+
+
+def test_apply_adds_and_removes_jobs():
+    mirror = MirrorJobRepository()
+    jobs = {content_hash(job): job for job in [make_job("sr python"), make_job("jr python"), make_job("java")]}
+    mirror.apply(jobs, [])
+    version = mirror.version
+
+    mirror.apply({content_hash(make_job("go")): make_job("go")}, [content_hash(make_job("jr python"))])
+
+    assert mirror.get_jobs() == [make_job("sr python"), make_job("java"), make_job("go")]
+    assert mirror.count() == 3
+    assert mirror.version != version
+
+
+def test_apply_without_changes_keeps_version():
+    mirror = MirrorJobRepository()
+    mirror.apply({content_hash(make_job("sr python")): make_job("sr python")}, [])
+    version = mirror.version
+
+    mirror.apply({content_hash(make_job("sr python")): make_job("sr python")}, ["unknown"])
+
+    assert mirror.version == version
+
+
+def test_get_jobs_filtered():
+    mirror = MirrorJobRepository()
+    jobs = [make_job("sr python"), make_job("jr python", country="usa")]
+    mirror.apply({content_hash(job): job for job in jobs}, [])
+
+    assert mirror.get_jobs(JobFilters(country="usa")) == [make_job("jr python", country="usa")]
+    assert list(mirror.iter_jobs(JobFilters(name="SR"))) == [make_job("sr python")]
+
+
+def test_get_jobs_indexed_same_as_scan():
+    rng = random.Random(0)
+    mirror = MirrorJobRepository()
+    jobs = [
+        Job(name=f"job {index}", country=rng.choice(["arg", "usa", "esp"]), salary=rng.randrange(10), skills=rng.sample(["python", "java", "sql"], rng.randrange(3)))
+        for index in range(300)
+    ]
+    mirror.apply({content_hash(job): job for job in jobs}, [])
+    removed = {content_hash(job) for job in jobs[::3]}
+    mirror.apply({}, removed)
+    kept = [job for job in jobs if content_hash(job) not in removed]
+
+    for job_filters in [
+        JobFilters(country="arg"),
+        JobFilters(skills=["python", "sql"]),
+        JobFilters(salary_min=3, salary_max=5),
+        JobFilters(country="usa", salary_max=2, skills=["java"]),
+        JobFilters(salary_min=20),
+    ]:
+        assert mirror.get_jobs(job_filters) == [job for job in kept if job_filters.matches(job)]
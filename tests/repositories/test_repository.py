@@ -1,13 +1,14 @@
 import pytest
 
-from app.storage import InMemoryStorage
+from app.storage import ColumnarJobStorage, InMemoryStorage
 from app.repository.repository import InMemoryJobRepository
 from app.domain.job import Job
+from app.domain.job_filters import JobFilters
 
 
-@pytest.fixture
-def memory_storage():
-    storage = InMemoryStorage()
+@pytest.fixture(params=[InMemoryStorage, ColumnarJobStorage])
+def memory_storage(request):
+    storage = request.param()
 
     return storage
 
@@ -46,4 +47,73 @@ def test_get_all_jobs_not_empty(job_repo):
 
     all_jobs = job_repo.get_jobs()
     assert all_jobs != []
-    assert all_jobs[0] == new_job
\ No newline at end of file
+    assert all_jobs[0] == new_job
+
+@pytest.fixture
+def filled_job_repo(job_repo):
+    jobs = [
+        Job(name="Jr Java Developer", country="Argentina", salary=24000, skills=["Java", "OOP"]),
+        Job(name="Sr Java Developer", country="Argentina", salary=44000, skills=["Java", "OOP", "Design Patterns"]),
+        Job(name="Sr Python Developer", country="Spain", salary=50000, skills=["Python", "OOP"]),
+        Job(name="Sr UX Designer", country="Argentina", salary=40000, skills=["UX"]),
+    ]
+    for job in jobs:
+        job_repo.add(job)
+
+    return job_repo
+
+
+@pytest.mark.parametrize(
+    "job_filters,expected_names",
+    [
+        (JobFilters(), ["Jr Java Developer", "Sr Java Developer", "Sr Python Developer", "Sr UX Designer"]),
+        (JobFilters(name="sr"), ["Sr Java Developer", "Sr Python Developer", "Sr UX Designer"]),
+        (JobFilters(country="Argentina"), ["Jr Java Developer", "Sr Java Developer", "Sr UX Designer"]),
+        (JobFilters(salary_min=40000, salary_max=44000), ["Sr Java Developer", "Sr UX Designer"]),
+        (JobFilters(skills=["Java", "OOP"]), ["Jr Java Developer", "Sr Java Developer"]),
+        (JobFilters(name="developer", country="Argentina", salary_min=30000, skills=["OOP"]), ["Sr Java Developer"]),
+        (JobFilters(country="Chile"), []),
+    ]
+)
+def test_get_jobs_filtered(filled_job_repo, job_filters, expected_names):
+    jobs = filled_job_repo.get_jobs(job_filters)
+
+    assert [job.name for job in jobs] == expected_names
+
+
+def test_repository_indexes_existing_storage(memory_storage):
+    memory_storage.add({"name": "sr python", "country": "Arg", "salary": 10, "skills": ["python"]})
+
+    repo = InMemoryJobRepository(memory_storage)
+
+    assert repo.get_jobs(JobFilters(skills=["python"])) == [Job(name="sr python", country="Arg", salary=10, skills=["python"])]
+
+
+def test_scan_after_position(filled_job_repo):
+    rows = list(filled_job_repo.scan(JobFilters(country="Argentina"), after=0))
+
+    assert [(position, job.name) for position, job in rows] == [(1, "Sr Java Developer"), (3, "Sr UX Designer")]
+
+
+def test_add_many(job_repo):
+    jobs = [
+        Job(name="sr python", country="Arg", salary=10, skills=["python"]),
+        Job(name="jr java", country="Arg", salary=5, skills=["java"]),
+    ]
+
+    job_repo.add_many(jobs)
+
+    assert job_repo.get_jobs() == jobs
+    assert job_repo.get_jobs(JobFilters(skills=["java"])) == jobs[1:]
+
+
+def test_search(filled_job_repo):
+    hits = filled_job_repo.search("sr java")
+
+    assert [job.name for job, _ in hits] == ["Sr Java Developer", "Jr Java Developer", "Sr UX Designer", "Sr Python Developer"]
+
+
+def test_search_new_job(filled_job_repo):
+    filled_job_repo.add(Job(name="Go Developer", country="Chile", salary=30000, skills=["Golang"]))
+
+    assert [job.name for job, _ in filled_job_repo.search("golang")] == ["Go Developer"]
@@ -0,0 +1,46 @@
+import pytest
+
+from app.repository.search_index import SearchIndex, tokenize
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    for position, texts in enumerate([
+        ["Sr Python Developer", "Python", "OOP"],
+        ["Jr Java Developer", "Java", "OOP"],
+        ["Python Data Engineer", "Python", "SQL"],
+        ["Sr UX Designer", "UX"],
+    ]):
+        index.add(position, texts)
+
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Sr. C# / C++ Developer") == ["sr", "c#", "c++", "developer"]
+
+
+def test_search_ranks_more_matching_terms_first(index):
+    hits = index.search("python developer", prefix=False)
+
+    assert [position for position, _ in hits] == [0, 2, 1]
+    assert hits[0][1] > hits[1][1] > hits[2][1] > 0
+
+
+def test_search_prefix(index):
+    assert [position for position, _ in index.search("dev")] == [0, 1]
+    assert index.search("dev", prefix=False) == []
+
+
+def test_search_limit_prefers_shorter_documents(index):
+    assert [position for position, _ in index.search("sr", limit=1)] == [3]
+
+
+def test_search_empty():
+    assert SearchIndex().search("python") == []
+
+
+def test_add_out_of_order(index):
+    with pytest.raises(ValueError):
+        index.add(7, ["Go Developer"])
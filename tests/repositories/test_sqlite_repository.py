@@ -0,0 +1,185 @@
+import threading
+
+import pytest
+
+from app.database import SQLiteConnectionPool
+from app.domain.job import Job
+from app.domain.job_alert import JobAlert
+from app.domain.job_filters import JobFilters
+from app.repository.alert_repository import SQLiteJobAlertRepository
+from app.repository.repository import SQLiteJobRepository
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "jobs.sqlite3"), size=4)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def job_repo(pool):
+    repo = SQLiteJobRepository(pool, chunk_size=2)
+
+    return repo
+
+
+@pytest.fixture
+def filled_job_repo(job_repo):
+    job_repo.add_many([
+        Job(name="Jr Java Developer", country="Argentina", salary=24000, skills=["Java", "OOP"]),
+        Job(name="Sr Java Developer", country="Argentina", salary=44000, skills=["Java", "OOP", "Design Patterns"]),
+        Job(name="Sr Python Developer", country="Spain", salary=50000, skills=["Python", "OOP"]),
+        Job(name="Sr UX Designer", country="Argentina", salary=40000, skills=["UX"]),
+    ])
+
+    return job_repo
+
+
+def test_get_all_jobs_empty(job_repo):
+    assert job_repo.get_jobs() == []
+
+
+def test_add_job(job_repo):
+    new_job = Job(name="sr python", country="Arg", salary=10, skills=["python", "sql", "python"])
+
+    job_repo.add(new_job)
+
+    assert job_repo.get_jobs() == [new_job]
+
+
+@pytest.mark.parametrize(
+    "job_filters,expected_names",
+    [
+        (JobFilters(), ["Jr Java Developer", "Sr Java Developer", "Sr Python Developer", "Sr UX Designer"]),
+        (JobFilters(name="sr"), ["Sr Java Developer", "Sr Python Developer", "Sr UX Designer"]),
+        (JobFilters(name="%"), []),
+        (JobFilters(country="Argentina"), ["Jr Java Developer", "Sr Java Developer", "Sr UX Designer"]),
+        (JobFilters(salary_min=40000, salary_max=44000), ["Sr Java Developer", "Sr UX Designer"]),
+        (JobFilters(skills=["Java", "OOP"]), ["Jr Java Developer", "Sr Java Developer"]),
+        (JobFilters(name="developer", country="Argentina", salary_min=30000, skills=["OOP"]), ["Sr Java Developer"]),
+        (JobFilters(country="Chile"), []),
+    ]
+)
+def test_get_jobs_filtered(filled_job_repo, job_filters, expected_names):
+    jobs = filled_job_repo.get_jobs(job_filters)
+
+    assert [job.name for job in jobs] == expected_names
+
+
+def test_scan_after_position(filled_job_repo):
+    rows = list(filled_job_repo.scan(JobFilters(country="Argentina"), after=1))
+
+    assert [(position, job.name) for position, job in rows] == [(2, "Sr Java Developer"), (4, "Sr UX Designer")]
+
+
+def test_filters_use_indexes(filled_job_repo, pool):
+    conditions, parameters = filled_job_repo._where(JobFilters(country="Argentina", skills=["OOP"]))
+    query = "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE " + " AND ".join(conditions)
+
+    with pool.connection() as connection:
+        plan = " ".join(row[-1] for row in connection.execute(query, parameters))
+
+    assert "SCAN jobs" not in plan
+
+
+def test_name_is_not_indexed(pool):
+    with pool.transaction() as connection:
+        connection.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, name TEXT NOT NULL, country TEXT NOT NULL, salary INTEGER NOT NULL, skills TEXT NOT NULL)")
+        connection.execute("CREATE INDEX jobs_name ON jobs(name COLLATE NOCASE)")
+
+    SQLiteJobRepository(pool)
+
+    with pool.connection() as connection:
+        indexes = [row[1] for row in connection.execute("PRAGMA index_list(jobs)")]
+    assert "jobs_name" not in indexes
+
+
+def test_jobs_persist_across_pools(filled_job_repo, pool):
+    pool.close()
+
+    repo = SQLiteJobRepository(SQLiteConnectionPool(pool.path))
+
+    assert len(repo.get_jobs()) == 4
+
+
+def test_concurrent_add_many(job_repo):
+    def add_batch(batch):
+        job_repo.add_many([Job(name=f"job {batch}-{index}", country="Arg", salary=index, skills=["python"]) for index in range(50)])
+
+    threads = [threading.Thread(target=add_batch, args=(batch,)) for batch in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(job_repo.get_jobs(JobFilters(skills=["python"]))) == 400
+
+
+def test_alert_repository(pool):
+    repo = SQLiteJobAlertRepository(pool)
+    alerts = [
+        JobAlert(email="email1@gmail.com", regex_name="^sr"),
+        JobAlert(email="email2@gmail.com", regex_name="^ssr"),
+    ]
+    for alert in alerts:
+        repo.add(alert)
+
+    assert repo.get_job_alerts() == alerts
+
+
+def test_alert_repository_reads_alerts_after_last_id(pool):
+    repo = SQLiteJobAlertRepository(pool)
+    first = JobAlert(email="email1@gmail.com", regex_name="^sr")
+    second = JobAlert(email="email2@gmail.com", regex_name="^ssr")
+    third = JobAlert(email="email3@gmail.com", regex_name="python")
+    repo.add(first)
+    repo.add(second)
+    alerts, position = repo.get_job_alerts_after()
+    assert alerts == [first, second]
+
+    with pool.transaction() as connection:
+        connection.execute("DELETE FROM alerts WHERE regex_name = '^sr'")
+    repo.add(third)
+
+    alerts, position = repo.get_job_alerts_after(position)
+    assert alerts == [third]
+    assert repo.get_job_alerts_after(position) == ([], position)
+
+
+def test_alert_repository_criteria(pool):
+    repo = SQLiteJobAlertRepository(pool)
+    alert = JobAlert(email="email1@gmail.com", skills=["python"], countries=["arg", "uru"], salary_min=1000, salary_max=2000)
+    repo.add(alert)
+
+    assert repo.get_job_alerts() == [alert]
+
+
+def test_alert_repository_adds_criteria_columns(pool):
+    with pool.transaction() as connection:
+        connection.execute("CREATE TABLE alerts (id INTEGER PRIMARY KEY, email TEXT NOT NULL, regex_name TEXT NOT NULL)")
+        connection.execute("INSERT INTO alerts (email, regex_name) VALUES ('email1@gmail.com', '^sr')")
+
+    repo = SQLiteJobAlertRepository(pool)
+
+    assert repo.get_job_alerts() == [JobAlert(email="email1@gmail.com", regex_name="^sr")]
+
+
+def test_version_changes_on_write(job_repo):
+    version = job_repo.version
+
+    job_repo.add(Job(name="sr python", country="Arg", salary=10, skills=[]))
+    assert job_repo.version > version
+
+    version = job_repo.version
+    job_repo.clean()
+    assert job_repo.version > version
+
+
+def test_search(filled_job_repo):
+    hits = filled_job_repo.search("sr java")
+
+    assert [job.name for job, _ in hits][:2] == ["Sr Java Developer", "Jr Java Developer"]
+    assert all(score > 0 for _, score in hits)
+    assert [job.name for job, _ in filled_job_repo.search("pyth")] == ["Sr Python Developer"]
+    assert filled_job_repo.search("pyth", prefix=False) == []
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from app.json_stream import JSONArrayParser, iter_json_array, iter_ndjson_lines
+
+
+def parse(chunks):
+    parser = JSONArrayParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.feed(b"", final=True))
+
+    return items
+
+
+ROWS = [["Jr Java Developer", 24000, "Argentina", ["Java", "OOP"]], ["Diseñador UX", 40000.5, "España", []], [], 12345, "a, ]", [True, False, None, -1.5e-07], {"a": {"b": [1, "x"]}}, True]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_parse_any_chunking(size):
+    body = json.dumps(ROWS, ensure_ascii=False, indent=1).encode()
+
+    assert parse([body[start : start + size] for start in range(0, len(body), size)]) == ROWS
+
+
+def test_items_yielded_as_soon_as_complete():
+    parser = JSONArrayParser()
+
+    assert parser.feed(b'[["sr python"], ["jr ') == [["sr python"]]
+    assert parser.feed(b'python"]]') == [["jr python"]]
+    assert parser.feed(b"", final=True) == []
+
+
+def test_number_split_across_chunks():
+    assert parse([b"[12", b"34]"]) == [1234]
+
+
+def test_empty_array():
+    assert parse([b" [ ", b"] "]) == []
+
+
+@pytest.mark.parametrize("body", [b'{"jobs": []}', b"[1 2]", b"[1,", b"[1] [2]", b""])
+def test_invalid_documents(body):
+    with pytest.raises(ValueError):
+        parse([body])
+
+
+@pytest.mark.parametrize("chunk", [b'[{"name": x}, ', b'[{"name": "a"} {"name": "b"}', b"[tru, ", b'[{"a": 1.2.3}, ', b'["a\nb"'])
+def test_malformed_item_raises_before_the_end(chunk):
+    parser = JSONArrayParser()
+
+    with pytest.raises(ValueError):
+        parser.feed(chunk)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("offload", [False, True])
+async def test_iter_json_array(offload):
+    async def chunks():
+        yield b'[1, {"a"'
+        yield b": 2}]"
+
+    assert [items async for items in iter_json_array(chunks(), offload)] == [[1], [{"a": 2}]]
+
+
+@pytest.mark.anyio
+async def test_iter_ndjson_lines():
+    async def chunks():
+        yield b'{"a": 1}\n{"a"'
+        yield b": 2"
+        yield b"}\n\n  \n"
+        yield b'{"a": 3}'
+
+    assert [lines async for lines in iter_ndjson_lines(chunks())] == [[b'{"a": 1}'], [b'{"a": 2}'], [b'{"a": 3}']]
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from app.domain.job import Job
+from app.domain.job_filters import JobFilters
+from app.listing_cache import CachedListing, ListingCache, encode_jobs, listing_key
+from app.repository.repository import InMemoryJobRepository
+from app.schemas import JobOut
+from app.storage import InMemoryStorage
+
+
+@pytest.fixture
+def cache():
+    cache = ListingCache(max_size=2)
+
+    return cache
+
+
+@pytest.fixture
+def job_repo():
+    repo = InMemoryJobRepository(InMemoryStorage())
+
+    return repo
+
+
+def test_encode_jobs_same_as_job_out():
+    jobs = [Job(name="sr python ñ", country="Arg", salary=10, skills=["python"])]
+
+    encoded = encode_jobs(jobs)
+
+    assert json.loads(encoded) == [JobOut(**job.to_dict()).model_dump() for job in jobs]
+    assert encoded == b'[{"name":"sr python \xc3\xb1","country":"Arg","salary":10,"skills":["python"]}]'
+
+
+def test_listing_key_ignores_skills_order():
+    assert listing_key(JobFilters(skills=["a", "b"])) == listing_key(JobFilters(skills=["b", "a"]))
+    assert listing_key(JobFilters(country="Arg")) != listing_key(JobFilters(name="Arg"))
+
+
+def test_get_put(cache, job_repo):
+    key = listing_key(None)
+    assert cache.get(job_repo, job_repo.version, key) is None
+
+    cache.put(job_repo, job_repo.version, key, CachedListing(body=b"[]"))
+
+    assert cache.get(job_repo, job_repo.version, key) == CachedListing(body=b"[]")
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_invalidated_by_write(cache, job_repo):
+    key = listing_key(None)
+    cache.put(job_repo, job_repo.version, key, CachedListing(body=b"[]"))
+    stale_version = job_repo.version
+
+    job_repo.add(Job(name="sr python", country="Arg", salary=10, skills=[]))
+
+    assert job_repo.version > stale_version
+    assert cache.get(job_repo, job_repo.version, key) is None
+    assert cache.stats.invalidations == 1
+
+    cache.put(job_repo, stale_version, key, CachedListing(body=b"[]"))
+    assert cache.stats.size == 0
+
+
+def test_evicts_least_recently_used(cache, job_repo):
+    for after in range(3):
+        cache.put(job_repo, job_repo.version, listing_key(None, after), CachedListing(body=b"[]"))
+
+    assert cache.get(job_repo, job_repo.version, listing_key(None, 0)) is None
+    assert cache.stats.evictions == 1
+
+
+def test_repository_version_changes_on_storage_writes():
+    storage = InMemoryStorage()
+    repo = InMemoryJobRepository(storage)
+    version = repo.version
+    assert repo.version == version
+
+    storage.add({"name": "sr python", "country": "Arg", "salary": 10, "skills": []})
+    assert repo.version > version
+
+    version = repo.version
+    storage.clean()
+    assert repo.version > version
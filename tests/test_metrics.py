@@ -0,0 +1,63 @@
+import pytest
+
+from app.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+
+    return registry
+
+
+def test_counter_render(registry):
+    counter = registry.counter("requests_total", "Requests.", ("route",))
+    counter.labels("/jobs").inc()
+    counter.labels("/jobs").inc(2)
+    counter.labels('/a"b').inc()
+
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/a\\"b"} 1\n'
+        'requests_total{route="/jobs"} 3\n'
+    )
+
+
+def test_labels_are_preallocated_children(registry):
+    counter = registry.counter("requests_total", "Requests.", ("route",))
+
+    assert counter.labels("/jobs") is counter.labels("/jobs")
+    with pytest.raises(ValueError):
+        counter.labels("/jobs", "GET")
+
+
+def test_gauge_function(registry):
+    queue = [1, 2]
+    gauge = registry.gauge("queue_depth", "Queue depth.")
+    gauge.set_function(lambda: len(queue))
+    queue.append(3)
+
+    assert "queue_depth 3\n" in registry.render()
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram("duration_seconds", "Duration.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()[2:]
+    assert lines == [
+        'duration_seconds_bucket{le="0.1"} 1',
+        'duration_seconds_bucket{le="1"} 3',
+        'duration_seconds_bucket{le="+Inf"} 4',
+        "duration_seconds_sum 6.05",
+        "duration_seconds_count 4",
+    ]
+
+
+def test_duplicated_metric(registry):
+    registry.counter("requests_total", "Requests.")
+
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests.")
@@ -0,0 +1,39 @@
+import pytest
+
+from app.pagination import InvalidCursorError, decode_cursor, decode_cursor_anchor, encode_cursor, ndjson_lines, take_page
+from app.domain.job import Job
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert decode_cursor_anchor(encode_cursor(42)) == (42, None)
+    assert decode_cursor_anchor(encode_cursor(42, "0f1e")) == (42, "0f1e")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", "W10", encode_cursor(1)[:-2]])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_take_page_with_more_items():
+    page, next_position = take_page(iter([(0, "a"), (3, "b"), (7, "c")]), 2)
+
+    assert page == [(0, "a"), (3, "b")]
+    assert next_position == 3
+
+
+def test_take_page_last_page():
+    page, next_position = take_page(iter([(0, "a"), (3, "b")]), 2)
+
+    assert page == [(0, "a"), (3, "b")]
+    assert next_position is None
+
+
+def test_ndjson_lines():
+    jobs = [Job(name="sr python", country="arg", salary=1, skills=["python"]), {"name": "ssr python", "country": "arg", "salary": 2, "skills": []}]
+
+    assert list(ndjson_lines(jobs)) == [
+        '{"name": "sr python", "country": "arg", "salary": 1, "skills": ["python"]}\n',
+        '{"name": "ssr python", "country": "arg", "salary": 2, "skills": []}\n',
+    ]
@@ -0,0 +1,111 @@
+import marshal
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_profile_store
+from app.main import app
+from app.middleware import ProfilingMiddleware
+from app.profiling import ProfileStore
+
+
+def slow_work(duration):
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        pass
+
+
+def profiled_client(store, **options):
+    profiled = FastAPI()
+
+    @profiled.get("/work")
+    async def work(duration: float = 0.0):
+        slow_work(duration)
+        return {"done": True}
+
+    profiled.add_middleware(ProfilingMiddleware, store=store, **options)
+
+    return TestClient(profiled)
+
+
+@pytest.fixture
+def store():
+    return ProfileStore(max_size=2)
+
+
+def test_store_drops_the_oldest_traces(store):
+    for path in ["/a", "/b", "/c"]:
+        store.add("GET", path, 200, "cprofile", 0.0, 0.1, "", b"")
+
+    assert [trace.path for trace in store.list()] == ["/c", "/b"]
+    assert store.recorded == 3
+    assert store.get(1) is None
+    assert store.get(3).path == "/c"
+
+
+def test_requests_not_selected_are_not_profiled(store):
+    client = profiled_client(store, header="X-Profile", threshold=0.0)
+
+    assert client.get("/work").status_code == 200
+    assert store.list() == []
+
+
+def test_header_keeps_the_cprofile_trace(store):
+    client = profiled_client(store, header="X-Profile", threshold=10.0)
+
+    response = client.get("/work", headers={"X-Profile": "1"}, params={"duration": 0.01})
+
+    assert response.json() == {"done": True}
+    [trace] = store.list()
+    assert (trace.method, trace.path, trace.status, trace.mode) == ("GET", "/work", 200, "cprofile")
+    assert trace.duration >= 0.01
+    assert "slow_work" in trace.summary
+    assert any(function == "slow_work" for _, _, function in marshal.loads(trace.data))
+
+
+def test_header_selects_the_sampling_mode(store):
+    client = profiled_client(store, header="X-Profile", interval=0.001)
+
+    client.get("/work", headers={"X-Profile": "sample"}, params={"duration": 0.05})
+
+    [trace] = store.list()
+    assert trace.mode == "sample"
+    assert b"slow_work" in trace.data
+    assert all(line.rsplit(b" ", 1)[1].isdigit() for line in trace.data.splitlines())
+
+
+def test_sampled_requests_are_kept_over_the_threshold(store):
+    client = profiled_client(store, sample_rate=0.5, threshold=0.02, draw=lambda: 0.1)
+
+    client.get("/work")
+    assert store.list() == []
+
+    client.get("/work", params={"duration": 0.03})
+    assert [trace.path for trace in store.list()] == ["/work"]
+
+
+def test_sample_rate_draw_above_rate_is_not_profiled(store):
+    client = profiled_client(store, sample_rate=0.5, threshold=0.0, draw=lambda: 0.9)
+
+    client.get("/work")
+
+    assert store.list() == []
+
+
+def test_admin_profiles(fastapi_dep, store):
+    trace = store.add("GET", "/aggregated-jobs", 200, "cprofile", 1.0, 1.2, "summary of the trace", b"data")
+    client = TestClient(app)
+
+    with fastapi_dep(app).override({get_profile_store: lambda: store}):
+        listing = client.get("/admin/profiles")
+        summary = client.get(f"/admin/profiles/{trace.id}")
+        download = client.get(f"/admin/profiles/{trace.id}/download")
+        missing = client.get("/admin/profiles/42")
+
+    assert listing.json() == {"recorded": 1, "max_size": 2, "profiles": [trace.describe()]}
+    assert summary.text == "summary of the trace"
+    assert download.content == b"data"
+    assert download.headers["content-disposition"] == f'attachment; filename="profile-{trace.id}.prof"'
+    assert missing.status_code == 404
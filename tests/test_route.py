@@ -1,10 +1,22 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
-from app.dependencies import get_job_repository, get_external_job_finder_service, get_job_finder_aggregator
+from app.dependencies import get_catalogue_sync, get_digest_notifier, get_job_repository, get_external_job_finder_service, get_job_finder_aggregator, get_job_alert_service, get_notifier_service
 from unittest.mock import MagicMock
 from app.services.external_job_finder_service import JobFinderServiceError
 from app.services.job_finder_aggregator import JobFinderAggregator
+from app.services.job_merge import JobMerger
+from app.repository.mirror_repository import MirrorJobRepository
+from app.services.catalogue_sync import CatalogueSync
+from app.services.digest_notifier import DigestNotifier
+from app.services.notification_dispatcher import NotificationQueueFull
+from app.domain.job_alert import JobAlert
+from app.domain.job_filters import JobFilters
+from app.domain.job import Job
+from app.repository.repository import InMemoryJobRepository
+from app.storage import InMemoryStorage
 
 client = TestClient(app)
 
@@ -21,6 +33,90 @@ def test_add_new_job():
     assert response.status_code == 201
 
 
+def test_add_new_job_notification_queue_full(fastapi_dep):
+    new_job = {
+        "name": "python dev",
+        "country": "Arg",
+        "skills": [],
+        "salary": 1
+    }
+    job_alert_service = MagicMock()
+    job_alert_service.get_job_alerts_to_notify.return_value = [JobAlert(email="email1@gmail.com", regex_name="python")]
+    notifier = MagicMock()
+    notifier.notify.side_effect = NotificationQueueFull()
+
+    with fastapi_dep(app).override(
+        {
+            get_job_alert_service: lambda: job_alert_service,
+            get_notifier_service: lambda: notifier,
+        }
+    ):
+        response = client.post("/add-job", json=new_job)
+        assert response.status_code == 201
+        assert response.json() == {**new_job, "dropped_notifications": 1}
+
+
+def test_add_new_job_notifies_each_email_once(fastapi_dep):
+    new_job = {
+        "name": "python dev",
+        "country": "Arg",
+        "skills": [],
+        "salary": 1
+    }
+    job_alert_service = MagicMock()
+    job_alert_service.get_job_alerts_to_notify.return_value = [
+        JobAlert(email="email1@gmail.com", regex_name="python"),
+        JobAlert(email="email1@gmail.com", regex_name=".*dev"),
+        JobAlert(email="email2@gmail.com", regex_name="python"),
+    ]
+    notifier = MagicMock()
+
+    with fastapi_dep(app).override(
+        {
+            get_job_alert_service: lambda: job_alert_service,
+            get_notifier_service: lambda: notifier,
+        }
+    ):
+        response = client.post("/add-job", json=new_job)
+
+    assert response.status_code == 201
+    assert [call.args[0] for call in notifier.notify.call_args_list] == ["email1@gmail.com", "email2@gmail.com"]
+
+
+def test_add_new_jobs(fastapi_dep):
+    job_repository = InMemoryJobRepository(InMemoryStorage())
+    new_jobs = [
+        {"name": "python dev", "country": "Arg", "skills": [], "salary": 1},
+        {"name": "java dev", "country": "Arg", "skills": []},
+    ]
+
+    with fastapi_dep(app).override({get_job_repository: lambda: job_repository}):
+        response = client.post("/add-jobs", json=new_jobs)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["rejected"]) == (1, 1)
+    assert [item["status"] for item in body["items"]] == ["created", "invalid"]
+    assert job_repository.get_jobs() == [Job(name="python dev", country="Arg", salary=1, skills=[])]
+
+
+def test_add_new_jobs_ndjson(fastapi_dep):
+    job_repository = InMemoryJobRepository(InMemoryStorage())
+    body = b'{"name": "python dev", "country": "Arg", "skills": [], "salary": 1}\n\n{"name": "java dev", "country": "Arg", "skills": [], "salary": 2}\n'
+
+    with fastapi_dep(app).override({get_job_repository: lambda: job_repository}):
+        response = client.post("/add-jobs", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    assert [job.name for job in job_repository.get_jobs()] == ["python dev", "java dev"]
+
+
+def test_add_new_jobs_not_an_array():
+    response = client.post("/add-jobs", json={"name": "python dev"})
+    assert response.status_code == 400
+
+
 def test_add_new_job_alert():
     new_job_alert = {
         "email": "email1@gmail.com",
@@ -31,6 +127,47 @@ def test_add_new_job_alert():
     assert response.status_code == 201
 
 
+def test_add_new_job_alert_invalid_regex():
+    new_job_alert = {
+        "email": "email1@gmail.com",
+        "regex_name": "(sr"
+    }
+
+    response = client.post("/job-alert", json=new_job_alert)
+    assert response.status_code == 422
+
+
+def test_add_new_job_alert_criteria():
+    new_job_alert = {
+        "email": "email1@gmail.com",
+        "skills": ["python"],
+        "countries": ["Arg"],
+        "salary_min": 1000,
+    }
+
+    response = client.post("/job-alert", json=new_job_alert)
+    assert response.status_code == 201
+    assert response.json() == {**new_job_alert, "regex_name": "", "salary_max": None}
+
+
+@pytest.mark.parametrize("new_job_alert", [{"email": "email1@gmail.com"}, {"email": "email1@gmail.com", "regex_name": "", "skills": []}])
+def test_add_new_job_alert_without_criteria(new_job_alert):
+    response = client.post("/job-alert", json=new_job_alert)
+    assert response.status_code == 422
+
+
+def test_add_new_job_alert_invalid_salary_range():
+    new_job_alert = {
+        "email": "email1@gmail.com",
+        "regex_name": "^sr",
+        "salary_min": 2000,
+        "salary_max": 1000,
+    }
+
+    response = client.post("/job-alert", json=new_job_alert)
+    assert response.status_code == 422
+
+
 def test_get_jobs_empty(fastapi_dep):
     repo = MagicMock()
     repo.get_all_jobs.return_value = []
@@ -70,6 +207,20 @@ def test_get_jobs_non_empty(fastapi_dep):
         assert response.json() == [new_job]
 
 
+def test_get_jobs_filtered(fastapi_dep):
+    repo = MagicMock()
+    repo.get_jobs.return_value = []
+
+    with fastapi_dep(app).override(
+        {
+            get_job_repository: lambda: repo,
+        }
+    ):
+        response = client.get("/jobs", params={"name": "python", "salary_min": 10, "skills": ["Python", "OOP"]})
+        assert response.status_code == 200
+        repo.get_jobs.assert_called_with(JobFilters(name="python", salary_min=10, skills=["Python", "OOP"]))
+
+
 def test_get_aggregated_jobs_empty_jobs(fastapi_dep):
     repo = MagicMock()
     repo.get_all_jobs.return_value = []
@@ -202,4 +353,224 @@ def test_get_aggregated_job_external_exception(fastapi_dep):
         response = client.get("/aggregated-jobs")
         assert response.status_code == 200
         assert response.json() != []
-        assert response.json() == mock_jobs_repo
\ No newline at end of file
+        assert response.json() == mock_jobs_repo
+
+def test_get_external_cache_stats():
+    response = client.get("/admin/external-cache")
+    assert response.status_code == 200
+    assert {"hits", "misses", "stale_hits", "refreshes", "size"} <= set(response.json())
+
+
+def test_get_aggregated_jobs_filtered(fastapi_dep):
+    repo = MagicMock()
+    repo.get_jobs.return_value = []
+    service = MagicMock()
+    service.get_jobs.return_value = []
+    aggregated = JobFinderAggregator([repo, service])
+
+    with fastapi_dep(app).override(
+        {
+            get_job_finder_aggregator: lambda: aggregated
+        }
+    ):
+        response = client.get("/aggregated-jobs", params={"country": "arg", "salary_max": 100})
+        assert response.status_code == 200
+        repo.get_jobs.assert_called_with(JobFilters(country="arg", salary_max=100))
+        service.get_jobs.assert_called_with(JobFilters(country="arg", salary_max=100))
+
+
+@pytest.fixture
+def job_repository():
+    repo = InMemoryJobRepository(InMemoryStorage())
+    for index in range(5):
+        repo.add(Job(name=f"job {index}", country="arg", salary=index, skills=[]))
+
+    return repo
+
+
+def test_get_jobs_paginated(fastapi_dep, job_repository):
+    with fastapi_dep(app).override(
+        {
+            get_job_repository: lambda: job_repository,
+        }
+    ):
+        names = []
+        params = {"limit": 2}
+        while True:
+            response = client.get("/jobs", params=params)
+            assert response.status_code == 200
+            names.extend(job["name"] for job in response.json())
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+        assert names == [f"job {index}" for index in range(5)]
+
+
+def test_get_jobs_invalid_cursor():
+    response = client.get("/jobs", params={"cursor": "not a cursor"})
+    assert response.status_code == 400
+
+
+def test_get_jobs_ndjson(fastapi_dep, job_repository):
+    with fastapi_dep(app).override(
+        {
+            get_job_repository: lambda: job_repository,
+        }
+    ):
+        response = client.get("/jobs", params={"format": "ndjson", "salary_min": 3})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line)["name"] for line in response.text.splitlines()] == ["job 3", "job 4"]
+
+
+def test_get_aggregated_jobs_ndjson(fastapi_dep, job_repository):
+    service = MagicMock()
+    service.get_jobs.return_value = [{"name": "external", "salary": 1, "country": "arg", "skills": []}]
+    aggregated = JobFinderAggregator([service, job_repository])
+
+    with fastapi_dep(app).override(
+        {
+            get_job_finder_aggregator: lambda: aggregated
+        }
+    ):
+        response = client.get("/aggregated-jobs", params={"format": "ndjson"})
+        assert response.status_code == 200
+        assert [json.loads(line)["name"] for line in response.text.splitlines()] == [f"job {index}" for index in range(5)] + ["external"]
+
+
+def test_get_aggregated_jobs_paginated(fastapi_dep, job_repository):
+    aggregated = JobFinderAggregator([job_repository])
+
+    with fastapi_dep(app).override(
+        {
+            get_job_finder_aggregator: lambda: aggregated
+        }
+    ):
+        first_page = client.get("/aggregated-jobs", params={"limit": 3})
+        second_page = client.get("/aggregated-jobs", params={"limit": 3, "cursor": first_page.headers["X-Next-Cursor"]})
+
+        assert [job["name"] for job in first_page.json()] == ["job 0", "job 1", "job 2"]
+        assert [job["name"] for job in second_page.json()] == ["job 3", "job 4"]
+        assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_get_aggregated_jobs_cursor_stable_when_jobs_are_added_before_it(fastapi_dep, job_repository):
+    first_source = InMemoryJobRepository(InMemoryStorage())
+    first_source.add(Job(name="first 0", country="arg", salary=1, skills=[]))
+    aggregated = JobFinderAggregator([first_source, job_repository])
+
+    with fastapi_dep(app).override(
+        {
+            get_job_finder_aggregator: lambda: aggregated
+        }
+    ):
+        first_page = client.get("/aggregated-jobs", params={"limit": 3})
+        first_source.add(Job(name="first 1", country="arg", salary=1, skills=[]))
+        second_page = client.get("/aggregated-jobs", params={"limit": 3, "cursor": first_page.headers["X-Next-Cursor"]})
+
+        assert [job["name"] for job in first_page.json()] == ["first 0", "job 0", "job 1"]
+        assert [job["name"] for job in second_page.json()] == ["job 2", "job 3", "job 4"]
+
+
+def test_get_jobs_cached_until_new_job(fastapi_dep):
+    repository = InMemoryJobRepository(InMemoryStorage())
+    repository.add(Job(name="sr python", country="Arg", salary=10, skills=["python"]))
+
+    with fastapi_dep(app).override({get_job_repository: lambda: repository}):
+        first = client.get("/jobs")
+        second = client.get("/jobs")
+        client.post("/add-job", json={"name": "jr java", "country": "Arg", "salary": 5, "skills": []})
+        third = client.get("/jobs")
+        stats = client.get("/admin/listing-cache").json()
+
+    assert first.content == second.content
+    assert first.json() == [{"name": "sr python", "country": "Arg", "salary": 10, "skills": ["python"]}]
+    assert [job["name"] for job in third.json()] == ["sr python", "jr java"]
+    assert stats["hits"] >= 1
+
+
+def test_search_jobs(fastapi_dep):
+    repository = InMemoryJobRepository(InMemoryStorage())
+    repository.add(Job(name="Sr Python Developer", country="Arg", salary=10, skills=["Python"]))
+    repository.add(Job(name="Jr Java Developer", country="Arg", salary=5, skills=["Java"]))
+
+    with fastapi_dep(app).override({get_job_repository: lambda: repository}):
+        response = client.get("/search", params={"q": "pyth", "limit": 5})
+
+    assert response.status_code == 200
+    assert [(job["name"], job["score"] > 0) for job in response.json()] == [("Sr Python Developer", True)]
+
+
+def test_search_jobs_empty_query():
+    response = client.get("/search", params={"q": ""})
+    assert response.status_code == 422
+
+
+def test_get_aggregated_jobs_deduplicated(fastapi_dep):
+    repo = MagicMock()
+    repo.get_jobs.return_value = [{"name": "sr python", "salary": 1, "country": "arg", "skills": []}]
+    service = MagicMock()
+    service.get_jobs.return_value = [{"name": "Sr Python", "salary": 1, "country": "arg", "skills": []}]
+    aggregated = JobFinderAggregator([repo, service], merger=JobMerger())
+
+    with fastapi_dep(app).override({get_job_finder_aggregator: lambda: aggregated}):
+        response = client.get("/aggregated-jobs")
+
+    assert response.json() == [{"name": "sr python", "salary": 1, "country": "arg", "skills": []}]
+    assert response.headers["X-Job-Duplicates"] == "MagicMock=0, MagicMock#2=1"
+
+
+def test_get_circuit_breaker_state():
+    response = client.get("/admin/circuit-breaker")
+    assert response.status_code == 200
+    assert response.json()["state"] == "closed"
+    assert {"failure_rate", "calls_in_window", "rejected", "fallbacks", "hedged"} <= set(response.json())
+
+
+def test_get_catalogue_sync_stats(fastapi_dep):
+    sync = CatalogueSync(MagicMock(), MirrorJobRepository(), interval=30.0)
+    sync.stats.syncs = 2
+
+    with fastapi_dep(app).override({get_catalogue_sync: lambda: sync}):
+        response = client.get("/admin/catalogue-sync")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "syncs": 2, "failures": 0, "added": 0, "removed": 0, "failed_notifications": 0, "last_sync": None, "last_elapsed": 0.0, "jobs": 0, "interval": 30.0
+    }
+
+
+def test_get_catalogue_sync_stats_disabled():
+    response = client.get("/admin/catalogue-sync")
+    assert response.status_code == 404
+
+
+def test_get_notification_digest_stats(fastapi_dep):
+    digest = DigestNotifier(MagicMock(), max_batch_size=10, max_delay=30.0)
+    digest.notify("email1@gmail.com", Job(name="sr python", country="arg", salary=1, skills=[]))
+
+    with fastapi_dep(app).override({get_digest_notifier: lambda: digest}):
+        response = client.get("/admin/notification-digest")
+    digest.close()
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "received": 1, "duplicates": 0, "digests": 0, "delivered": 0, "failed": 0, "pending": 1, "max_batch_size": 10, "max_delay": 30.0
+    }
+
+
+def test_get_notification_digest_stats_disabled():
+    response = client.get("/admin/notification-digest")
+    assert response.status_code == 404
+
+
+def test_get_metrics():
+    client.get("/search", params={"q": "python"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'jobberwocky_http_requests_total{method="GET",route="/search",status="200"}' in response.text
+    assert "jobberwocky_repository_jobs " in response.text
+    assert "jobberwocky_notification_queue_depth " in response.text
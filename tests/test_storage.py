@@ -1,4 +1,5 @@
-from app.storage import InMemoryStorage
+from app.database import SQLiteConnectionPool
+from app.storage import AppendOnlyLogStorage, ColumnarJobStorage, InMemoryStorage, SQLiteFeedStorage
 import pytest
 
 
@@ -38,4 +39,196 @@ def test_storage_get_all_items_not_empty(memory_storage):
     items_saved = memory_storage.get_all()
     assert items_saved != []
     assert len(items_saved) == 2
-    assert items_saved == items
\ No newline at end of file
+    assert items_saved == items
+
+@pytest.fixture
+def log_storage(tmp_path):
+    storage = AppendOnlyLogStorage(tmp_path, fsync_every=2, compact_every=0)
+    yield storage
+    storage.close()
+
+
+def test_log_storage_reopen(tmp_path, log_storage):
+    items = [{"name": "Pepe"}, {"name": "Carlos"}, {"name": "Juan"}]
+    for item in items:
+        log_storage.add(item)
+    log_storage.close()
+
+    assert AppendOnlyLogStorage(tmp_path).get_all() == items
+
+
+def test_log_storage_compaction(tmp_path):
+    storage = AppendOnlyLogStorage(tmp_path, compact_every=2)
+    items = [{"name": "Pepe"}, {"name": "Carlos"}, {"name": "Juan"}]
+    storage.add(items[0])
+    storage.add(items[1])
+    compaction = storage._compaction
+    if compaction is not None:
+        compaction.join()
+    storage.add(items[2])
+    storage.close()
+
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["log-00000001.jsonl", "snapshot-00000001.jsonl"]
+    assert (tmp_path / "log-00000001.jsonl").read_text() == '{"name":"Juan"}\n'
+    assert AppendOnlyLogStorage(tmp_path).get_all() == items
+
+
+def test_log_storage_appends_during_compaction(tmp_path):
+    storage = AppendOnlyLogStorage(tmp_path, compact_every=2)
+    storage.add({"name": "Pepe"})
+    with storage._compaction_lock:
+        storage.add({"name": "Carlos"})
+        storage.add({"name": "Juan"})
+        assert storage.get_all() == [{"name": "Pepe"}, {"name": "Carlos"}, {"name": "Juan"}]
+    storage.close()
+
+    assert AppendOnlyLogStorage(tmp_path).get_all() == [{"name": "Pepe"}, {"name": "Carlos"}, {"name": "Juan"}]
+
+
+def test_log_storage_recovers_interrupted_compaction(tmp_path, log_storage):
+    log_storage.add({"name": "Pepe"})
+    log_storage.compact()
+    log_storage.add({"name": "Carlos"})
+    log_storage.close()
+    # A compaction interrupted after the rotation of the log, before its snapshot was renamed
+    (tmp_path / "log-00000002.jsonl").write_text('{"name":"Juan"}\n')
+    (tmp_path / "snapshot-00000002.tmp").write_text("[")
+
+    storage = AppendOnlyLogStorage(tmp_path)
+    storage.add({"name": "Ana"})
+    storage.close()
+
+    assert (tmp_path / "snapshot-00000002.tmp").exists() is False
+    assert AppendOnlyLogStorage(tmp_path).get_all() == [{"name": "Pepe"}, {"name": "Carlos"}, {"name": "Juan"}, {"name": "Ana"}]
+
+
+def test_log_storage_discards_torn_write(tmp_path, log_storage):
+    log_storage.add({"name": "Pepe"})
+    log_storage.close()
+    with open(tmp_path / "log-00000000.jsonl", "ab") as log:
+        log.write(b'{"name": "Car')
+
+    storage = AppendOnlyLogStorage(tmp_path)
+    storage.add({"name": "Carlos"})
+    storage.close()
+
+    assert AppendOnlyLogStorage(tmp_path).get_all() == [{"name": "Pepe"}, {"name": "Carlos"}]
+
+
+def test_log_storage_clean(tmp_path, log_storage):
+    log_storage.add({"name": "Pepe"})
+    log_storage.compact()
+    log_storage.add({"name": "Carlos"})
+
+    log_storage.clean()
+    log_storage.close()
+
+    assert log_storage.get_all() == []
+    assert AppendOnlyLogStorage(tmp_path).get_all() == []
+
+
+def test_columnar_storage_get_all():
+    storage = ColumnarJobStorage()
+    items = [
+        {"name": "sr python", "country": "Arg", "salary": 10, "skills": ["python", "sql"]},
+        {"name": "jr java", "country": "Arg", "salary": 5, "skills": []},
+        {"name": "sr go", "country": "Spain", "salary": 20, "skills": ["go", "sql"]},
+    ]
+    for item in items:
+        storage.add(item)
+
+    rows = storage.get_all()
+
+    assert [dict(row) for row in rows] == items
+    assert rows[-1]["skills"] == ["go", "sql"]
+    assert rows.fields(0) == ("sr python", "Arg", 10, ["python", "sql"])
+    assert storage.countries.values == ["Arg", "Spain"]
+    assert storage.skills.values == ["python", "sql", "go"]
+
+
+def test_columnar_storage_snapshot_length():
+    storage = ColumnarJobStorage()
+    storage.add({"name": "sr python", "country": "Arg", "salary": 10, "skills": []})
+    rows = storage.get_all()
+
+    storage.add({"name": "jr java", "country": "Arg", "salary": 5, "skills": []})
+
+    assert len(rows) == 1
+    with pytest.raises(IndexError):
+        rows[1]
+
+
+def test_columnar_storage_clean():
+    storage = ColumnarJobStorage()
+    storage.add({"name": "sr python", "country": "Arg", "salary": 10, "skills": ["python"]})
+
+    storage.clean()
+
+    assert len(storage.get_all()) == 0
+
+
+@pytest.fixture
+def feed_pools(tmp_path):
+    # One pool per simulated worker process, each with its own connections to the database
+    pools = [SQLiteConnectionPool(str(tmp_path / "feed.sqlite3")) for _ in range(2)]
+    yield pools
+    for pool in pools:
+        pool.close()
+
+
+def test_feed_storage_shares_items_between_workers(feed_pools):
+    first = SQLiteFeedStorage(feed_pools[0], "jobs", poll_interval=0.0)
+    second = SQLiteFeedStorage(feed_pools[1], "jobs", poll_interval=0.0)
+
+    first.add({"name": "Pepe"})
+    second.add_many([{"name": "Carlos"}, {"name": "Juan"}])
+    first.add({"name": "Ana"})
+
+    expected = [{"name": "Pepe"}, {"name": "Carlos"}, {"name": "Juan"}, {"name": "Ana"}]
+    assert first.get_all() == expected
+    assert second.get_all() == expected
+
+
+def test_feed_storage_streams_are_separate(feed_pools):
+    jobs = SQLiteFeedStorage(feed_pools[0], "jobs", poll_interval=0.0)
+    alerts = SQLiteFeedStorage(feed_pools[1], "alerts", poll_interval=0.0)
+
+    jobs.add({"name": "Pepe"})
+    alerts.add({"email": "pepe@gmail.com"})
+
+    assert jobs.get_all() == [{"name": "Pepe"}]
+    assert alerts.get_all() == [{"email": "pepe@gmail.com"}]
+
+
+def test_feed_storage_polls_at_most_every_interval(feed_pools):
+    first = SQLiteFeedStorage(feed_pools[0], "jobs", poll_interval=3600.0)
+    second = SQLiteFeedStorage(feed_pools[1], "jobs", poll_interval=3600.0)
+
+    second.add({"name": "Pepe"})
+
+    assert first.get_all() == []
+    assert second.get_all() == [{"name": "Pepe"}]
+    assert first.poll() == 1
+    assert first.get_all() == [{"name": "Pepe"}]
+
+
+def test_feed_storage_clean_resets_every_replica(feed_pools):
+    first = SQLiteFeedStorage(feed_pools[0], "jobs", ColumnarJobStorage(), poll_interval=0.0)
+    second = SQLiteFeedStorage(feed_pools[1], "jobs", ColumnarJobStorage(), poll_interval=0.0)
+    job = {"name": "sr python", "country": "arg", "salary": 1, "skills": ["python"]}
+    first.add(job)
+    assert len(second.get_all()) == 1
+
+    second.clean()
+    first.add({**job, "name": "jr java"})
+
+    assert [row["name"] for row in first.get_all()] == ["jr java"]
+    assert [row["name"] for row in second.get_all()] == ["jr java"]
+
+
+def test_feed_storage_loads_existing_items(tmp_path, feed_pools):
+    SQLiteFeedStorage(feed_pools[0], "jobs").add({"name": "Pepe"})
+
+    restarted = SQLiteFeedStorage(feed_pools[1], "jobs")
+
+    assert restarted.get_all() == [{"name": "Pepe"}]